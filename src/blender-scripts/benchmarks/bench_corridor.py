@@ -0,0 +1,72 @@
+# 도로 corridor 평탄화 벤치마크 (road_corridor.carve_corridors)
+# Blender 없이 지형 해상도 x 도로 길이별 평탄화 시간 / 편집 셀 수 / 도로 횡단 높이차 (평탄화 전후) 를 측정한다.
+#
+# 사용법:
+#   python bench_corridor.py [--resolutions 512 1024 2048] [--width 1.6]
+# 지형은 기본 파라미터 하이트필드 (heightfield.compute_heightfield), 도로는 적응형 샘플링 (road_mesh.adaptive_rows)
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from heightfield import BASE_SIZE, Z_SCALE, read_terrain_params, grid_axes, compute_heightfield
+from heightfield_io import bilinear_sample
+from road_corridor import DEFAULT_BLEND, DEFAULT_SHOULDER, DEFAULT_SMOOTHING, carve_corridors
+from road_mesh import PROFILE_POINTS, adaptive_rows, auto_handles, evaluate_rows, sweep_vertices
+
+# (이름, Blender 좌표 control points)
+ROADS = [
+    ("gentle-1km", [(-450, 0), (-150, 60), (150, -60), (450, 0)]),
+    ("mixed-3km", [(-450, -450), (-100, -420), (300, -400), (420, -200), (380, 100), (100, 200), (-300, 300), (-420, 450)]),
+    ("spiral-4km", [(-330, -330), (330, -330), (330, 330), (-330, 330), (-330, -200), (200, -200), (200, 200), (-200, 200)]),
+]
+
+
+def terrain(resolution):
+    settings = read_terrain_params({"resolution": resolution})
+    xs, ys = grid_axes(resolution)
+    heights = compute_heightfield(settings, xs, ys) * np.float32(settings["height_multiplier"] * Z_SCALE)
+    half = BASE_SIZE * settings["terrain_scale"] / 2
+    return heights, (-half, half, -half, half)
+
+
+# 도로 정점 (rows, PROFILE_POINTS, 3) 의 횡단 높이차 (가장자리 ↔ 가장자리) 최댓값
+def cross_slope(heights, extent, vertices):
+    z = bilinear_sample(heights, extent, vertices[:, 0], vertices[:, 1]).reshape(-1, PROFILE_POINTS)
+    return float(np.abs(z[:, 0] - z[:, -1]).max())
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--width", type=float, default=1.6)
+    args = parser.parse_args(argv)
+    options = {"shoulder": DEFAULT_SHOULDER, "blend": DEFAULT_BLEND, "smoothing": DEFAULT_SMOOTHING}
+
+    print(f"{'terrain':<10}{'road':<13}{'length(m)':>10}{'cells':>9}{'carve(ms)':>11}{'slope before':>14}{'after':>8}")
+    for resolution in args.resolutions:
+        heights, extent = terrain(resolution)
+        for name, points in ROADS:
+            points = np.asarray(points, dtype=np.float64)
+            left, right = auto_handles(points)
+            _counts, placement, _error = adaptive_rows(points, args.width, 0.05)
+            centres, tangents = evaluate_rows(points, left, right, *placement)
+            vertices = sweep_vertices(centres, tangents, args.width)
+            length = float(np.linalg.norm(np.diff(centres, axis=0), axis=1).sum())
+
+            start = time.perf_counter()
+            carved, stats = carve_corridors(heights, extent, [(centres, args.width)], options)
+            seconds = time.perf_counter() - start
+            print(
+                f"{resolution + 1:>5}^2    {name:<13}{length:>10.0f}{stats['cells']:>9}{seconds * 1000:>11.1f}"
+                f"{cross_slope(heights, extent, vertices):>14.2f}{cross_slope(carved, extent, vertices):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
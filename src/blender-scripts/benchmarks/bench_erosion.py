@@ -0,0 +1,64 @@
+# 침식 단계 벤치마크 (erosion.py)
+# Blender 없이 해상도별 thermal / hydraulic / 합친 반복의 초당 반복 수를 측정한다.
+# 큐의 침식 시간 예산 (erosion_time_budget) 을 정할 때 사용:
+#   필요한 예산 ≈ erosion * EROSION_ITERATIONS / (합친 반복의 it/s)
+#
+# 사용법:
+#   python bench_erosion.py [--resolutions 512 2048] [--iterations 20]
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from heightfield import BASE_SIZE, Z_SCALE, read_terrain_params, grid_axes, compute_heightfield
+from erosion import EROSION_ITERATIONS, TALUS_ANGLE, hydraulic_step, thermal_step, erode
+
+
+def iterations_per_second(step, iterations):
+    step()  # 첫 반복 (캐시 / 메모리 할당) 은 측정에서 제외
+    start = time.perf_counter()
+    for _ in range(iterations):
+        step()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'grid':<10}{'thermal it/s':>14}{'hydraulic it/s':>16}{'combined it/s':>15}{'erosion=1 (s)':>15}")
+    for resolution in args.resolutions:
+        settings = read_terrain_params({"resolution": resolution})
+        xs, ys = grid_axes(resolution)
+        base = compute_heightfield(settings, xs, ys)
+        cell_size = BASE_SIZE * settings["terrain_scale"] / resolution
+        height_range = settings["height_multiplier"] * Z_SCALE
+        talus = np.tan(np.radians(TALUS_ANGLE)) * cell_size / height_range
+
+        heights = base.copy()
+        drops = np.empty((4,) + heights.shape, dtype=heights.dtype)
+        thermal = iterations_per_second(lambda: thermal_step(heights, talus, drops), args.iterations)
+
+        heights = base.copy()
+        water = np.zeros_like(heights)
+        sediment = np.zeros_like(heights)
+        hydraulic = iterations_per_second(lambda: hydraulic_step(heights, water, sediment, drops), args.iterations)
+
+        heights = base.copy()
+        stats = erode(heights, 1.0, cell_size, height_range, iterations=args.iterations)
+        combined = stats["iterations_per_second"]
+        print(
+            f"{resolution + 1:>5}^2   {thermal:>14.1f}{hydraulic:>16.1f}{combined:>15.1f}"
+            f"{EROSION_ITERATIONS / combined:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
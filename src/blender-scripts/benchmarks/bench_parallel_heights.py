@@ -0,0 +1,79 @@
+# 하이트필드 병렬 계산 스케일링 벤치마크: 워커 1 → N 개
+# Blender 없이 parallel_heights 의 프로세스 풀 경로만 측정 (메시 생성 제외)
+#
+# 사용법:
+#   python bench_parallel_heights.py [--resolution 2048] [--workers 1 2 4 8 16] [--json out.json]
+# 풀 기동 비용(spawn + numpy import)은 첫 실행에서 따로 측정하고, 이후 반복은 재사용된 풀 기준이다.
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from heightfield import read_terrain_params, grid_axes, compute_heightfield
+from parallel_heights import compute_heights, shutdown
+
+
+def default_workers():
+    counts = []
+    n = 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def measure(settings, xs, ys, workers, repeat):
+    start = time.perf_counter()
+    heights = compute_heights(settings, xs, ys, workers)
+    first = time.perf_counter() - start
+    del heights
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        heights = compute_heights(settings, xs, ys, workers)
+        best = min(best, time.perf_counter() - start)
+        del heights
+    return first, best
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolution", type=int, default=2048)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    settings = read_terrain_params({})
+    xs, ys = grid_axes(args.resolution)
+    reference = compute_heightfield(settings, xs, ys)
+
+    results = []
+    print(f"[Bench] {args.resolution + 1}^2 vertices, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>8}{'first(s)':>10}{'warm(s)':>10}{'speedup':>9}{'max diff':>10}")
+    for workers in args.workers:
+        first, warm = measure(settings, xs, ys, workers, args.repeat)
+        heights = compute_heights(settings, xs, ys, workers)
+        diff = float(np.abs(heights - reference).max())
+        del heights
+        speedup = results[0]["warm_seconds"] / warm if results else 1.0
+        results.append(
+            {"workers": workers, "first_seconds": first, "warm_seconds": warm, "speedup": speedup, "max_diff": diff}
+        )
+        print(f"{workers:>8}{first:>10.2f}{warm:>10.2f}{speedup:>8.1f}x{diff:>10.1e}")
+    shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+# 미리보기 벤치마크: EEVEE Top View 렌더 vs 하이트필드 NumPy 음영 PNG
+#
+# 사용법:
+#   python bench_preview.py --blender "C:\...\blender.exe" [--resolution 1024]
+#   python bench_preview.py --numpy-only [--resolution 1024]     # Blender 없이 NumPy 경로만 측정
+#
+# Blender 경로는 자식 프로세스에서 지형을 한 번 만든 뒤 (preview_mode=numpy) 같은 씬에서
+# render_preview (EEVEE) 와 render_heightmap_preview 를 각각 측정하고 "[BENCH] {json}" 을 출력한다.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from heightmap_preview import ramp_stops, render_heightmap_preview
+
+
+def time_numpy_preview(terrain_blend, out_dir, repeat=3):
+    best = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        render_heightmap_preview(terrain_blend, os.path.join(out_dir, f"numpy_{i}.png"))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ===== 자식 프로세스 (Blender 내부) =====
+def run_blender_case(resolution, out_dir):
+    import terrain_generator_v2
+
+    blend = os.path.join(out_dir, "bench.blend")
+    params = {"resolution": resolution, "preview_mode": "numpy", "use_cache": False}
+    terrain_generator_v2.generate_terrain(params, blend, os.path.join(out_dir, "first.png"))
+
+    start = time.perf_counter()
+    terrain_generator_v2.render_preview(os.path.join(out_dir, "eevee.png"))
+    eevee_seconds = time.perf_counter() - start
+
+    numpy_seconds = time_numpy_preview(blend, out_dir)
+    print("[BENCH] " + json.dumps({"resolution": resolution, "eevee_seconds": eevee_seconds, "numpy_seconds": numpy_seconds}))
+
+
+# ===== NumPy 전용 =====
+def run_numpy_only(resolution, out_dir):
+    from heightfield import read_terrain_params, grid_axes, compute_heightfield
+    from heightfield_io import save_heightfield
+
+    settings = read_terrain_params({"resolution": resolution})
+    xs, ys = grid_axes(resolution)
+    heights = compute_heightfield(settings, xs, ys)
+    size = 100.0 * settings["terrain_scale"]
+    blend = os.path.join(out_dir, "bench.blend")
+    save_heightfield(
+        blend,
+        heights * settings["height_multiplier"] * 3.0,
+        (-size / 2, size / 2, -size / 2, size / 2),
+        height_multiplier=settings["height_multiplier"],
+        z_scale=3.0,
+        color_ramp=ramp_stops(settings),
+    )
+    return {"resolution": resolution, "eevee_seconds": None, "numpy_seconds": time_numpy_preview(blend, out_dir)}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blender", help="Blender 실행 파일 경로")
+    parser.add_argument("--numpy-only", action="store_true")
+    parser.add_argument("--resolution", type=int, default=1024)
+    parser.add_argument("--child", action="store_true")
+    parser.add_argument("--out-dir")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_blender_case(args.resolution, args.out_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        if args.numpy_only:
+            result = run_numpy_only(args.resolution, out_dir)
+        elif args.blender:
+            command = [
+                args.blender, "--background", "--factory-startup",
+                "--python", os.path.abspath(__file__), "--",
+                "--child", "--resolution", str(args.resolution), "--out-dir", out_dir,
+            ]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            lines = [l for l in completed.stdout.splitlines() if l.startswith("[BENCH] ")]
+            if not lines:
+                print(completed.stdout[-2000:])
+                print(completed.stderr[-2000:])
+                raise RuntimeError("Blender preview benchmark failed")
+            result = json.loads(lines[-1][len("[BENCH] "):])
+        else:
+            parser.error("--blender 또는 --numpy-only 중 하나가 필요합니다")
+
+    print(f"[Bench] terrain resolution {result['resolution']}, preview 1024x1024")
+    if result["eevee_seconds"] is not None:
+        print(f"[Bench] EEVEE render: {result['eevee_seconds']:.2f}s")
+    print(f"[Bench] NumPy preview: {result['numpy_seconds']:.2f}s")
+    if result["eevee_seconds"] is not None:
+        print(f"[Bench] speedup: {result['eevee_seconds'] / result['numpy_seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    main(argv)
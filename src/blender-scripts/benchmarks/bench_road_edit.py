@@ -0,0 +1,78 @@
+# 도로 증분 편집 벤치마크: 제어점 하나 이동 시 전체 재생성 vs 바뀐 세그먼트만 splice
+# Blender 없이 road_mesh 배열 연산만 측정 (foreach_get/set 복사 비용 제외)
+#
+# 사용법:
+#   python bench_road_edit.py [--length 5000] [--points 20,100,400]
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from road_mesh import PROFILE_POINTS, build_road_arrays, changed_segment_spans, splice_arrays
+from road_uv import rotate_scale_uvs, uv_scale_for_length
+
+WIDTH = 1.6
+
+
+# length(m) 짜리 사인파 도로 control points (Blender 좌표)
+def wave_points(length, points):
+    x = np.linspace(-length / 2, length / 2, points)
+    return np.column_stack((x, 40.0 * np.sin(x / 60.0)))
+
+
+def full_build(points, resolution, uv_scale):
+    vertices, loops, uvs, rows = build_road_arrays(points, WIDTH, resolution)
+    return vertices, rotate_scale_uvs(uvs, uv_scale)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(length, n_points):
+    points = wave_points(length, n_points)
+    resolution = 32  # 짧은 세그먼트에서도 같은 행 밀도 (curve_resolution 최소값)
+    uv_scale = uv_scale_for_length(length)
+    co, uvs = full_build(points, resolution, uv_scale)
+
+    edited = points.copy()
+    edited[n_points // 2] += (5.0, 5.0)
+    spans = changed_segment_spans(points, edited)
+
+    full_seconds = timed(lambda: full_build(edited, resolution, uv_scale))
+    # road_generator.splice_road 와 같은 splice_arrays (메시 버퍼 대신 NumPy 배열에 기록, 지형 높이 없음)
+    state = {"resolution": resolution, "width": WIDTH, "maxError": 0.0, "uv_scale": uv_scale}
+    splice_seconds = timed(lambda: splice_arrays(co.copy(), uvs.copy(), state, edited, spans))
+    copy_seconds = timed(lambda: (co.copy(), uvs.copy()))
+
+    rows = len(co) // PROFILE_POINTS
+    spliced_rows = sum((stop - start) * resolution + 1 for start, stop in spans)
+    print(
+        f"[Bench] {n_points} points, {rows} rows: full {full_seconds * 1000:.2f}ms, "
+        f"splice {spliced_rows} rows {max(splice_seconds - copy_seconds, 0) * 1000:.2f}ms "
+        f"(+{copy_seconds * 1000:.2f}ms buffer copy)"
+    )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--length", type=float, default=5000.0)
+    parser.add_argument("--points", default="20,100,400")
+    args = parser.parse_args(argv)
+
+    for n_points in (int(v) for v in args.points.split(",")):
+        run(args.length, n_points)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
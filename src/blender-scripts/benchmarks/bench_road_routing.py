@@ -0,0 +1,85 @@
+# 도로 자동 경로 탐색 벤치마크 (road_routing.route_road)
+# Blender 없이 지형 해상도 x 경로별 탐색 시간 / 탐색 상태 수 / 경로 길이 / 경사를 측정하고
+# 같은 끝점을 직선으로 이었을 때의 경사와 비교한다. steep: max_grade 를 넘는 구간 비율
+# 완만한 지형 (gentle) 과 기본 지형 (default, 대부분 max_grade 보다 가파름) 에서 allow_steep 으로 탐색하고,
+# max_grade 안의 경로가 없어 대체 탐색을 쓴 경우 fallback 에 표시한다.
+#
+# 사용법:
+#   python bench_road_routing.py [--resolutions 512 1024 2048] [--max-grade 0.12]
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from heightfield import BASE_SIZE, Z_SCALE, read_terrain_params, grid_axes, compute_heightfield
+from heightfield_io import bilinear_sample
+from road_params import convert_control_points, read_route
+from road_routing import route_road
+
+# (이름, 지형 파라미터)
+TERRAINS = [
+    ("gentle", {"height_multiplier": 2}),
+    ("default", {}),
+]
+
+# (이름, route 파라미터 (웹 좌표))
+ROUTES = [
+    ("1km", {"start": [10, 50], "end": [90, 50]}),
+    ("diagonal", {"start": [10, 10], "end": [90, 90]}),
+    ("waypoints", {"start": [10, 80], "waypoints": [[50, 20], [70, 70]], "end": [90, 30]}),
+]
+
+
+def terrain(resolution, params=None):
+    settings = read_terrain_params({**(params or {}), "resolution": resolution})
+    xs, ys = grid_axes(resolution)
+    heights = compute_heightfield(settings, xs, ys) * np.float32(settings["height_multiplier"] * Z_SCALE)
+    half = BASE_SIZE * settings["terrain_scale"] / 2
+    return heights, (-half, half, -half, half)
+
+
+# 경유점을 직선으로 이었을 때의 최대 경사 (1m 간격)
+def straight_grade(heights, extent, route):
+    points, _length = convert_control_points(route["points"], extent)
+    grades = []
+    for a, b in zip(points[:-1], points[1:]):
+        steps = max(2, int(np.hypot(b[0] - a[0], b[1] - a[1])))
+        t = np.linspace(0.0, 1.0, steps)
+        x = a[0] + (b[0] - a[0]) * t
+        y = a[1] + (b[1] - a[1]) * t
+        z = bilinear_sample(heights, extent, x, y)
+        grades.append(np.abs(np.diff(z)) / np.hypot(np.diff(x), np.diff(y)))
+    return float(np.concatenate(grades).max())
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--max-grade", type=float, default=0.12)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'terrain':<10}{'preset':<9}{'route':<11}{'time(ms)':>9}{'coarse':>8}{'fine':>8}{'length(m)':>10}"
+        f"{'points':>7}{'max grade':>10}{'mean':>7}{'steep':>7}{'straight':>9}{'fallback':>9}"
+    )
+    for resolution in args.resolutions:
+        for preset, terrain_params in TERRAINS:
+            heights, extent = terrain(resolution, terrain_params)
+            for name, params in ROUTES:
+                route = read_route({**params, "max_grade": args.max_grade, "allow_steep": True}, name)
+                _points, stats = route_road(heights, extent, route)
+                print(
+                    f"{resolution + 1:>5}^2    {preset:<9}{name:<11}{stats['seconds'] * 1000:>9.0f}"
+                    f"{stats['expanded']['coarse']:>8}{stats['expanded']['fine']:>8}{stats['length']:>10.0f}"
+                    f"{stats['control_points']:>7}{stats['max_grade']:>10.3f}{stats['mean_grade']:>7.3f}"
+                    f"{stats['steep_fraction']:>7.1%}{straight_grade(heights, extent, route):>9.3f}"
+                    f"{'yes' if stats['fallback'] else 'no':>9}"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,134 @@
+# 도로 샘플링 벤치마크: 길이 기반 고정 해상도 vs 곡률 / 지형 기반 적응형 (road_mesh.adaptive_rows)
+# Blender 없이 행 수 / 정점 수 / 생성 시간 / 실제 최대 오차 (중심선, 지형 높이) 를 비교한다.
+# 실제 오차는 지형 셀 크기의 1/REFERENCE_FRACTION 간격 조밀 샘플로 따로 재고, 적응형이 max error 를 넘으면 표시한다.
+#
+# 사용법:
+#   python bench_road_sampling.py [--max-error 0.05] [--resolution 1024]
+# 지형 높이는 기본 파라미터 하이트필드 (heightfield.compute_heightfield) 를 bilinear 로 샘플링한다.
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from heightfield import BASE_SIZE, Z_SCALE, read_terrain_params, grid_axes, compute_heightfield
+from heightfield_io import bilinear_sample
+from road_mesh import (
+    PROFILE_POINTS,
+    adaptive_rows,
+    auto_handles,
+    build_road_arrays,
+    curve_resolution,
+    evaluate_rows,
+    sample_rows,
+)
+
+REFERENCE_FRACTION = 8  # 오차 측정용 조밀 샘플 간격 = 지형 셀 / REFERENCE_FRACTION
+
+# (이름, Blender 좌표 control points)
+ROADS = [
+    ("straight-2km", [(-900, -50), (-300, -40), (300, -30), (900, -20)]),
+    ("gentle-1km", [(-450, 0), (-150, 60), (150, -60), (450, 0)]),
+    ("hairpins-300m", [(0, -150), (40, -140), (45, -110), (0, -100), (-45, -90), (-40, -60), (0, -50), (40, -40)]),
+    ("mixed-3km", [(-450, -450), (-100, -420), (300, -400), (420, -200), (380, 100), (100, 200), (-300, 300), (-420, 450)]),
+]
+
+
+def terrain_sampler(resolution):
+    settings = read_terrain_params({"resolution": resolution})
+    xs, ys = grid_axes(resolution)
+    heights = compute_heightfield(settings, xs, ys) * np.float32(settings["height_multiplier"] * Z_SCALE)
+    half = BASE_SIZE * settings["terrain_scale"] / 2
+    extent = (-half, half, -half, half)
+
+    def sampler(x, y):
+        return bilinear_sample(heights, extent, np.asarray(x, np.float32), np.asarray(y, np.float32))
+
+    sampler.grid = (-half, -half, 2 * half / resolution, 2 * half / resolution)  # road_drape.terrain_sampler 와 같은 격자
+    return sampler
+
+
+# 조밀 샘플 각 점에서 행 폴리라인까지의 (수평 거리 최댓값, 행 사이 선형 보간 높이 오차 최댓값)
+# placement: 적응형 행 위치 (seg_idx, t), 없으면 resolution 에 따라 균등한 t
+def measure_error(points, resolution, placement, sampler):
+    left, right = auto_handles(points)
+    n = len(points) - 1
+    if placement is None:
+        rows, _ = sample_rows(points, left, right, resolution, 0, n)
+        seg_idx = np.append(np.repeat(np.arange(n), resolution), n - 1)
+        row_t = np.append(np.tile(np.arange(resolution) / resolution, n), 1.0)
+    else:
+        rows, _ = evaluate_rows(points, left, right, *placement)
+        seg_idx, row_t = placement
+    lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    dense_counts = np.ceil(lengths * 2 / (sampler.grid[2] / REFERENCE_FRACTION)).astype(np.int64)
+    dense, _ = sample_rows(points, left, right, dense_counts, 0, n)
+
+    # 조밀 샘플이 속한 행 구간: 전역 매개변수 (세그먼트 + t) 로 정렬된 행 위치에서 탐색
+    row_param = seg_idx + row_t
+    first = np.repeat(np.concatenate(([0], np.cumsum(dense_counts)))[:-1], dense_counts)
+    dense_param = np.append(
+        np.repeat(np.arange(n), dense_counts) + (np.arange(dense_counts.sum()) - first) / np.repeat(dense_counts, dense_counts),
+        n,
+    )
+    row = np.clip(np.searchsorted(row_param, dense_param, side="right") - 1, 0, len(rows) - 2)
+
+    a = rows[row]
+    b = rows[row + 1]
+    ab = b - a
+    t = np.clip(((dense - a) * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-12), 0.0, 1.0)
+    projected = a + ab * t[:, None]
+    horizontal = float(np.linalg.norm(dense - projected, axis=1).max())
+
+    za = sampler(a[:, 0], a[:, 1])
+    zb = sampler(b[:, 0], b[:, 1])
+    vertical = float(np.abs(za + (zb - za) * t - sampler(dense[:, 0], dense[:, 1])).max())
+    return horizontal, vertical
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-error", type=float, default=0.05)
+    parser.add_argument("--resolution", type=int, default=1024, help="지형 하이트필드 해상도")
+    parser.add_argument("--width", type=float, default=1.6)
+    args = parser.parse_args(argv)
+
+    sampler = terrain_sampler(args.resolution)
+    print(f"[Bench] max error {args.max_error}m, terrain {args.resolution + 1}^2")
+    print(f"{'road':<15}{'mode':<10}{'rows':>7}{'vertices':>10}{'build(ms)':>11}{'xy err(m)':>11}{'z err(m)':>10}  bound")
+    for name, points in ROADS:
+        points = np.asarray(points, dtype=np.float64)
+        length = float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+        fixed = curve_resolution(length)
+        cases = [
+            ("fixed", lambda: (fixed, None)),
+            ("adaptive", lambda: adaptive_rows(points, args.width, args.max_error, sampler, terrain_grid=sampler.grid)[:2]),
+        ]
+        for mode, layout in cases:
+            (resolution, placement), layout_seconds = timed(layout)
+            (_verts, _loops, _uvs, rows), build_seconds = timed(
+                lambda: build_road_arrays(points, args.width, resolution, placement)
+            )
+            horizontal, vertical = measure_error(points, resolution, placement, sampler)
+            print(
+                f"{name:<15}{mode:<10}{rows:>7}{rows * PROFILE_POINTS:>10}"
+                f"{(layout_seconds + build_seconds) * 1000:>11.2f}{horizontal:>11.3f}{vertical:>10.3f}"
+                f"  {'ok' if max(horizontal, vertical) <= args.max_error else 'MISSED'}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+# 도로 UV 변환 마이크로 벤치마크: bmesh EDIT 모드 루프 vs NumPy foreach_get/set
+#
+# 사용법:
+#   blender --background --factory-startup --python bench_road_uv.py -- [--length 5000] [--roads 1]
+#   python bench_road_uv.py --numpy-only [--length 5000]   # Blender 없이 배열 변환만 측정
+import argparse
+import math
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+import numpy as np
+
+from road_mesh import PROFILE_SEGMENTS, curve_resolution, row_count
+from road_uv import rotate_scale_uvs, uv_scale_for_length
+
+
+# 1km 지형(웹 좌표 0-100) 안을 지그재그로 왕복하는 length(m) 짜리 control points
+def zigzag_points(length, points=20):
+    leg = length / (points - 1)
+    dy = 800.0 / (points - 1)  # 웹 좌표 10 → 90 (800m) 을 따라 진행
+    dx = min(math.sqrt(max(leg * leg - dy * dy, 0.0)), 800.0)
+    return [
+        {"x": 50 + (dx / 20 if i % 2 else -dx / 20), "y": 10 + i * dy / 10}
+        for i in range(points)
+    ]
+
+
+def build_road(controls):
+    import road_generator
+    from road_mesh import curve_resolution
+
+    converted, total_length = road_generator.convert_control_points(controls)
+    obj = road_generator.create_road_object(
+        "Road", np.asarray(converted), 1.6, curve_resolution(total_length)
+    )
+    return obj, total_length
+
+
+def legacy_uv_loop(obj, total_length):
+    import bpy  # type: ignore
+    import bmesh  # type: ignore
+
+    y_scale_factor = uv_scale_for_length(total_length)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    bm = bmesh.from_edit_mesh(obj.data)
+    uv_layer = bm.loops.layers.uv.active
+    for face in bm.faces:
+        for loop in face.loops:
+            uv = loop[uv_layer].uv
+            u, v = uv.x, uv.y
+            uv.x = -v
+            uv.y = u * y_scale_factor
+    bmesh.update_edit_mesh(obj.data)
+    bm.free()
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+
+def run_blender(length, roads):
+    import bpy  # type: ignore
+    from road_uv import transform_mesh_uvs
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    built = [build_road(zigzag_points(length)) for _ in range(roads * 2)]
+    legacy, vectorized = built[:roads], built[roads:]
+    loops = sum(len(obj.data.loops) for obj, _ in legacy)
+    print(f"[Bench] {roads} road(s), {built[0][1]:.0f}m each, {loops} UV loops")
+
+    start = time.perf_counter()
+    for obj, total_length in legacy:
+        legacy_uv_loop(obj, total_length)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    transform_mesh_uvs(
+        [obj.data for obj, _ in vectorized],
+        [uv_scale_for_length(total_length) for _, total_length in vectorized],
+    )
+    numpy_seconds = time.perf_counter() - start
+
+    # 두 경로 결과 동일성 확인
+    a = np.empty(len(legacy[0][0].data.loops) * 2, dtype=np.float32)
+    b = np.empty_like(a)
+    legacy[0][0].data.uv_layers.active.data.foreach_get("uv", a)
+    vectorized[0][0].data.uv_layers.active.data.foreach_get("uv", b)
+    print(f"[Bench] max |legacy - numpy| = {np.abs(a - b).max():.2e}")
+    print(f"[Bench] bmesh loop: {legacy_seconds * 1000:.1f}ms")
+    print(f"[Bench] numpy:      {numpy_seconds * 1000:.1f}ms ({legacy_seconds / max(numpy_seconds, 1e-9):.0f}x)")
+
+
+def run_numpy_only(length):
+    # road_generator 와 같은 행 수: 세그먼트당 curve_resolution 행, 프로필 10 세그먼트, 쿼드당 4 loop
+    rows = row_count(20, curve_resolution(length))
+    loops = (rows - 1) * PROFILE_SEGMENTS * 4
+    uvs = np.random.default_rng(0).random((loops, 2), dtype=np.float32)
+
+    start = time.perf_counter()
+    rotate_scale_uvs(uvs, uv_scale_for_length(length))
+    seconds = time.perf_counter() - start
+    print(f"[Bench] {loops} UV loops, numpy transform: {seconds * 1000:.2f}ms")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--length", type=float, default=5000.0)
+    parser.add_argument("--roads", type=int, default=1)
+    parser.add_argument("--numpy-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.numpy_only:
+        run_numpy_only(args.length)
+    else:
+        run_blender(args.length, args.roads)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    main(argv)
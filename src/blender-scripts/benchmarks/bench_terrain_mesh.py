@@ -0,0 +1,207 @@
+# 지형 메시 생성 벤치마크: 기존 SUBSURF+DISPLACE 적용 경로 vs NumPy 하이트필드 경로
+#
+# 사용법 (드라이버, 일반 python 또는 blender 어디서든 실행 가능):
+#   python bench_terrain_mesh.py --blender "C:\...\blender.exe" [--resolutions 200 512 1024 2048]
+#   python bench_terrain_mesh.py --numpy-only          # Blender 없이 높이 계산만 측정 (단일 / 타일)
+#
+# 각 (경로, 해상도) 조합은 별도 Blender 프로세스에서 실행되어 peak RSS 가 섞이지 않는다.
+# 자식 프로세스는 마지막에 "[BENCH] {json}" 한 줄을 출력한다.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+DEFAULT_RESOLUTIONS = [200, 512, 1024, 2048]
+
+
+def peak_rss_mb():
+    try:
+        import resource
+
+        # Linux: KB, macOS: bytes
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024.0 if sys.platform != "darwin" else rss / (1024.0 * 1024.0)
+    except ImportError:
+        pass
+    try:
+        import psutil  # type: ignore
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024.0 * 1024.0)
+    except ImportError:
+        return None
+
+
+# ===== 자식 프로세스 (Blender 내부) =====
+def run_legacy(resolution, settings):
+    import bpy  # type: ignore
+
+    # 기존 경로: grid(res/8) + SUBSURF level 3 = res 세그먼트
+    bpy.ops.mesh.primitive_grid_add(
+        size=100, x_subdivisions=resolution // 8, y_subdivisions=resolution // 8
+    )
+    terrain = bpy.context.active_object
+    displace = terrain.modifiers.new(name="Displacement", type="DISPLACE")
+    displace.strength = settings["height_multiplier"]
+    displace.mid_level = 0.5
+    subsurf = terrain.modifiers.new(name="Subdivision", type="SUBSURF")
+    subsurf.levels = 3
+    noise_tex = bpy.data.textures.new("ComplexNoise", type="CLOUDS")
+    noise_tex.noise_scale = settings["base_scale"]
+    noise_tex.noise_depth = settings["octaves"]
+    displace.texture = noise_tex
+    bpy.ops.object.modifier_apply(modifier="Subdivision")
+    bpy.ops.object.modifier_apply(modifier="Displacement")
+    terrain.scale = (settings["terrain_scale"], settings["terrain_scale"], 3)
+    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+    return len(terrain.data.vertices)
+
+
+def run_numpy(resolution, settings, build_mesh=True):
+    from heightfield import grid_axes, compute_heightfield, grid_vertices
+
+    xs, ys = grid_axes(resolution)
+    heights = compute_heightfield(settings, xs, ys)
+    vertices = grid_vertices(
+        heights, xs, ys, settings["terrain_scale"], settings["height_multiplier"]
+    )
+    if not build_mesh:
+        return len(vertices) // 3
+
+    from terrain_mesh import build_grid_object
+
+    terrain = build_grid_object("Terrain", vertices, len(xs), len(ys))
+    return len(terrain.data.vertices)
+
+
+# 타일 경로: TILE_RESOLUTION 타일로 나눠 계산하고 sidecar memmap 에 기록 (peak 메모리 ≈ 타일 1개)
+TILE_RESOLUTION = 256
+
+
+def run_numpy_tiled(resolution, settings):
+    import tempfile
+
+    from heightfield import NoiseBasis
+    from heightfield_io import create_heightfield
+    from terrain_tiles import iter_tiles, world_axis, tile_slices, tile_heights
+
+    tiles = max(1, resolution // TILE_RESOLUTION)
+    tile_resolution = resolution // tiles
+    axis = world_axis(tiles, tile_resolution)
+    basis = NoiseBasis(settings["seed"])
+    with tempfile.TemporaryDirectory() as tmp:
+        heights_out = create_heightfield(os.path.join(tmp, "bench.blend"), (len(axis), len(axis)))
+        for ix, iy in iter_tiles(tiles):
+            _xs, _ys, padded = tile_heights(settings, axis, ix, iy, tile_resolution, basis)
+            rows, cols = tile_slices(ix, iy, tile_resolution)
+            heights_out[rows, cols] = padded[1:-1, 1:-1]
+        heights_out.flush()
+        del heights_out
+    return len(axis) * len(axis)
+
+
+def run_case(case, resolution):
+    from heightfield import read_terrain_params
+
+    settings = read_terrain_params({})
+    baseline_rss = peak_rss_mb()
+
+    if case == "legacy":
+        import bpy  # type: ignore
+
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    start = time.perf_counter()
+    if case == "legacy":
+        vertex_count = run_legacy(resolution, settings)
+    elif case == "numpy-tiled":
+        vertex_count = run_numpy_tiled(resolution, settings)
+    else:
+        vertex_count = run_numpy(resolution, settings, build_mesh=(case == "numpy"))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "case": case,
+        "resolution": resolution,
+        "vertices": vertex_count,
+        "seconds": round(elapsed, 4),
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print("[BENCH] " + json.dumps(result))
+
+
+# ===== 드라이버 =====
+def spawn_case(blender, case, resolution):
+    if blender:
+        command = [
+            blender, "--background", "--factory-startup",
+            "--python", os.path.abspath(__file__), "--",
+            "--case", case, "--resolution", str(resolution),
+        ]
+    else:
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--case", case, "--resolution", str(resolution),
+        ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("[BENCH] "):
+            return json.loads(line[len("[BENCH] "):])
+    print(completed.stdout[-2000:])
+    print(completed.stderr[-2000:])
+    raise RuntimeError(f"benchmark case {case}@{resolution} failed")
+
+
+def print_table(results):
+    print(f"{'case':<12}{'res':>6}{'verts':>12}{'time(s)':>10}{'peak RSS(MB)':>14}")
+    for r in results:
+        rss = r["peak_rss_mb"]
+        rss_text = f"{rss:.0f}" if rss is not None else "n/a"
+        print(
+            f"{r['case']:<12}{r['resolution']:>6}{r['vertices']:>12}"
+            f"{r['seconds']:>10.2f}{rss_text:>14}"
+        )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blender", help="Blender 실행 파일 경로")
+    parser.add_argument("--numpy-only", action="store_true")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=DEFAULT_RESOLUTIONS)
+    parser.add_argument("--case", choices=["legacy", "numpy", "numpy-heights", "numpy-tiled"])
+    parser.add_argument("--resolution", type=int)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    if args.case:
+        run_case(args.case, args.resolution)
+        return
+
+    if args.numpy_only:
+        cases = ["numpy-heights", "numpy-tiled"]
+    elif args.blender:
+        cases = ["legacy", "numpy"]
+    else:
+        parser.error("--blender 또는 --numpy-only 중 하나가 필요합니다")
+
+    results = []
+    for resolution in args.resolutions:
+        for case in cases:
+            results.append(spawn_case(None if args.numpy_only else args.blender, case, resolution))
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    # Blender 에서 실행된 경우 "--" 뒤의 인자만 사용
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    main(argv)
@@ -0,0 +1,61 @@
+# 지형 믹서 벤치마크 (heightfield.sample_regions)
+# Blender 없이 같은 그리드에서
+#   single: 기본 지형 하나
+#   mixed:  영역 n 개를 한 패스로 섞은 지형 (영역 마스크 bounding box 안에서 가중치가 있는 셀만 계산)
+#   naive:  층마다 전체 지형을 따로 계산 (영역 수 + 1 배)
+# 의 하이트필드 계산 시간을 비교한다.
+#
+# 사용법:
+#   python bench_terrain_mixer.py [--resolution 1024]
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from heightfield import REGION_KEYS, read_terrain_params, grid_axes, compute_heightfield
+
+# 오른쪽 평지 / 북서쪽 봉우리 / 남쪽 계단식 지형 / 북동쪽 페인트 마스크 골짜기 (각 영역은 맵 일부만 덮음)
+VALLEY_MASK = [[0.0] * 9 for _ in range(9)]
+for row, col in ((1, 6), (1, 7), (2, 6), (2, 7)):  # 0 행 = 이미지 위쪽 (북쪽)
+    VALLEY_MASK[row][col] = 1.0
+
+REGIONS = [
+    {"mask": {"type": "half_plane", "direction": [1, 0]}, "height_multiplier": 5, "base_scale": 40, "peak_sharpness": 0},
+    {"mask": {"type": "radial", "center": [25, 75], "radius": 20}, "height_multiplier": 60, "noise_type": "MUSGRAVE"},
+    {"mask": {"type": "half_plane", "point": [50, 20], "direction": [0, -1], "falloff": 5}, "terrace_levels": 6},
+    {"mask": {"type": "image", "values": VALLEY_MASK}, "seed": 7, "valley_depth": 1.0},
+]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolution", type=int, default=1024)
+    args = parser.parse_args(argv)
+    xs, ys = grid_axes(args.resolution)
+
+    single = read_terrain_params({"resolution": args.resolution})
+    single_seconds = timed(lambda: compute_heightfield(single, xs, ys))
+    print(f"[Bench] grid {args.resolution + 1}^2, single terrain {single_seconds:.2f}s")
+    print(f"{'regions':>8}{'mixed(s)':>10}{'naive(s)':>10}{'mixed/single':>14}")
+    for count in range(1, len(REGIONS) + 1):
+        mixed = read_terrain_params({"resolution": args.resolution, "regions": REGIONS[:count]})
+        mixed_seconds = timed(lambda: compute_heightfield(mixed, xs, ys))
+        layers = [mixed] + mixed["regions"]
+        naive_seconds = sum(
+            timed(lambda: compute_heightfield({**mixed, **{k: layer[k] for k in REGION_KEYS}, "regions": []}, xs, ys))
+            for layer in layers
+        )
+        print(f"{count:>8}{mixed_seconds:>10.2f}{naive_seconds:>10.2f}{mixed_seconds / single_seconds:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,339 @@
+# 지형 / 도로 생성 벤치마크 스위트: 고정된 파라미터 매트릭스를 Blender headless 로 실행
+#
+# 케이스마다 params JSON 을 만들어 생성기 스크립트를 새 Blender 프로세스로 실행하고,
+# 스크립트가 마지막에 출력하는 "[PROFILE] {json}" (profiling.py) 에서 단계별 시간 / 최대 RSS / 출력 크기를 모은다.
+#   terrain: terrain_scale x octaves x noise_layers
+#   road:    도로 길이 x control point 수 (기본 지형 하나를 먼저 만들어 공유)
+#
+# 사용법:
+#   python run_benchmarks.py --blender "C:\...\blender.exe" --out results.json
+#   python run_benchmarks.py --blender ... --baseline baseline.json         # 기준 결과와 비교
+#   python run_benchmarks.py --blender ... --save-baseline baseline.json    # 이번 결과를 기준으로 저장
+#   python run_benchmarks.py --compare baseline.json results.json           # 실행 없이 두 결과 비교
+#   python run_benchmarks.py --list                                          # 케이스 목록만 출력
+# 반복(--repeat) 결과는 중앙값으로 요약하고, 비교 시 --threshold (기본 10%) 보다 느려진 항목을 회귀로 표시한다.
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_ROOT = os.path.dirname(SCRIPT_DIR)
+
+PROFILE_PREFIX = "[PROFILE] "
+RESULTS_VERSION = 1
+
+# 매트릭스 (값을 바꾸면 기준 결과와 케이스 id 가 달라지므로 기준을 다시 저장할 것)
+TERRAIN_MATRIX = {
+    "terrain_scale": [5, 10, 20],
+    "octaves": [4, 8],
+    "noise_layers": [1, 3],
+}
+ROAD_MATRIX = {
+    "length_m": [300, 900],
+    "points": [4, 16],
+}
+ROAD_WIDTH = 1.6
+# 미세한 시간 차이는 잡음이므로 이 값(초) 이하 단계는 회귀 판정에서 제외
+MIN_COMPARE_SECONDS = 0.05
+
+
+# ===== 매트릭스 → 케이스 =====
+def _product(matrix):
+    keys = list(matrix)
+    for values in itertools.product(*(matrix[k] for k in keys)):
+        yield dict(zip(keys, values))
+
+
+def terrain_cases(base_params):
+    cases = []
+    for combo in _product(TERRAIN_MATRIX):
+        case_id = "terrain-scale{terrain_scale}-oct{octaves}-layers{noise_layers}".format(**combo)
+        cases.append({"id": case_id, "kind": "terrain", "params": {**base_params, **combo}})
+    return cases
+
+
+# 웹 좌표 (0-100, 1 단위 = 10m) 에서 길이 length_m, 점 points 개인 완만한 S 자 도로
+def road_control_points(length_m, points):
+    span = length_m / 10.0
+    control_points = []
+    for i in range(points):
+        t = i / (points - 1)
+        x = 50.0 - span / 2 + span * t
+        y = 50.0 + 0.1 * span * math.sin(2 * math.pi * t)
+        control_points.append({"x": round(x, 3), "y": round(y, 3)})
+    return control_points
+
+
+def road_cases(base_params):
+    cases = []
+    for combo in _product(ROAD_MATRIX):
+        case_id = "road-len{length_m}-pts{points}".format(**combo)
+        params = {
+            **base_params,
+            "controlPoints": road_control_points(combo["length_m"], combo["points"]),
+            "width": ROAD_WIDTH,
+        }
+        cases.append({"id": case_id, "kind": "road", "params": params, "matrix": combo})
+    return cases
+
+
+# ===== 실행 =====
+def blender_version(blender):
+    try:
+        completed = subprocess.run([blender, "--version"], capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    lines = completed.stdout.strip().splitlines()
+    return lines[0] if lines else None
+
+
+def parse_profile(stdout):
+    lines = [line for line in stdout.splitlines() if line.startswith(PROFILE_PREFIX)]
+    if not lines:
+        return None
+    return json.loads(lines[-1][len(PROFILE_PREFIX) :])
+
+
+def run_script(blender, script, args, timeout):
+    command = [blender, "--background", "--factory-startup", "--python", os.path.join(SCRIPTS_ROOT, script), "--"]
+    command += args
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    profile = parse_profile(completed.stdout)
+    if completed.returncode != 0 or profile is None:
+        print(completed.stdout[-2000:])
+        print(completed.stderr[-2000:])
+        raise RuntimeError(f"{script} failed (code {completed.returncode})")
+    return profile
+
+
+def run_case(blender, case, work_dir, terrain_blend, timeout):
+    params_path = os.path.join(work_dir, case["id"] + "_params.json")
+    with open(params_path, "w") as f:
+        json.dump(case["params"], f)
+    output = os.path.join(work_dir, case["id"] + ".blend")
+    preview = os.path.join(work_dir, case["id"] + "_preview.png")
+    if case["kind"] == "terrain":
+        return run_script(blender, "terrain_generator_v2.py", [params_path, output, preview], timeout)
+    return run_script(blender, "road_generator.py", [params_path, terrain_blend, output, preview], timeout)
+
+
+# 반복 실행한 프로파일들 → 중앙값 요약
+def summarize(profiles):
+    phase_names = []
+    for profile in profiles:
+        for phase in profile["phases"]:
+            if phase["name"] not in phase_names:
+                phase_names.append(phase["name"])
+
+    def median_of(values):
+        values = [v for v in values if v is not None]
+        return statistics.median(values) if values else None
+
+    phases = {}
+    for name in phase_names:
+        records = [p for profile in profiles for p in profile["phases"] if p["name"] == name]
+        phases[name] = {
+            "wall_seconds": median_of([r["wall_seconds"] for r in records]),
+            "cpu_seconds": median_of([r["cpu_seconds"] for r in records]),
+        }
+    last = profiles[-1]
+    return {
+        "runs": len(profiles),
+        "wall_seconds": median_of([p["wall_seconds"] for p in profiles]),
+        "wall_seconds_min": min(p["wall_seconds"] for p in profiles),
+        "cpu_seconds": median_of([p["cpu_seconds"] for p in profiles]),
+        "peak_rss_mb": median_of([p["peak_rss_mb"] for p in profiles]),
+        "counts": last["counts"],
+        "outputs": last["outputs"],
+        "phases": phases,
+    }
+
+
+# ===== 비교 =====
+def _delta(base, current):
+    if base is None or current is None or base == 0:
+        return None
+    return (current - base) / base
+
+
+# 케이스별 총 시간 / 단계 시간 / 최대 RSS / 출력 크기 비교 → 행 목록
+def compare_results(baseline, current, threshold):
+    rows = []
+    for case_id, case in current["cases"].items():
+        base = baseline["cases"].get(case_id)
+        if base is None:
+            rows.append({"case": case_id, "metric": "(new case)", "base": None, "current": None, "delta": None, "regression": False})
+            continue
+
+        metrics = [("wall_seconds", base["wall_seconds"], case["wall_seconds"], True)]
+        for name, phase in case["phases"].items():
+            base_phase = base["phases"].get(name, {})
+            significant = max(phase["wall_seconds"] or 0, base_phase.get("wall_seconds") or 0) >= MIN_COMPARE_SECONDS
+            metrics.append((f"phase:{name}", base_phase.get("wall_seconds"), phase["wall_seconds"], significant))
+        metrics.append(("peak_rss_mb", base["peak_rss_mb"], case["peak_rss_mb"], True))
+        for role, size in case["outputs"].items():
+            metrics.append((f"bytes:{role}", base["outputs"].get(role), size, True))
+
+        for metric, base_value, current_value, significant in metrics:
+            delta = _delta(base_value, current_value)
+            rows.append({
+                "case": case_id,
+                "metric": metric,
+                "base": base_value,
+                "current": current_value,
+                "delta": delta,
+                "regression": significant and delta is not None and delta > threshold,
+            })
+    for case_id in baseline["cases"]:
+        if case_id not in current["cases"]:
+            rows.append({"case": case_id, "metric": "(missing case)", "base": None, "current": None, "delta": None, "regression": False})
+    return rows
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def print_results(results):
+    phase_names = []
+    for case in results["cases"].values():
+        for name in case["phases"]:
+            if name not in phase_names:
+                phase_names.append(name)
+    header = f"{'case':<36}{'total(s)':>10}{'rss(MB)':>9}" + "".join(f"{name[:12]:>13}" for name in phase_names)
+    print(header)
+    print("-" * len(header))
+    for case_id, case in results["cases"].items():
+        line = f"{case_id:<36}{_fmt(case['wall_seconds']):>10}{_fmt(case['peak_rss_mb']):>9}"
+        line += "".join(f"{_fmt(case['phases'].get(name, {}).get('wall_seconds')):>13}" for name in phase_names)
+        print(line)
+
+
+# 비교 결과 출력 → 회귀 개수. 변화 없는 출력 크기 / 미미한 단계는 생략
+def print_comparison(rows, threshold):
+    print(f"\n[Bench] Comparison against baseline (regression > {threshold * 100:.0f}%)")
+    print(f"{'case':<36}{'metric':<28}{'base':>12}{'current':>12}{'delta':>9}")
+    regressions = 0
+    for row in rows:
+        if row["delta"] is not None and abs(row["delta"]) < 0.005 and not row["regression"]:
+            continue
+        delta = "-" if row["delta"] is None else f"{row['delta'] * 100:+.1f}%"
+        flag = "  REGRESSION" if row["regression"] else ""
+        regressions += row["regression"]
+        print(f"{row['case']:<36}{row['metric']:<28}{_fmt(row['base']):>12}{_fmt(row['current']):>12}{delta:>9}{flag}")
+    print(f"[Bench] {regressions} regression(s)")
+    return regressions
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {results.get('version')}")
+    return results
+
+
+def save_results(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[Bench] Results saved: {path}")
+
+
+def run_suite(args, cases):
+    terrain_base = {"resolution": args.resolution, "use_cache": False, "preview_mode": args.preview_mode}
+    results = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "blender": blender_version(args.blender),
+        "settings": {"repeat": args.repeat, "resolution": args.resolution, "preview_mode": args.preview_mode},
+        "cases": {},
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        terrain_blend = None
+        if any(case["kind"] == "road" for case in cases):
+            # 도로 케이스가 공유하는 기본 지형 (측정 대상 아님)
+            print(f"[Bench] Building base terrain for road cases...")
+            base_case = {"id": "base-terrain", "kind": "terrain", "params": terrain_base}
+            run_case(args.blender, base_case, work_dir, None, args.timeout)
+            terrain_blend = os.path.join(work_dir, "base-terrain.blend")
+
+        for case in cases:
+            profiles = []
+            for run in range(args.repeat):
+                profiles.append(run_case(args.blender, case, work_dir, terrain_blend, args.timeout))
+                print(f"[Bench] {case['id']} run {run + 1}/{args.repeat}: {profiles[-1]['wall_seconds']:.2f}s")
+            results["cases"][case["id"]] = {
+                "kind": case["kind"],
+                "params": case.get("matrix") or {k: case["params"][k] for k in TERRAIN_MATRIX},
+                **summarize(profiles),
+            }
+    return results
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blender", help="Blender 실행 파일 경로")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--resolution", type=int, default=512, help="terrain 케이스 그리드 해상도")
+    parser.add_argument("--preview-mode", default="eevee", choices=["eevee", "numpy"])
+    parser.add_argument("--filter", help="케이스 id 에 이 문자열이 포함된 것만 실행")
+    parser.add_argument("--timeout", type=int, default=1800, help="케이스 1회 실행 제한 (초)")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준 결과로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="실행 없이 두 결과 비교")
+    parser.add_argument("--list", action="store_true", help="케이스 목록만 출력")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (load_results(path) for path in args.compare)
+        print_results(current)
+        return 1 if print_comparison(compare_results(baseline, current, args.threshold), args.threshold) else 0
+
+    cases = terrain_cases({"resolution": args.resolution, "use_cache": False, "preview_mode": args.preview_mode})
+    cases += road_cases({"preview_mode": args.preview_mode})
+    if args.filter:
+        cases = [case for case in cases if args.filter in case["id"]]
+    if args.list:
+        for case in cases:
+            print(case["id"])
+        return 0
+    if not args.blender:
+        parser.error("--blender 가 필요합니다 (--compare / --list 제외)")
+
+    print(f"[Bench] {len(cases)} case(s) x {args.repeat} run(s)")
+    results = run_suite(args, cases)
+    print()
+    print_results(results)
+    if args.out:
+        save_results(args.out, results)
+    if args.save_baseline:
+        save_results(args.save_baseline, results)
+
+    if args.baseline:
+        rows = compare_results(load_results(args.baseline), results, args.threshold)
+        return 1 if print_comparison(rows, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
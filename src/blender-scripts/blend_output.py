@@ -0,0 +1,99 @@
+# .blend 출력 마무리: 고아 데이터블록 정리 + (옵션) 압축 저장 + 크기 보고
+#
+# 파라미터 (terrain / road 공통):
+#   compress_blend:        True 면 save_as_mainfile(compress=True) (zstd, 저장 / 로드가 조금 느려짐)
+#   measure_blend_savings: True 면 정리 전 상태를 기본 설정(비압축)으로 한 번 더 저장해 줄어든 바이트를 측정
+# output_options 는 bpy 없이도 쓸 수 있도록 (cost_estimator) bpy 는 함수 안에서 import
+import os
+
+from result_cache import read_flag
+
+# 고아 정리 전후 개수를 세는 데이터블록 종류
+_ID_COLLECTIONS = (
+    "objects",
+    "meshes",
+    "curves",
+    "materials",
+    "textures",
+    "images",
+    "node_groups",
+    "cameras",
+    "lights",
+    "worlds",
+    "collections",
+    "actions",
+)
+
+
+def output_options(params):
+    return {
+        "compress": read_flag(params, "compress_blend", False),
+        "measure": read_flag(params, "measure_blend_savings", False),
+    }
+
+
+def _id_count():
+    import bpy  # type: ignore
+
+    return sum(len(getattr(bpy.data, name)) for name in _ID_COLLECTIONS)
+
+
+# 사용자가 없는 데이터블록을 재귀적으로 삭제 (예: 지운 오브젝트의 메시 → 그 메시만 쓰던 Material) → 삭제 개수
+def purge_orphans():
+    import bpy  # type: ignore
+
+    before = _id_count()
+    if hasattr(bpy.data, "orphans_purge"):
+        bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    else:
+        bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    return before - _id_count()
+
+
+# 링크된 라이브러리 .blend 크기 합 (출력 파일에 복사되지 않은 바이트)
+def library_bytes():
+    import bpy  # type: ignore
+
+    total = 0
+    for library in bpy.data.libraries:
+        path = bpy.path.abspath(library.filepath)
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+# 고아 정리 + 저장 → 크기 통계 dict
+def save_blend(output_path, compress=False, measure=False):
+    import bpy  # type: ignore
+
+    reference_bytes = None
+    if measure:
+        # 정리 전 / 비압축 (기존 저장 방식) 크기. copy=True 라 현재 세션의 파일 경로는 바뀌지 않는다.
+        reference_path = os.path.splitext(output_path)[0] + "_reference.blend"
+        bpy.ops.wm.save_as_mainfile(filepath=reference_path, copy=True, compress=False)
+        reference_bytes = os.path.getsize(reference_path)
+        os.remove(reference_path)
+
+    purged = purge_orphans()
+    bpy.ops.wm.save_as_mainfile(filepath=output_path, compress=compress)
+    size = os.path.getsize(output_path)
+    return {
+        "bytes": size,
+        "purged": purged,
+        "compressed": compress,
+        "reference_bytes": reference_bytes,
+        "bytes_saved": None if reference_bytes is None else reference_bytes - size,
+        "library_bytes": library_bytes(),
+    }
+
+
+# 로그 한 줄용 요약
+def format_save_stats(stats):
+    text = f"{stats['bytes'] / (1024 * 1024):.2f}MB, purged {stats['purged']} datablock(s)"
+    if stats["compressed"]:
+        text += ", compressed"
+    if stats["bytes_saved"] is not None:
+        text += f", saved {stats['bytes_saved'] / (1024 * 1024):.2f}MB vs default save"
+    if stats["library_bytes"]:
+        text += f", linked libraries {stats['library_bytes'] / (1024 * 1024):.2f}MB (not copied)"
+    return text
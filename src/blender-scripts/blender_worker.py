@@ -0,0 +1,130 @@
+# 영구 Blender 워커: Blender 를 한 번만 띄워 여러 terrain/road 작업을 처리한다.
+#
+# 실행:
+#   blender --background --python blender_worker.py                 # stdin JSON-lines
+#   blender --background --python blender_worker.py -- --port 9100   # localhost TCP JSON-lines
+#
+# 요청 (한 줄에 하나):
+#   {"id": "job-1", "type": "terrain", "params": {...}, "output": "a.blend", "preview": "a.png"}
+#   {"id": "job-2", "type": "road", "params": {...}, "terrain": "a.blend", "output": "b.blend", "preview": "b.png"}
+#   {"id": "x", "type": "shutdown"}
+#   ("params" 대신 "params_file" 로 JSON 파일 경로를 줄 수도 있다)
+#
+# 응답: 생성기 로그와 구분하기 위해 "[WORKER_RESULT] " 접두사를 붙인 JSON 한 줄
+#   {"id": "job-1", "status": "ok", "result": {...}, "seconds": 12.3}
+#   {"id": "job-1", "status": "error", "error": "...", "seconds": 0.4}
+import bpy  # type: ignore
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+import terrain_generator_v2
+import road_generator
+
+RESULT_PREFIX = "[WORKER_RESULT] "
+
+
+# 작업 사이에 씬 상태 초기화 (이전 작업의 오브젝트/데이터블록 제거)
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def _load_params(request):
+    if "params" in request:
+        return request["params"]
+    with open(request["params_file"], "r") as f:
+        return json.load(f)
+
+
+def run_job(request):
+    job_type = request.get("type")
+    params = _load_params(request)
+    output_path = os.path.abspath(request["output"])
+    preview_path = os.path.abspath(request["preview"])
+
+    if job_type == "terrain":
+        reset_scene()
+        return terrain_generator_v2.generate_terrain(params, output_path, preview_path)
+    if job_type == "road":
+        # road 는 terrain .blend 를 open_mainfile 로 열면서 씬 전체가 교체되므로 별도 초기화 불필요
+        terrain_path = os.path.abspath(request.get("terrain") or params["terrainBlendPath"])
+        return road_generator.generate_road(params, terrain_path, output_path, preview_path)
+    raise ValueError(f"Unknown job type: {job_type}")
+
+
+# 요청 한 줄 처리 → 응답 dict (shutdown 이면 None)
+def handle_line(line):
+    start = time.perf_counter()
+    request_id = None
+    try:
+        request = json.loads(line)
+        request_id = request.get("id")
+        if request.get("type") == "shutdown":
+            return None
+        result = run_job(request)
+        response = {"id": request_id, "status": "ok", "result": result}
+    except Exception as e:
+        traceback.print_exc()
+        response = {"id": request_id, "status": "error", "error": str(e)}
+    response["seconds"] = round(time.perf_counter() - start, 3)
+    return response
+
+
+def serve_stdin():
+    print(f"[Worker] Ready (stdin)")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        response = handle_line(line)
+        if response is None:
+            break
+        print(RESULT_PREFIX + json.dumps(response))
+        sys.stdout.flush()
+
+
+def serve_socket(port):
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("127.0.0.1", port))
+    server.listen(1)
+    print(f"[Worker] Ready (127.0.0.1:{port})")
+    sys.stdout.flush()
+
+    # bpy 는 단일 스레드이므로 연결도 한 번에 하나씩 순서대로 처리
+    running = True
+    while running:
+        conn, _ = server.accept()
+        with conn, conn.makefile("rw", encoding="utf-8") as stream:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                response = handle_line(line)
+                if response is None:
+                    running = False
+                    break
+                stream.write(json.dumps(response) + "\n")
+                stream.flush()
+    server.close()
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    if "--port" in args:
+        serve_socket(int(args[args.index("--port") + 1]))
+    else:
+        serve_stdin()
+    print(f"[Worker] Shutdown")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# 단계 체크포인트 (bpy 의존성 없음)
+#
+# 생성기의 비싼 단계가 끝날 때마다 결과를 작업 id 별 디렉터리에 남겨서,
+# 렌더 / 저장이 실패해 큐가 작업을 재시도하면 지오메트리를 다시 만들지 않고 첫 번째로 빠진 단계부터 재개한다.
+#
+#   <checkpoint_dir>/<job_id>/manifest.json   단계별 파일 크기 + 재개에 필요한 데이터 (JSON)
+#                            /heightfield.npy  침식까지 끝난 정규화 높이 (terrain)
+#                            /geometry.blend   지오메트리 + Material + 카메라 / 조명을 만든 직후의 중간 .blend
+#   preview 단계는 최종 preview PNG (출력 경로 그대로) 를 기록만 한다.
+#
+# 단계는 manifest 의 key (파라미터 + 입력 파일 file_stamps 해시) 가 같고, 기록한 파일이 모두 같은 크기로 남아 있을 때만 유효하다.
+# 작업이 성공하면 디렉터리를 지운다.
+#
+#   checkpoints = Checkpoints(*checkpoint_config(params, output_path), key)
+#   done = checkpoints.completed(("heightfield", "geometry", "preview"))
+#   ...
+#   checkpoints.save("geometry", files=[checkpoints.path("geometry", ".blend")], data={...})
+#   checkpoints.clear()
+import json
+import os
+import shutil
+
+import numpy as np
+
+from result_cache import read_flag
+
+CHECKPOINT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+# (enabled, 작업 디렉터리)
+# 디렉터리: params["checkpoint_dir"] → BLENDER_CHECKPOINT_DIR 환경 변수 → <출력 폴더>/checkpoints
+# 작업 id: params["job_id"] → 출력 파일 이름 (워커는 <dbJobId>.blend 로 저장)
+def checkpoint_config(params, output_path):
+    root = params.get("checkpoint_dir") or os.environ.get("BLENDER_CHECKPOINT_DIR")
+    if not root:
+        root = os.path.join(os.path.dirname(os.path.abspath(output_path)), "checkpoints")
+    job_id = str(params.get("job_id") or os.path.splitext(os.path.basename(output_path))[0])
+    enabled = read_flag(params, "checkpoints", True)
+    return enabled, os.path.join(root, job_id)
+
+
+# 입력 파일별 [크기, 수정 시각 (ns)] (없으면 None). 체크포인트 key 에 넣어 재시도 사이에 입력 파일이 바뀌면 재개하지 않는다.
+def file_stamps(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stamps[path] = None
+            continue
+        stamps[path] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+class Checkpoints:
+    def __init__(self, enabled, directory, key):
+        self.enabled = enabled
+        self.directory = directory
+        self.key = key
+        self.manifest = {"version": CHECKPOINT_VERSION, "key": key, "stages": {}}
+        if not enabled:
+            return
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        try:
+            with open(manifest_path, "r") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        if previous and previous.get("version") == CHECKPOINT_VERSION and previous.get("key") == key:
+            self.manifest = previous
+        elif os.path.isdir(directory):
+            # 다른 파라미터 / 버전의 체크포인트 → 재사용하지 않음
+            shutil.rmtree(directory, ignore_errors=True)
+
+    # 단계 파일 경로 (생성기가 직접 쓰는 파일용, 디렉터리를 만들어 둠)
+    def path(self, stage, ext):
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, stage + ext)
+
+    def valid(self, stage):
+        entry = self.manifest["stages"].get(stage)
+        if not self.enabled or entry is None:
+            return False
+        return all(os.path.exists(path) and os.path.getsize(path) == size for path, size in entry["files"].items())
+
+    # stages 순서대로 앞에서부터 유효한 단계 목록 (첫 번째로 빠진 단계에서 멈춤)
+    def completed(self, stages):
+        done = []
+        for stage in stages:
+            if not self.valid(stage):
+                break
+            done.append(stage)
+        return done
+
+    def data(self, stage):
+        return self.manifest["stages"][stage]["data"]
+
+    # 단계 완료 기록. files: 이미 쓴 파일 (재개 시 크기로 검증), data: 재개에 필요한 JSON 데이터
+    def save(self, stage, files=(), data=None):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest["stages"][stage] = {
+            "files": {os.path.abspath(path): os.path.getsize(path) for path in files},
+            "data": data or {},
+        }
+        # 쓰다가 중단돼도 이전 manifest 가 남도록 임시 파일 → rename
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = manifest_path + f".tmp{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, default=float)
+        os.replace(tmp_path, manifest_path)
+
+    def save_array(self, stage, array, data=None):
+        if not self.enabled:
+            return
+        path = self.path(stage, ".npy")
+        np.save(path, array)
+        self.save(stage, [path], data)
+
+    def load_array(self, stage):
+        return np.load(self.path(stage, ".npy"))
+
+    def clear(self):
+        if self.enabled and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory, ignore_errors=True)
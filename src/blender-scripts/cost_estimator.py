@@ -0,0 +1,403 @@
+# 작업 사전 비용 추정 + 예산 적용 (bpy 의존성 없음)
+#
+# Blender 를 띄우기 전에 생성기와 같은 파라미터 파싱 (heightfield.read_terrain_params / road_params.read_road_params)
+# 으로 정점 / 면 수, 최대 메모리, 출력 크기, 대략적인 실행 시간을 예측한다.
+# 예산을 넘으면 파라미터를 단계적으로 낮추거나 (policy "downgrade") 작업을 거부한다 (policy "reject").
+#   지형: resolution (타일 모드는 tile_resolution) 절반 → render_resolution 절반
+#   도로: maxError (적응형 샘플링 허용 오차, 곡선 resolution_u 역할) 두 배 → render_resolution 절반
+# 실행 시간이 넘으면 렌더 해상도부터, 정점 / 메모리 / 출력 크기가 넘으면 지오메트리부터 낮춘다.
+#
+# NumPy 단계 상수는 benchmarks/ 측정값, Blender 단계 (메시 / EEVEE / 저장) 상수는 대략적인 값이다.
+# 생성기의 [PROFILE] 요약 (단계별 시간, peak_rss_mb) 과 비교해 보정할 것.
+#
+#   python cost_estimator.py terrain params.json [--budgets '{"max_seconds": 600}'] [--write params.json]
+# stdout 마지막 줄: [ESTIMATE] {"action": "accept" | "downgrade" | "reject", "params": {...}, "estimate": {...}, ...}
+import argparse
+import copy
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+import numpy as np
+
+from heightfield import read_terrain_params, mask_coverage
+from heightfield_io import sidecar_paths, load_heightfield, header_extent
+from render_settings import LOW_PREVIEW_RESOLUTION, MIN_RENDER_RESOLUTION, render_resolution
+from parallel_heights import worker_count
+from erosion import erosion_budget, erosion_iterations
+from terrain_lod import lod_grids
+from mesh_export import read_export_formats
+from blend_output import output_options
+from result_cache import read_flag
+from road_params import DEFAULT_MAX_ERROR, WEB_EXTENT, read_road_params, read_road_edits, convert_control_points
+from road_mesh import PROFILE_POINTS, PROFILE_SEGMENTS, curve_resolution, row_count, adaptive_rows, load_road_state
+from road_corridor import corridor_options
+from road_drape import heightfield_sampler
+
+ESTIMATE_PREFIX = "[ESTIMATE] "  # 워커가 stdout 에서 결과를 찾는 접두사
+MB = 1024 * 1024
+
+# 기본 예산 (config.ts 의 jobBudgets 로 덮어씀)
+DEFAULT_BUDGETS = {
+    "max_vertices": 20_000_000,
+    "max_memory_mb": 8192,
+    "max_output_mb": 1024,
+    "max_seconds": 900,
+    "policy": "downgrade",
+}
+
+# NumPy 단계 (benchmarks 측정, 1 코어)
+HEIGHTFIELD_NS_PER_CELL = 390  # 레이어와 무관한 비용 (좌표 / 형상 단계)
+NOISE_NS_PER_CELL_OCTAVE = 37  # 노이즈 레이어 x 옥타브 1 개당
+EROSION_NS_PER_CELL = 85  # 침식 반복 1 회 (hydraulic + thermal), bench_erosion 2049^2 기준
+PREVIEW_NS_PER_PIXEL = 650  # numpy 미리보기
+ROUTING_SECONDS_PER_KM = 0.5  # road_routing, bench_road_routing 1025^2 기준
+ROUTE_DETOUR = 1.3  # 자동 경로 길이 / 직선 거리
+ROUTE_ROW_SPACING = 2.0  # 자동 경로 도로의 평균 행 간격 (m)
+CORRIDOR_SECONDS_PER_KM = 0.05  # road_corridor, bench_corridor 기준
+
+# Blender 단계 (대략)
+BLENDER_BASE_MB = 300  # 빈 Blender 프로세스
+BLENDER_BYTES_PER_VERTEX = 160  # 그리드 메시 (정점 + 변 2 + 면 1 + loop 4 + UV / 법선)
+BLENDER_NS_PER_VERTEX = 400  # foreach_set + update + Material 할당
+BLEND_BYTES_PER_VERTEX = 110  # .blend 디스크 크기
+BLEND_BASE_BYTES = 1 * MB
+COMPRESSED_RATIO = 0.6  # compress_blend (zstd) 크기 비율
+SAVE_BYTES_PER_SECOND = 300 * MB
+COMPRESSED_SAVE_BYTES_PER_SECOND = 60 * MB
+LOAD_BYTES_PER_SECOND = 400 * MB
+EEVEE_BASE_SECONDS = 8.0  # 엔진 / 셰이더 초기화
+EEVEE_NS_PER_PIXEL = 2000
+EEVEE_NS_PER_FACE = 150
+EEVEE_BYTES_PER_PIXEL = 64  # 렌더 버퍼 (패스 / 필터)
+
+# 다운그레이드 하한
+MIN_TERRAIN_RESOLUTION = 128
+MIN_TILE_RESOLUTION = 64
+MAX_ROAD_ERROR = 0.8  # m
+
+
+# 예산: DEFAULT_BUDGETS ← budgets (dict / JSON 문자열 / JSON 파일 경로)
+def read_budgets(budgets=None):
+    if isinstance(budgets, str):
+        if os.path.exists(budgets):
+            with open(budgets, "r") as f:
+                budgets = json.load(f)
+        else:
+            budgets = json.loads(budgets)
+    merged = {**DEFAULT_BUDGETS, **(budgets or {})}
+    if merged["policy"] not in ("downgrade", "reject"):
+        raise ValueError(f"Unknown budget policy: {merged['policy']} (supported: downgrade, reject)")
+    return merged
+
+
+def _render_cost(preview_mode, pixels, faces):
+    if preview_mode == "numpy":
+        return pixels * PREVIEW_NS_PER_PIXEL * 1e-9, 0
+    return EEVEE_BASE_SECONDS + (pixels * EEVEE_NS_PER_PIXEL + faces * EEVEE_NS_PER_FACE) * 1e-9, pixels * EEVEE_BYTES_PER_PIXEL
+
+
+def _save_cost(blend_bytes, compress):
+    if compress:
+        return blend_bytes * COMPRESSED_RATIO, blend_bytes / COMPRESSED_SAVE_BYTES_PER_SECOND
+    return blend_bytes, blend_bytes / SAVE_BYTES_PER_SECOND
+
+
+# 웹용 메시 크기: glb = int16 위치 (8B) + int8 법선 (4B) + 삼각형 인덱스, bin = float16 위치 (6B) + uint32 인덱스
+def _export_bytes(formats, vertices, faces):
+    sizes = {}
+    for fmt in formats:
+        if fmt == "glb":
+            sizes[f"export_{fmt}"] = vertices * 12 + faces * 6 * (2 if vertices <= 65535 else 4)
+        else:
+            sizes[f"export_{fmt}"] = vertices * 6 + faces * 6 * 4
+    return sizes
+
+
+def _summary(vertices, faces, memory_bytes, outputs, phases):
+    return {
+        "vertices": int(vertices),
+        "faces": int(faces),
+        "memory_mb": round(memory_bytes / MB, 1),
+        "output_mb": round(sum(outputs.values()) / MB, 1),
+        "seconds": round(sum(phases.values()), 2),
+        "phases": {name: round(seconds, 3) for name, seconds in phases.items()},
+        "outputs_mb": {name: round(size / MB, 2) for name, size in outputs.items()},
+    }
+
+
+# 지형 작업 (terrain_generator_v2) 추정
+def estimate_terrain(params):
+    settings = read_terrain_params(params)
+    tiles = settings["tiles"]
+    if tiles > 1:
+        segments = settings["tile_resolution"]
+        grid = tiles * segments + 1
+        vertices = tiles * tiles * (segments + 1) ** 2  # 타일 경계 정점은 타일마다 중복
+        faces = tiles * tiles * segments * segments
+        work_cells = (segments + 1) ** 2  # 한 번에 메모리에 두는 타일 배열
+    else:
+        segments = settings["resolution"]
+        grid = segments + 1
+        vertices = grid * grid
+        faces = segments * segments
+        work_cells = vertices
+    cells = grid * grid
+
+    octaves = settings["noise_layers"] * settings["octaves"]
+    # 지형 믹서 영역은 마스크 bounding box 안에서만 계산
+    octaves += sum(r["noise_layers"] * r["octaves"] * mask_coverage(r["mask"]) for r in settings["regions"])
+    phases = {
+        "low_preview": (LOW_PREVIEW_RESOLUTION + 1) ** 2 * (HEIGHTFIELD_NS_PER_CELL + NOISE_NS_PER_CELL_OCTAVE * octaves) * 1e-9,
+        "heightfield": cells * (HEIGHTFIELD_NS_PER_CELL + NOISE_NS_PER_CELL_OCTAVE * octaves) * 1e-9 / worker_count(params),
+    }
+    numpy_bytes = work_cells * 4 * 6  # 높이 + 노이즈 / 형상 임시 배열 (float32)
+    if tiles == 1 and erosion_iterations(settings["erosion"]) > 0:
+        planned = erosion_iterations(settings["erosion"]) * cells * EROSION_NS_PER_CELL * 1e-9
+        phases["erosion"] = min(planned, erosion_budget(params))
+        numpy_bytes = max(numpy_bytes, cells * 4 * 10)  # 원본 / 물 / 퇴적물 / 낙차 4 / 임시
+
+    phases["mesh"] = vertices * BLENDER_NS_PER_VERTEX * 1e-9
+    blend_bytes, phases["save"] = _save_cost(BLEND_BASE_BYTES + vertices * BLEND_BYTES_PER_VERTEX,
+                                             output_options(params)["compress"])
+    outputs = {"blend": blend_bytes, "heights": cells * 4}
+
+    lods = lod_grids((grid, grid), settings["lod_levels"])
+    if lods:
+        lod_vertices = sum(len(rows) * len(cols) for _level, _stride, rows, cols in lods)
+        phases["lod_chain"] = lod_vertices * BLENDER_NS_PER_VERTEX * 1e-9
+        outputs["lods"] = lod_vertices * BLEND_BYTES_PER_VERTEX * COMPRESSED_RATIO
+
+    pixels = settings["render_resolution"] ** 2
+    phases["render"], render_bytes = _render_cost(settings["preview_mode"], pixels, faces)
+    outputs["preview"] = pixels * 3
+    exports = _export_bytes(read_export_formats(params), cells, (grid - 1) ** 2)
+    outputs.update(exports)
+    if exports:
+        phases["export"] = sum(exports.values()) / SAVE_BYTES_PER_SECOND
+
+    memory = BLENDER_BASE_MB * MB + vertices * BLENDER_BYTES_PER_VERTEX + numpy_bytes + render_bytes
+    return _summary(vertices, faces, memory, outputs, phases)
+
+
+# 도로 하나의 (행 수, 길이 m, 자동 경로 탐색 여부). sampler 는 지형 하이트필드 (없으면 None)
+def _road_rows(road, sampler=None):
+    extent = sampler.extent if sampler is not None else WEB_EXTENT
+    if road["route"]:
+        _waypoints, straight = convert_control_points(road["route"]["points"], extent)
+        length = straight * ROUTE_DETOUR
+        return int(length / ROUTE_ROW_SPACING) + 1, length, True
+    converted, length = convert_control_points(road["controlPoints"], extent)
+    if len(converted) < 2:
+        return 0, 0.0, False
+    points = np.asarray(converted, dtype=np.float64)
+    if road["maxError"] <= 0:
+        return row_count(len(points), curve_resolution(length)), length, False
+    # sidecar 가 없으면 지형 높이 변화를 알 수 없으므로 평면 곡률만 (실제 행 수의 하한)
+    grid = sampler.grid if sampler is not None else None
+    counts, _placement, _error = adaptive_rows(points, road["width"], road["maxError"], sampler, terrain_grid=grid)
+    return int(counts.sum()) + 1, length, False
+
+
+# 도로 작업 (road_generator) 추정. 지형 크기는 terrain .blend / 하이트필드 sidecar 에서 읽는다.
+def estimate_road(params):
+    terrain_path = params.get("terrainBlendPath")
+    previous = None
+    if params.get("baseRoad"):
+        state = load_road_state(params["baseRoad"])
+        if state is not None:
+            terrain_path = state["terrain"]
+            previous = state
+    roads = read_road_edits(params, previous["roads"]) if previous else read_road_params(params)
+
+    terrain_bytes = 0
+    terrain_cells = 0
+    sampler = None
+    if terrain_path and os.path.exists(terrain_path):
+        terrain_bytes = os.path.getsize(terrain_path)
+        npy_path, _header_path = sidecar_paths(terrain_path)
+        if os.path.exists(npy_path):
+            heights, header = load_heightfield(terrain_path)
+            terrain_cells = int(heights.size)
+            if header:
+                sampler = heightfield_sampler(heights, header_extent(header))
+    terrain_vertices = terrain_cells or terrain_bytes // BLEND_BYTES_PER_VERTEX
+
+    rows = 0
+    length = 0.0
+    routed = 0.0
+    for road in roads:
+        road_rows, road_length, is_routed = _road_rows(road, sampler)
+        rows += road_rows
+        length += road_length
+        routed += road_length if is_routed else 0.0
+    vertices = rows * PROFILE_POINTS
+    faces = max(rows - len(roads), 0) * PROFILE_SEGMENTS
+
+    load_bytes = os.path.getsize(params["baseRoad"]) if previous and os.path.exists(params["baseRoad"]) else terrain_bytes
+    phases = {
+        "load_terrain": load_bytes / LOAD_BYTES_PER_SECOND,
+        "road_mesh": vertices * BLENDER_NS_PER_VERTEX * 1e-9 * 2,  # 메시 생성 + draping
+    }
+    if routed:
+        phases["routing"] = routed / 1000 * ROUTING_SECONDS_PER_KM
+    corridor = corridor_options(params, previous.get("corridor") if previous else None)
+    if corridor:
+        phases["corridor"] = length / 1000 * CORRIDOR_SECONDS_PER_KM + terrain_vertices * BLENDER_NS_PER_VERTEX * 1e-9
+
+    linked = read_flag(params, "link_terrain", False)  # road_generator 와 같은 해석
+    blend_bytes = BLEND_BASE_BYTES + vertices * BLEND_BYTES_PER_VERTEX + (0 if linked else terrain_bytes)
+    blend_bytes, phases["save"] = _save_cost(blend_bytes, output_options(params)["compress"])
+    outputs = {"blend": blend_bytes}
+    if corridor:
+        outputs["heights"] = terrain_cells * 4
+
+    pixels = render_resolution(params) ** 2
+    phases["render"], render_bytes = _render_cost(
+        str(params.get("preview_mode", "eevee")).lower(), pixels, faces + terrain_vertices
+    )
+    outputs["preview"] = pixels * 3
+    exports = _export_bytes(read_export_formats(params), vertices, faces)
+    outputs.update(exports)
+    if exports:
+        phases["export"] = sum(exports.values()) / SAVE_BYTES_PER_SECOND
+
+    memory = (BLENDER_BASE_MB * MB + (vertices + terrain_vertices) * BLENDER_BYTES_PER_VERTEX
+              + terrain_cells * 4 * (3 if corridor else 1) + render_bytes)
+    return _summary(vertices, faces, memory, outputs, phases)
+
+
+ESTIMATORS = {"terrain": estimate_terrain, "road": estimate_road}
+
+
+# 예산 초과 항목 → [(이름, 추정값, 예산)]
+def over_budget(estimate, budgets):
+    checks = (
+        ("vertices", estimate["vertices"], budgets["max_vertices"]),
+        ("memory_mb", estimate["memory_mb"], budgets["max_memory_mb"]),
+        ("output_mb", estimate["output_mb"], budgets["max_output_mb"]),
+        ("seconds", estimate["seconds"], budgets["max_seconds"]),
+    )
+    return [(name, value, limit) for name, value, limit in checks if limit is not None and value > limit]
+
+
+def _halve_render(params):
+    current = render_resolution(params)
+    if current <= MIN_RENDER_RESOLUTION:
+        return None
+    value = max(MIN_RENDER_RESOLUTION, current // 2)
+    return {**params, "render_resolution": value}, f"render_resolution {current} -> {value}"
+
+
+def _reduce_geometry(kind, params):
+    if kind == "terrain":
+        settings = read_terrain_params(params)
+        key, floor = ("tile_resolution", MIN_TILE_RESOLUTION) if settings["tiles"] > 1 else ("resolution", MIN_TERRAIN_RESOLUTION)
+        current = settings[key]
+        if current <= floor:
+            return None
+        value = max(floor, current // 2)
+        return {**params, key: value}, f"{key} {current} -> {value}"
+
+    # 도로: 모든 도로의 maxError 를 두 배로 (고정 해상도 도로는 적응형 샘플링으로 전환)
+    roads = read_road_params(params)
+    current = max(road["maxError"] for road in roads)
+    if current >= MAX_ROAD_ERROR:
+        return None
+    value = min(MAX_ROAD_ERROR, current * 2 if current > 0 else DEFAULT_MAX_ERROR)
+    params = {**params, "maxError": value}
+    if params.get("roads"):
+        params["roads"] = [{**road, "maxError": value} for road in params["roads"]]
+    return params, f"maxError {current} -> {value}"
+
+
+# 다음 다운그레이드 한 단계 → (새 params, 설명) / 더 낮출 수 없으면 None
+# 증분 편집 (baseRoad) 은 이전 행 레이아웃을 유지하므로 렌더 해상도만 낮춘다.
+def next_downgrade(kind, params, over):
+    names = {name for name, _value, _limit in over}
+    geometry = None if params.get("baseRoad") else (lambda: _reduce_geometry(kind, params))
+    steps = [lambda: _halve_render(params)]
+    if geometry:
+        if names == {"seconds"}:
+            steps.append(geometry)
+        else:
+            steps.insert(0, geometry)
+    for step in steps:
+        result = step()
+        if result is not None:
+            return result
+    return None
+
+
+# 추정 + 예산 적용 → 결과 dict (params 는 다운그레이드가 반영된 사본)
+# policy "reject" 면 다운그레이드 없이 예산 초과 작업을 거부한다.
+def enforce_budgets(kind, params, budgets=None):
+    budgets = read_budgets(budgets)
+    original = params
+    params = copy.deepcopy(params)
+    estimate = ESTIMATORS[kind](params)
+    over = over_budget(estimate, budgets)
+    downgrades = []
+    while over and budgets["policy"] == "downgrade":
+        step = next_downgrade(kind, params, over)
+        if step is None:
+            break
+        params, note = step
+        downgrades.append(note)
+        estimate = ESTIMATORS[kind](params)
+        over = over_budget(estimate, budgets)
+
+    if over:
+        action = "reject"
+    elif downgrades:
+        action = "downgrade"
+    else:
+        action = "accept"
+    return {
+        "action": action,
+        "type": kind,
+        "estimate": estimate,
+        "downgrades": downgrades,
+        "over_budget": [{"name": name, "estimate": value, "budget": limit} for name, value, limit in over],
+        "budgets": budgets,
+        "params": original if over else params,  # 거부된 작업은 원래 파라미터 그대로 (downgrades 는 시도한 단계)
+    }
+
+
+def format_report(report):
+    estimate = report["estimate"]
+    text = (f"{report['action']}: {estimate['vertices']} vertices, {estimate['memory_mb']:.0f}MB peak, "
+            f"{estimate['output_mb']:.1f}MB output, ~{estimate['seconds']:.1f}s")
+    if report["downgrades"]:
+        label = "tried" if report["over_budget"] else "downgraded"
+        text += f" ({label}: {', '.join(report['downgrades'])})"
+    if report["over_budget"]:
+        text += " (over budget: " + ", ".join(
+            f"{o['name']} {o['estimate']} > {o['budget']}" for o in report["over_budget"]) + ")"
+    return text
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("type", choices=sorted(ESTIMATORS))
+    parser.add_argument("params", help="작업 파라미터 JSON 파일")
+    parser.add_argument("--budgets", default=None, help="예산 JSON 문자열 또는 파일")
+    parser.add_argument("--write", default=None, help="다운그레이드된 파라미터를 쓸 파일")
+    args = parser.parse_args(argv)
+
+    with open(args.params, "r") as f:
+        params = json.load(f)
+    report = enforce_budgets(args.type, params, args.budgets)
+    if args.write and report["action"] == "downgrade":
+        with open(args.write, "w") as f:
+            json.dump(report["params"], f)
+    print(f"[Estimate] {args.type} {format_report(report)}")
+    print(ESTIMATE_PREFIX + json.dumps(report), flush=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
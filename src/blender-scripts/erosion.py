@@ -0,0 +1,139 @@
+# 하이트필드 침식 (bpy 의존성 없음)
+#
+# 정규화 높이 [ny, nx] 전체에 배열 연산으로 반복 적용한다 (물방울 단위 Python 루프 없음).
+#   - thermal:   이웃과의 경사가 talus 각을 넘는 만큼 아래로 흘려 보냄 (절벽 / 뾰족한 봉우리 완화)
+#   - hydraulic: 그리드 물 / 퇴적물 배열 (Musgrave 1989 방식). 매 반복마다
+#                강우 → 수면 낙차에 비례해 물을 4 이웃으로 이동 → 이동한 물의 양만큼 운반 능력
+#                → 능력보다 적게 싣고 있으면 침식, 많으면 퇴적 → 퇴적물도 물과 같은 비율로 이동 → 증발
+# 한 반복 = hydraulic 1 단계 + thermal 1 단계. 반복 수 = erosion (0~1) * EROSION_ITERATIONS
+# 시간 예산(초)을 넘기면 남은 반복을 건너뛴다 (큐 작업이 무한정 길어지지 않도록).
+#
+#   stats = erode(heights, settings['erosion'], cell_size, height_range, time_budget=budget)
+import os
+import time
+
+import numpy as np
+
+EROSION_ITERATIONS = 100  # erosion = 1 일 때 반복 수
+DEFAULT_TIME_BUDGET = 30.0  # 초
+TALUS_ANGLE = 35.0  # 도. 이보다 가파른 경사는 thermal 단계에서 무너짐
+THERMAL_RATE = 0.5  # talus 초과분 중 한 번에 옮기는 비율
+
+# hydraulic 상수 (정규화 높이 단위, 반복 1회 기준)
+RAIN = 0.01  # 강우량
+CAPACITY = 0.5  # 이동한 물 1 당 운반 가능한 퇴적물
+SOLUBILITY = 0.05  # 운반 능력 여유분 중 침식하는 비율
+DEPOSITION = 0.1  # 운반 능력 초과분 중 퇴적하는 비율
+EVAPORATION = 0.1  # 물 증발 비율
+
+_EPS = 1e-9
+
+
+# 시간 예산: params["erosion_time_budget"] → TERRAIN_EROSION_BUDGET 환경 변수 → DEFAULT_TIME_BUDGET
+# 결과를 바꾸지 않는 한 캐시 키에 넣지 않는다 (예산을 다 쓴 결과는 캐시에 저장하지 않음)
+def erosion_budget(params):
+    value = params.get("erosion_time_budget", os.environ.get("TERRAIN_EROSION_BUDGET", DEFAULT_TIME_BUDGET))
+    return max(0.0, float(value))
+
+
+def erosion_iterations(strength):
+    return int(round(min(max(strength, 0.0), 1.0) * EROSION_ITERATIONS))
+
+
+# 4 방향 (+x, -x, +y, -y) 낙차 [4, ny, nx] (양수만, 경계 밖은 0)
+def neighbour_drops(surface, out=None):
+    if out is None:
+        out = np.empty((4,) + surface.shape, dtype=surface.dtype)
+    dx = surface[:, :-1] - surface[:, 1:]
+    np.maximum(dx, 0.0, out=out[0][:, :-1])
+    np.negative(dx, out=dx)
+    np.maximum(dx, 0.0, out=out[1][:, 1:])
+    dy = surface[:-1] - surface[1:]
+    np.maximum(dy, 0.0, out=out[2][:-1])
+    np.negative(dy, out=dy)
+    np.maximum(dy, 0.0, out=out[3][1:])
+    # 경계 밖 방향 (나머지 칸은 위에서 모두 덮어씀)
+    out[0][:, -1] = 0.0
+    out[1][:, 0] = 0.0
+    out[2][-1] = 0.0
+    out[3][0] = 0.0
+    return out
+
+
+# outflow [4, ny, nx] (셀에서 각 방향으로 나가는 양) 만큼 field 를 이웃으로 옮김 (총량 보존)
+def move(field, outflow):
+    field -= outflow.sum(axis=0)
+    field[:, 1:] += outflow[0][:, :-1]
+    field[:, :-1] += outflow[1][:, 1:]
+    field[1:] += outflow[2][:-1]
+    field[:-1] += outflow[3][1:]
+
+
+# thermal 1 단계: talus (정규화 높이 단위 낙차 한계) 를 넘는 낙차에 비례해 분배
+def thermal_step(heights, talus, drops):
+    neighbour_drops(heights, out=drops)
+    drops -= talus
+    np.maximum(drops, 0.0, out=drops)
+    total = drops.sum(axis=0)
+    # 가장 큰 초과분의 절반까지만 옮겨서 두 셀이 서로 넘겨주며 진동하지 않도록 함
+    amount = THERMAL_RATE * 0.5 * drops.max(axis=0)
+    drops *= amount / (total + _EPS)
+    move(heights, drops)
+
+
+# hydraulic 1 단계 (water / sediment 는 반복 사이에 유지되는 배열)
+def hydraulic_step(heights, water, sediment, drops):
+    water += RAIN
+    neighbour_drops(heights + water, out=drops)
+    total = drops.sum(axis=0)
+    # 이동량: 가진 물과 수면 낙차의 절반 중 작은 값 (낙차가 뒤집히지 않도록)
+    moved = np.minimum(water, 0.5 * total)
+
+    # 운반 능력 대비 침식 / 퇴적
+    gap = CAPACITY * moved - sediment
+    change = np.where(gap > 0, SOLUBILITY * gap, DEPOSITION * gap)
+    heights -= change
+    sediment += change
+
+    # 물 / 퇴적물을 같은 방향 비율로 이동
+    share = drops * (moved / (total + _EPS))
+    carried = sediment / (water + _EPS)
+    move(water, share)
+    share *= carried
+    move(sediment, share)
+    water *= 1.0 - EVAPORATION
+
+
+# 정규화 높이 heights [ny, nx] 를 제자리에서 침식 → 통계 dict
+# cell_size / height_range: 셀 간격 / 정규화 높이 1 의 월드 길이 (m). talus 각을 그리드 낙차로 바꾸는 데 사용
+def erode(heights, strength, cell_size, height_range, time_budget=DEFAULT_TIME_BUDGET, iterations=None):
+    planned = erosion_iterations(strength) if iterations is None else int(iterations)
+    start = time.perf_counter()
+    talus = np.tan(np.radians(TALUS_ANGLE)) * cell_size / height_range
+    original = heights.copy()
+    water = np.zeros_like(heights)
+    sediment = np.zeros_like(heights)
+    drops = np.empty((4,) + heights.shape, dtype=heights.dtype)
+
+    done = 0
+    while done < planned:
+        if time.perf_counter() - start > time_budget:
+            break
+        hydraulic_step(heights, water, sediment, drops)
+        thermal_step(heights, talus, drops)
+        done += 1
+    heights += sediment  # 운반 중이던 퇴적물은 제자리에 내려놓음
+
+    seconds = time.perf_counter() - start
+    change = np.abs(heights - original)
+    return {
+        "strength": strength,
+        "iterations": done,
+        "planned_iterations": planned,
+        "budget_exhausted": done < planned,
+        "time_budget": time_budget,
+        "seconds": round(seconds, 4),
+        "iterations_per_second": round(done / seconds, 2) if seconds > 0 else None,
+        "max_change_m": float(change.max()) * height_range,
+        "mean_change_m": float(change.mean()) * height_range,
+    }
@@ -0,0 +1,587 @@
+# 순수 NumPy 하이트필드 엔진 (bpy 의존성 없음)
+# terrain_generator_v2.py 의 노이즈 레이어 / peak_sharpness / valley_depth / terrace_levels
+# 단계를 정규 그리드 위에서 배열 연산으로 계산한다.
+# Blender 밖(벤치마크, 워커 프로세스)에서도 import 가능해야 하므로 bpy 를 import 하지 않는다.
+import os
+
+import numpy as np
+
+from heightfield_io import bilinear_sample
+from png_io import read_png
+from render_settings import render_resolution
+
+BASE_SIZE = 100.0  # 지형은 항상 100m 기준 공간에서 계산 (terrain_scale 로 최종 확대)
+Z_SCALE = 3.0  # Z축 스케일 (높이 3배)
+DEFAULT_RESOLUTION = 1024  # 한 변의 세그먼트 수 (정점 = (resolution + 1)^2)
+DEFAULT_TILE_RESOLUTION = 256  # 타일 모드: 타일 한 변의 세그먼트 수
+BAND_ROWS = 256  # 임시 배열 메모리를 제한하기 위한 행 단위 계산 크기
+NOISE_CONTRAST = 3.0  # 합성 노이즈 분포(0.5 ± 약 0.06)를 [0, 1] 전체로 펼치는 배율
+MASK_EPSILON = 1e-3  # 지형 믹서: 이 값 이하 가중치의 셀은 해당 영역 노이즈를 계산하지 않음
+DEFAULT_MASK_FALLOFF = 10.0  # 마스크 경계 전이 폭 (웹 좌표 0~100 단위)
+
+# 지형 믹서 영역이 덮어쓸 수 있는 파라미터 (노이즈 / 형상 / 높이)
+REGION_KEYS = (
+    "base_scale",
+    "base_roughness",
+    "height_multiplier",
+    "noise_type",
+    "noise_layers",
+    "octaves",
+    "seed",
+    "peak_sharpness",
+    "valley_depth",
+    "terrace_levels",
+)
+MASK_TYPES = ("half_plane", "radial", "image")
+
+
+# ===== 파라미터 파싱 =====
+# 생성기가 실제로 사용하는 파라미터만 기본값과 함께 정리한다.
+def read_terrain_params(params):
+    settings = {
+        # 기본 형상
+        "base_scale": float(params.get("base_scale", 20)),
+        "base_roughness": float(params.get("base_roughness", 0.7)),
+        "height_multiplier": float(params.get("height_multiplier", 30)),
+        # 노이즈 설정
+        "noise_type": str(params.get("noise_type", "MUSGRAVE")).upper(),
+        "noise_layers": int(params.get("noise_layers", 3)),
+        "octaves": int(params.get("octaves", 6)),
+        "seed": int(params.get("seed", 0)),
+        # 지형 특성
+        "peak_sharpness": float(params.get("peak_sharpness", 0.5)),
+        "valley_depth": float(params.get("valley_depth", 0.5)),
+        "erosion": float(params.get("erosion", 0.3)),
+        "terrace_levels": int(params.get("terrace_levels", 0)),
+        # 머티리얼
+        "snow_height": float(params.get("snow_height", 0.7)),
+        "rock_height": float(params.get("rock_height", 0.3)),
+        "grass_height": float(params.get("grass_height", 0.0)),
+        "snow_color": [float(c) for c in params.get("snow_color", [0.95, 0.95, 1.0])],
+        "rock_color": [float(c) for c in params.get("rock_color", [0.3, 0.3, 0.35])],
+        "grass_color": [float(c) for c in params.get("grass_color", [0.2, 0.4, 0.1])],
+        # 환경
+        "climate": params.get("climate", "temperate"),
+        "wetness": float(params.get("wetness", 0.3)),
+        # 크기 / 해상도
+        "terrain_scale": float(params.get("terrain_scale", 10)),
+        "resolution": int(params.get("resolution", DEFAULT_RESOLUTION)),
+        # 타일 모드 (tiles > 1): 한 변 tiles 개 타일, 타일마다 tile_resolution 세그먼트
+        # tile_output: "objects" (한 .blend 안의 타일 오브젝트) | "library" (타일별 .blend 를 링크)
+        "tiles": max(1, int(params.get("tiles", 1))),
+        "tile_resolution": int(params.get("tile_resolution", DEFAULT_TILE_RESOLUTION)),
+        "tile_output": str(params.get("tile_output", "objects")).lower(),
+        # LOD 체인: stride 2, 4, ... 로 줄인 LOD 를 lod_levels 개 추가 생성 (0 = 생성 안 함)
+        "lod_levels": max(0, int(params.get("lod_levels", 0))),
+        # 미리보기: "eevee" (렌더 엔진) | "numpy" (하이트필드에서 바로 PNG)
+        "preview_mode": str(params.get("preview_mode", "eevee")).lower(),
+        "render_resolution": render_resolution(params),
+    }
+
+    if settings["noise_type"] not in NOISE_TYPES:
+        raise ValueError(f"Unknown noise_type {settings['noise_type']!r}, expected one of {sorted(NOISE_TYPES)}")
+
+    # 지형 믹서: 영역마다 다른 높이를 쓰면 가장 높은 값을 전체 높이로 두고 각 층을 비율로 줄인다
+    # (정규화 높이 범위가 기본 지형과 같아 Material ColorRamp / 미리보기가 그대로 동작)
+    regions = read_regions(params, settings)
+    height = max([settings["height_multiplier"]] + [r["height_multiplier"] for r in regions])
+    for region in regions:
+        region["height_scale"] = region["height_multiplier"] / height if height > 0 else 1.0
+    settings["base_height_scale"] = settings["height_multiplier"] / height if height > 0 else 1.0
+    settings["height_multiplier"] = height
+    settings["regions"] = regions
+    return settings
+
+
+# ===== 지형 믹서 (regions) =====
+# params["regions"]: [{"mask": {...}, "base_scale": .., "height_multiplier": .., ...}, ...]
+# 영역은 순서대로 위에 덮인다 (뒤 영역이 앞 영역 / 기본 지형을 마스크 비율만큼 가림).
+# 마스크 좌표는 도로 control point 와 같은 웹 좌표 (0~100, 중앙 50):
+#   {"type": "half_plane", "point": [50, 50], "direction": [1, 0], "falloff": 10}  direction 쪽 절반
+#   {"type": "radial", "center": [50, 50], "radius": 25, "falloff": 10}           원 안쪽
+#   {"type": "image", "path": "mask.png"} 또는 {"type": "image", "values": [[0..1, ...], ...]}
+#       저해상도 페인트 마스크, 전체 맵에 bilinear 로 늘려 사용. 미리보기 이미지와 같은 방향으로
+#       0 행 = 이미지 위쪽 = 웹 y 100 (지형 +Y 끝), 마지막 행 = 웹 y 0
+def read_regions(params, base):
+    regions = []
+    for i, region in enumerate(params.get("regions") or []):
+        layer = read_terrain_params({
+            **{key: base[key] for key in REGION_KEYS},
+            **{key: region[key] for key in REGION_KEYS if key in region},
+        })
+        regions.append({"mask": read_mask(region.get("mask"), i), **{key: layer[key] for key in REGION_KEYS}})
+    return regions
+
+
+def read_mask(mask, index):
+    if not isinstance(mask, dict) or mask.get("type") not in MASK_TYPES:
+        raise ValueError(f"Region {index}: mask type must be one of {list(MASK_TYPES)}")
+    kind = mask["type"]
+    falloff = float(mask.get("falloff", DEFAULT_MASK_FALLOFF))
+    if kind == "half_plane":
+        direction = np.asarray(mask.get("direction", [1.0, 0.0]), dtype=np.float64)
+        length = float(np.hypot(*direction))
+        if length == 0:
+            raise ValueError(f"Region {index}: half_plane direction must be non-zero")
+        return {
+            "type": kind,
+            "point": [float(v) for v in mask.get("point", [50.0, 50.0])],
+            "direction": (direction / length).tolist(),
+            "falloff": falloff,
+        }
+    if kind == "radial":
+        return {
+            "type": kind,
+            "center": [float(v) for v in mask.get("center", [50.0, 50.0])],
+            "radius": float(mask.get("radius", 25.0)),
+            "falloff": falloff,
+        }
+    if mask.get("values") is not None:
+        values = np.asarray(mask["values"], dtype=np.float64)
+        if values.ndim != 2 or min(values.shape) < 2:
+            raise ValueError(f"Region {index}: image mask values must be a 2D list of at least 2x2")
+        return {"type": kind, "values": np.clip(values, 0.0, 1.0).tolist()}
+    path = mask.get("path")
+    if not path or not os.path.exists(path):
+        raise ValueError(f"Region {index}: image mask needs 'values' or an existing 'path' ({path})")
+    # 파일이 바뀌면 캐시 키도 바뀌도록 수정 시각 / 크기를 함께 기록
+    stat = os.stat(path)
+    return {"type": kind, "path": os.path.abspath(path), "stamp": [stat.st_mtime, stat.st_size]}
+
+
+_mask_images = {}
+
+
+# 이미지 마스크 → float32 [h, w] (0~1), 0 행 = 웹 y 0 (bilinear_sample / mask_bounds 의 행 방향).
+# 이미지 (values / PNG) 는 위쪽 행이 먼저이므로 행을 뒤집는다. PNG 는 첫 채널 (그레이스케일 / R) 사용
+def _mask_image(mask):
+    if "values" in mask:
+        return np.asarray(mask["values"], dtype=np.float32)[::-1]
+    key = (mask["path"], tuple(mask["stamp"]))
+    if key not in _mask_images:
+        _mask_images.clear()
+        _mask_images[key] = np.ascontiguousarray(read_png(mask["path"])[::-1, :, 0], dtype=np.float32) / 255.0
+    return _mask_images[key]
+
+
+def _smoothstep(t, falloff):
+    if falloff <= 0:
+        return (t >= 0).astype(np.float32)
+    t = np.clip(t / falloff + 0.5, 0.0, 1.0)
+    return (t * t * (3.0 - 2.0 * t)).astype(np.float32)
+
+
+# 웹 좌표 u, v (0~100) 에서의 마스크 값 [0, 1]. 경계선 (반경) 이 전이 폭의 가운데
+def mask_weight(mask, u, v):
+    if mask["type"] == "half_plane":
+        px, py = mask["point"]
+        dx, dy = mask["direction"]
+        return _smoothstep((u - px) * dx + (v - py) * dy, mask["falloff"])
+    if mask["type"] == "radial":
+        cx, cy = mask["center"]
+        return _smoothstep(mask["radius"] - np.hypot(u - cx, v - cy), mask["falloff"])
+    image = _mask_image(mask)
+    return bilinear_sample(image, (0.0, 100.0, 0.0, 100.0), u, v)
+
+
+# 마스크 값이 0 보다 큰 웹 좌표 범위 (umin, umax, vmin, vmax), 맵 [0, 100] 안으로 자름. 비어 있으면 None
+def mask_bounds(mask):
+    umin, umax, vmin, vmax = 0.0, 100.0, 0.0, 100.0
+    if mask["type"] == "half_plane":
+        px, py = mask["point"]
+        dx, dy = mask["direction"]
+        edge = -0.5 * max(mask["falloff"], 0.0)  # (u - p) . d 가 이 값 이하면 가중치 0
+        # 한 축의 한계 = 다른 축의 맵 가장자리 (0, 100) 에서 경계선 위치 중 바깥쪽
+        if dx:
+            limits = [px + (edge - (v - py) * dy) / dx for v in (0.0, 100.0)]
+            umin, umax = (max(umin, min(limits)), umax) if dx > 0 else (umin, min(umax, max(limits)))
+        if dy:
+            limits = [py + (edge - (u - px) * dx) / dy for u in (0.0, 100.0)]
+            vmin, vmax = (max(vmin, min(limits)), vmax) if dy > 0 else (vmin, min(vmax, max(limits)))
+    elif mask["type"] == "radial":
+        cx, cy = mask["center"]
+        reach = mask["radius"] + 0.5 * max(mask["falloff"], 0.0)
+        umin, umax = max(umin, cx - reach), min(umax, cx + reach)
+        vmin, vmax = max(vmin, cy - reach), min(vmax, cy + reach)
+    else:
+        image = _mask_image(mask)
+        rows, cols = np.nonzero(image > 0)
+        if not len(rows):
+            return None
+        # 행 r = 웹 v r * dv (_mask_image 가 이미지 행을 뒤집어 둠). bilinear 보간이므로 0 이 아닌 픽셀에서 한 픽셀 간격까지
+        du = 100.0 / (image.shape[1] - 1)
+        dv = 100.0 / (image.shape[0] - 1)
+        umin, umax = max(umin, (cols.min() - 1) * du), min(umax, (cols.max() + 1) * du)
+        vmin, vmax = max(vmin, (rows.min() - 1) * dv), min(vmax, (rows.max() + 1) * dv)
+    if umin > umax or vmin > vmax:
+        return None
+    return umin, umax, vmin, vmax
+
+
+# 마스크 bounding box 가 덮는 맵 비율 [0, 1] (영역 층을 계산하는 셀 비율의 상한)
+def mask_coverage(mask):
+    bounds = mask_bounds(mask)
+    if bounds is None:
+        return 0.0
+    umin, umax, vmin, vmax = bounds
+    return (umax - umin) * (vmax - vmin) / 100.0**2
+
+
+def _web_coords(x, y):
+    return x * (100.0 / BASE_SIZE) + 50.0, y * (100.0 / BASE_SIZE) + 50.0
+
+
+# 그리드 축 xs, ys (오름차순) 중 마스크 범위에 드는 (행 slice, 열 slice). 겹치지 않으면 None
+def _grid_window(mask, xs, ys):
+    bounds = mask_bounds(mask)
+    if bounds is None:
+        return None
+    umin, umax, vmin, vmax = ((b - 50.0) * (BASE_SIZE / 100.0) for b in bounds)
+    cols = slice(int(np.searchsorted(xs, umin, "left")), int(np.searchsorted(xs, umax, "right")))
+    rows = slice(int(np.searchsorted(ys, vmin, "left")), int(np.searchsorted(ys, vmax, "right")))
+    if cols.start >= cols.stop or rows.start >= rows.stop:
+        return None
+    return rows, cols
+
+
+# 기준 공간 좌표 x, y 에서 층별 가중치 [기본 지형, 영역 1, ..., 영역 n] (합 = 1)
+# 위에서부터: 영역 n 은 마스크 그대로, 그 아래 층은 위 층들이 남긴 비율만큼
+def region_weights(settings, x, y):
+    u, v = _web_coords(x, y)
+    remaining = np.ones(np.shape(x), dtype=np.float32)
+    weights = []
+    for region in reversed(settings["regions"]):
+        m = mask_weight(region["mask"], u, v)
+        weights.append(m * remaining)
+        remaining *= 1.0 - m
+    weights.append(remaining)
+    return weights[::-1]
+
+
+def _layers(settings, basis):
+    layers = [(settings, basis, settings["base_height_scale"])]
+    for region in settings["regions"]:
+        layer_basis = basis if region["seed"] == settings["seed"] else NoiseBasis(region["seed"])
+        layers.append((region, layer_basis, region["height_scale"]))
+    return layers
+
+
+# out += weight x height_scale x 층 높이. 가중치가 MASK_EPSILON 이하인 셀은 계산하지 않는다.
+# 2D 창이면 먼저 가중치가 있는 셀의 bounding box 로 줄인다.
+def _add_layer(out, layer, layer_basis, height_scale, weight, x, y):
+    active = weight > MASK_EPSILON
+    if weight.ndim == 2:
+        rows = np.flatnonzero(active.any(axis=1))
+        cols = np.flatnonzero(active.any(axis=0))
+        if not len(rows):
+            return
+        window = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        out, weight, active, x, y = out[window], weight[window], active[window], x[window], y[window]
+    weight *= height_scale
+    if active.all():
+        out += weight * sample_layer(layer, x, y, layer_basis)
+    elif active.any():
+        out[active] += weight[active] * sample_layer(layer, x[active], y[active], layer_basis)
+
+
+# 지형 믹서 (임의 shape 좌표): 층마다 가중치가 있는 셀에서만 노이즈를 계산해 가중합
+def sample_regions(settings, x, y, basis):
+    out = np.zeros(np.shape(x), dtype=np.float32)
+    for (layer, layer_basis, height_scale), weight in zip(_layers(settings, basis), region_weights(settings, x, y)):
+        _add_layer(out, layer, layer_basis, height_scale, weight, x, y)
+    return out
+
+
+# 지형 믹서 (그리드 축 xs, ys): 영역마다 마스크 bounding box 창 안에서만 마스크 / 가중치 / 노이즈를 계산한다.
+# 맵 일부만 덮는 영역은 자기 창만큼만 비용이 들고, 기본 지형은 위 영역이 완전히 덮은 셀을 건너뛴다.
+def sample_regions_grid(settings, xs, ys, basis):
+    out = np.zeros((len(ys), len(xs)), dtype=np.float32)
+    remaining = np.ones_like(out)
+    layers = _layers(settings, basis)
+    # 위 영역부터: 영역 가중치 = 마스크 x 위 영역들이 남긴 비율
+    for region, (layer, layer_basis, height_scale) in zip(reversed(settings["regions"]), reversed(layers[1:])):
+        window = _grid_window(region["mask"], xs, ys)
+        if window is None:
+            continue
+        rows, cols = window
+        x, y = np.meshgrid(xs[cols], ys[rows])
+        m = mask_weight(region["mask"], *_web_coords(x, y))
+        weight = m * remaining[window]
+        remaining[window] *= 1.0 - m
+        _add_layer(out[window], layer, layer_basis, height_scale, weight, x, y)
+
+    x, y = np.meshgrid(xs, ys)
+    _add_layer(out, settings, basis, settings["base_height_scale"], remaining, x, y)
+    return out
+
+
+# ===== Perlin 노이즈 =====
+# 임의 shape 의 x, y 배열을 받아 같은 shape 의 [-1, 1] 노이즈를 반환한다.
+_GRAD_X = np.array([1, -1, 1, -1, 1, -1, 0, 0], dtype=np.float32)
+_GRAD_Y = np.array([1, 1, -1, -1, 0, 0, 1, -1], dtype=np.float32)
+
+
+def permutation_table(seed):
+    rng = np.random.default_rng(seed)
+    perm = rng.permutation(256).astype(np.int32)
+    return np.concatenate([perm, perm])
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def _gradient(h, x, y):
+    h = h & 7
+    return _GRAD_X[h] * x + _GRAD_Y[h] * y
+
+
+def perlin(x, y, perm):
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    xf = (x - x0).astype(np.float32)
+    yf = (y - y0).astype(np.float32)
+    xi = x0.astype(np.int32) & 255
+    yi = y0.astype(np.int32) & 255
+
+    u = _fade(xf)
+    v = _fade(yf)
+
+    a = perm[xi] + yi
+    b = perm[xi + 1] + yi
+    n00 = _gradient(perm[a], xf, yf)
+    n10 = _gradient(perm[b], xf - 1.0, yf)
+    n01 = _gradient(perm[a + 1], xf, yf - 1.0)
+    n11 = _gradient(perm[b + 1], xf - 1.0, yf - 1.0)
+
+    nx0 = n00 + u * (n10 - n00)
+    nx1 = n01 + u * (n11 - n01)
+    # 대각 그래디언트 기준 최대값이 약 0.7 이므로 [-1, 1] 로 확장
+    return np.clip((nx0 + v * (nx1 - nx0)) * 1.4142, -1.0, 1.0)
+
+
+# fBm: 옥타브마다 주파수 2배, 진폭 roughness 배. 결과는 [0, 1]
+def fbm(x, y, octaves, roughness, perm, offsets):
+    total = np.zeros(np.shape(x), dtype=np.float32)
+    amplitude = 1.0
+    frequency = 1.0
+    norm = 0.0
+    for octave in range(max(1, octaves)):
+        ox, oy = offsets[octave % len(offsets)]
+        total += amplitude * perlin(x * frequency + ox, y * frequency + oy, perm)
+        norm += amplitude
+        amplitude *= roughness
+        frequency *= 2.0
+    total /= norm
+    total *= 0.5
+    total += 0.5
+    return total
+
+
+# Ridged multifractal (Musgrave): 능선이 날카로운 복잡한 산맥. 결과는 [0, 1]
+def ridged_fbm(x, y, octaves, roughness, perm, offsets):
+    total = np.zeros(np.shape(x), dtype=np.float32)
+    weight = np.ones(np.shape(x), dtype=np.float32)
+    amplitude = 1.0
+    frequency = 1.0
+    norm = 0.0
+    for octave in range(max(1, octaves)):
+        ox, oy = offsets[octave % len(offsets)]
+        signal = 1.0 - np.abs(perlin(x * frequency + ox, y * frequency + oy, perm))
+        signal *= signal
+        signal *= weight
+        # 이전 옥타브가 높은 곳(능선)에만 디테일이 쌓이도록 가중
+        np.clip(signal * 2.0, 0.0, 1.0, out=weight)
+        total += amplitude * signal
+        norm += amplitude
+        amplitude *= roughness
+        frequency *= 2.0
+    total /= norm
+    return total
+
+
+# Voronoi F1 거리 (셀 경계가 날카로운 암석 지형). 결과는 [0, 1]
+def voronoi(x, y, perm):
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    xf = (x - x0).astype(np.float32)
+    yf = (y - y0).astype(np.float32)
+    xi = x0.astype(np.int32)
+    yi = y0.astype(np.int32)
+
+    nearest = np.full(np.shape(x), 4.0, dtype=np.float32)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            cx = (xi + dx) & 255
+            cy = (yi + dy) & 255
+            h = perm[perm[cx] + cy]
+            # 셀 안의 feature point (permutation 해시로 jitter)
+            px = dx + perm[h] / 255.0 - xf
+            py = dy + perm[(h + 37) & 511] / 255.0 - yf
+            np.minimum(nearest, px * px + py * py, out=nearest)
+    return np.clip(np.sqrt(nearest), 0.0, 1.0)
+
+
+def voronoi_fbm(x, y, octaves, roughness, perm, offsets):
+    total = np.zeros(np.shape(x), dtype=np.float32)
+    amplitude = 1.0
+    frequency = 1.0
+    norm = 0.0
+    for octave in range(max(1, octaves)):
+        ox, oy = offsets[octave % len(offsets)]
+        total += amplitude * voronoi(x * frequency + ox, y * frequency + oy, perm)
+        norm += amplitude
+        amplitude *= roughness
+        frequency *= 2.0
+    total /= norm
+    return total
+
+
+# noise_type → (기본 레이어 함수, 분포 중심, 분포 폭 보정)
+# 각 기본 레이어의 분포를 Perlin fBm 과 같은 중심/폭으로 맞춰 이후 단계가 동일하게 동작하도록 한다.
+NOISE_TYPES = {
+    "PERLIN": (fbm, 0.5, 1.0),
+    "MUSGRAVE": (ridged_fbm, 0.42, 2.3),
+    "VORONOI": (voronoi_fbm, 0.42, 1.0),
+}
+
+
+# ===== 하이트필드 계산 =====
+class NoiseBasis:
+    # seed 별 permutation / 옥타브 오프셋을 한 번만 만들어 재사용
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.perm = permutation_table(seed)
+        self.offsets = rng.uniform(0.0, 256.0, size=(16, 2)).astype(np.float32)
+
+
+# 기준 공간(100m) 좌표 x, y (임의 shape) 에서의 정규화 높이 [0, 1]
+# 모든 파라미터 단계를 한 번의 배열 패스로 적용한다. regions 가 있으면 지형 믹서로 층을 섞는다.
+def sample_heights(settings, x, y, basis=None):
+    if basis is None:
+        basis = NoiseBasis(settings["seed"])
+    if settings.get("regions"):
+        return sample_regions(settings, x, y, basis)
+    return sample_layer(settings, x, y, basis)
+
+
+# 파라미터 한 벌 (기본 지형 또는 영역) 의 정규화 높이
+def sample_layer(settings, x, y, basis):
+    frequency = 1.0 / max(settings["base_scale"], 1e-6)
+    base_noise, center, spread = NOISE_TYPES[settings["noise_type"]]
+
+    # 1. Base noise layer (noise_type)
+    h = base_noise(
+        x * frequency,
+        y * frequency,
+        settings["octaves"],
+        settings["base_roughness"],
+        basis.perm,
+        basis.offsets,
+    )
+    if center != 0.5 or spread != 1.0:
+        h -= center
+        h *= 1.0 / spread
+        h += 0.5
+
+    # 2. Detail layers: 주파수 2^(i+1) 배, 강도 1/2^(i+1)
+    weight_sum = 1.0
+    for i in range(settings["noise_layers"]):
+        layer_freq = frequency * (2 ** (i + 1))
+        weight = 1.0 / (2 ** (i + 1))
+        h += weight * fbm(
+            x * layer_freq,
+            y * layer_freq,
+            2,
+            0.5,
+            basis.perm,
+            np.roll(basis.offsets, i + 1, axis=0),
+        )
+        weight_sum += weight
+    h /= weight_sum
+    h -= 0.5
+    h *= NOISE_CONTRAST
+    h += 0.5
+
+    return apply_shaping(h, settings)
+
+
+# 형상 단계 적용 후 정규화 높이 범위: [0, 1] 입력이 valley_depth 확장으로 넓어진 만큼
+# (골짜기는 0 아래로 내려가고 봉우리는 1 위로 올라감, 원래 노드 그래프와 같음)
+def shaping_range(settings):
+    valley_depth = settings["valley_depth"] if settings["valley_depth"] > 0.01 else 0.0
+    return -0.5 * valley_depth, 1.0 + 0.5 * valley_depth
+
+
+# peak_sharpness (POWER) → valley_depth (0.5 기준 확장) → terrace_levels (SNAP)
+# 단계 사이에서는 자르지 않고, 마지막에 shaping_range 로 한 번만 clamp 한다.
+# (중간 clip 은 valley_depth 가 낮은 곳을 전부 0 으로 눌러 골짜기 대신 평지를 만든다)
+def apply_shaping(h, settings):
+    peak_sharpness = settings["peak_sharpness"]
+    valley_depth = settings["valley_depth"]
+    terrace_levels = settings["terrace_levels"]
+
+    if peak_sharpness > 0.01:
+        # 부호 유지 거듭제곱: 노이즈 꼬리가 0 아래로 나가도 NaN 없이 단조 증가
+        sign = np.sign(h)
+        np.abs(h, out=h)
+        np.power(h, 1.0 + peak_sharpness * 3, out=h)  # 1-4 range
+        h *= sign
+
+    if valley_depth > 0.01:
+        h -= 0.5
+        h *= 1.0 + valley_depth
+        h += 0.5
+
+    if terrace_levels > 0:
+        step = 1.0 / terrace_levels
+        np.floor(h / step, out=h)
+        h *= step
+
+    np.clip(h, *shaping_range(settings), out=h)
+    return h
+
+
+# 정규 그리드 좌표 (기준 공간, 중앙 원점)
+def grid_axes(resolution, size=BASE_SIZE):
+    axis = np.linspace(-size / 2, size / 2, resolution + 1, dtype=np.float32)
+    return axis, axis.copy()
+
+
+# 그리드 전체의 정규화 높이 [ny, nx]. 임시 배열은 BAND_ROWS 행 단위로만 만든다.
+def compute_heightfield(settings, xs, ys, basis=None, out=None):
+    if basis is None:
+        basis = NoiseBasis(settings["seed"])
+    if out is None:
+        out = np.empty((len(ys), len(xs)), dtype=np.float32)
+
+    for row in range(0, len(ys), BAND_ROWS):
+        band_y = ys[row : row + BAND_ROWS]
+        if settings.get("regions"):
+            out[row : row + len(band_y)] = sample_regions_grid(settings, xs, band_y, basis)
+            continue
+        gx, gy = np.meshgrid(xs, band_y)
+        out[row : row + len(band_y)] = sample_layer(settings, gx, gy, basis)
+    return out
+
+
+# ===== 메시 버퍼 =====
+# 정규화 높이 → 월드 좌표 정점 버퍼 (foreach_set("co") 용 float32 1D)
+def grid_vertices(heights, xs, ys, terrain_scale, height_multiplier, z_scale=Z_SCALE):
+    ny, nx = heights.shape
+    co = np.empty((ny, nx, 3), dtype=np.float32)
+    co[:, :, 0] = xs[np.newaxis, :] * terrain_scale
+    co[:, :, 1] = ys[:, np.newaxis] * terrain_scale
+    np.multiply(heights, height_multiplier * z_scale, out=co[:, :, 2])
+    return co.reshape(-1)
+
+
+# 쿼드 면의 loop vertex index 버퍼 (행 우선 정점 순서, +Z 방향 법선)
+def grid_loops(nx, ny):
+    idx = np.arange(nx * ny, dtype=np.int32).reshape(ny, nx)
+    loops = np.empty((ny - 1, nx - 1, 4), dtype=np.int32)
+    loops[:, :, 0] = idx[:-1, :-1]
+    loops[:, :, 1] = idx[:-1, 1:]
+    loops[:, :, 2] = idx[1:, 1:]
+    loops[:, :, 3] = idx[1:, :-1]
+    return loops.reshape(-1)
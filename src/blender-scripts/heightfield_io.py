@@ -0,0 +1,119 @@
+# 지형 하이트필드 sidecar 입출력 (bpy 의존성 없음)
+#
+# terrain .blend 옆에 두 파일을 저장한다.
+#   <name>_heights.npy   float32 [ny, nx], 월드 Z (미터), 행 = +Y 방향, 열 = +X 방향
+#   <name>_heights.json  헤더 (그리드 크기, 월드 범위, Z 스케일 등)
+#
+# numpy.load(mmap_mode='r') 로 열 수 있으므로 Blender / 메시 로드 없이 바로 높이를 조회할 수 있다.
+#   python heightfield_io.py output/<id>.blend 120.5 -33.0
+import json
+import os
+import sys
+
+import numpy as np
+
+HEADER_VERSION = 1
+
+
+def sidecar_paths(blend_path):
+    base = os.path.splitext(blend_path)[0]
+    return base + "_heights.npy", base + "_heights.json"
+
+
+def write_header(blend_path, shape, extent, z_min, z_max, **header_fields):
+    _npy_path, header_path = sidecar_paths(blend_path)
+    ny, nx = shape
+    xmin, xmax, ymin, ymax = (float(v) for v in extent)
+    header = {
+        "version": HEADER_VERSION,
+        "dtype": "float32",
+        "layout": "row-major [y, x]",
+        "grid": {"nx": nx, "ny": ny},
+        "extent": {"xmin": xmin, "xmax": xmax, "ymin": ymin, "ymax": ymax},
+        "cell_size": {"x": (xmax - xmin) / (nx - 1), "y": (ymax - ymin) / (ny - 1)},
+        "z_units": "m",
+        "z_min": float(z_min),
+        "z_max": float(z_max),
+    }
+    header.update(header_fields)
+    with open(header_path, "w") as f:
+        json.dump(header, f, indent=2)
+    return header_path
+
+
+def save_heightfield(blend_path, heights, extent, **header_fields):
+    npy_path, _header_path = sidecar_paths(blend_path)
+    heights = np.ascontiguousarray(heights, dtype=np.float32)
+    np.save(npy_path, heights)
+    header_path = write_header(
+        blend_path, heights.shape, extent, heights.min(), heights.max(), **header_fields
+    )
+    return npy_path, header_path
+
+
+# 타일 생성용: 디스크의 .npy 를 memmap 으로 열어 타일별로 직접 기록 (전체 배열을 메모리에 두지 않음)
+# 기록이 끝나면 write_header 로 헤더를 작성한다.
+def create_heightfield(blend_path, shape):
+    npy_path, _header_path = sidecar_paths(blend_path)
+    return np.lib.format.open_memmap(npy_path, mode="w+", dtype=np.float32, shape=tuple(shape))
+
+
+def read_header(blend_path):
+    _npy_path, header_path = sidecar_paths(blend_path)
+    with open(header_path, "r") as f:
+        return json.load(f)
+
+
+def header_extent(header):
+    extent = header["extent"]
+    return (extent["xmin"], extent["xmax"], extent["ymin"], extent["ymax"])
+
+
+# (heights, header). mmap=True 면 파일 전체를 읽지 않고 필요한 부분만 페이지 인
+def load_heightfield(blend_path, mmap=True):
+    npy_path, header_path = sidecar_paths(blend_path)
+    heights = np.load(npy_path, mmap_mode="r" if mmap else None)
+    header = read_header(blend_path) if os.path.exists(header_path) else None
+    return heights, header
+
+
+def has_heightfield(blend_path):
+    return os.path.exists(sidecar_paths(blend_path)[0])
+
+
+# 정규 그리드 bilinear 보간. heights: [ny, nx], extent: (xmin, xmax, ymin, ymax)
+def bilinear_sample(heights, extent, x, y):
+    ny, nx = heights.shape
+    xmin, xmax, ymin, ymax = extent
+    fx = (np.asarray(x, dtype=np.float64) - xmin) / (xmax - xmin) * (nx - 1)
+    fy = (np.asarray(y, dtype=np.float64) - ymin) / (ymax - ymin) * (ny - 1)
+    np.clip(fx, 0, nx - 1, out=fx)
+    np.clip(fy, 0, ny - 1, out=fy)
+
+    x0 = np.minimum(fx.astype(np.int64), nx - 2)
+    y0 = np.minimum(fy.astype(np.int64), ny - 2)
+    tx = fx - x0
+    ty = fy - y0
+
+    h00 = heights[y0, x0]
+    h10 = heights[y0, x0 + 1]
+    h01 = heights[y0 + 1, x0]
+    h11 = heights[y0 + 1, x0 + 1]
+    top = h00 + (h10 - h00) * tx
+    bottom = h01 + (h11 - h01) * tx
+    return (top + (bottom - top) * ty).astype(np.float32)
+
+
+# 월드 좌표 (x, y) 의 지형 높이 (Blender 불필요)
+def sample_elevation(blend_path, x, y):
+    heights, header = load_heightfield(blend_path)
+    return bilinear_sample(heights, header_extent(header), x, y)
+
+
+if __name__ == "__main__":
+    # python heightfield_io.py terrain.blend x y [x y ...]
+    blend = sys.argv[1]
+    coords = [float(v) for v in sys.argv[2:]]
+    z = sample_elevation(blend, coords[0::2], coords[1::2])
+    for px, py, pz in zip(coords[0::2], coords[1::2], z):
+        print(f"({px:.2f}, {py:.2f}) -> {pz:.3f}m")
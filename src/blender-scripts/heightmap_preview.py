@@ -0,0 +1,185 @@
+# 렌더 엔진 없이 하이트필드에서 바로 Top View 미리보기 PNG 생성 (bpy 의존성 없음)
+#
+# terrain_generator_v2 의 EEVEE 미리보기와 같은 구성을 NumPy 로 근사한다.
+#   - 카메라: 지형 중앙 위 1.8 * size, 50mm 렌즈 / 36mm 센서 (Blender 기본), 수직 하향
+#   - 색: Material 의 ColorRamp (grass / rock / snow 높이 + 색), Map Range 0 ~ height_multiplier * z_scale
+#   - 조명: 12 단계 Sun (회전 45°, 0, 45°, 세기 3) 의 Lambert hillshade + 월드 ambient
+#   - 원근: 높이에 따른 투영 위치 차이를 1회 보정
+# AO / 반사 / 색 관리(AgX) 는 생략하므로 썸네일 용도의 근사 결과다.
+import json
+import math
+import os
+
+import numpy as np
+
+from heightfield_io import sidecar_paths, read_header, load_heightfield, header_extent, bilinear_sample
+from png_io import write_png
+from render_settings import PREVIEW_RESOLUTION, LOW_PREVIEW_RESOLUTION, MIN_RENDER_RESOLUTION, render_resolution
+
+CAMERA_HEIGHT_FACTOR = 1.8  # 카메라 높이 = size * 1.8
+CAMERA_LENS = 50.0  # mm (Blender 기본)
+CAMERA_SENSOR = 36.0  # mm (Blender 기본, sensor_fit AUTO)
+SUN_ROTATION = (45.0, 0.0, 45.0)  # 도 (XYZ Euler)
+SUN_STRENGTH = 3.0
+WORLD_COLOR = 0.05  # 배경 / ambient (선형)
+ROAD_COLOR = (0.1, 0.1, 0.1)  # 아스팔트 (선형)
+PREVIEW_READY_PREFIX = "[PREVIEW_READY] "  # 서버가 stdout 에서 미리보기 완료를 감지하는 접두사
+
+
+# preview.png → preview_low.png
+def low_preview_path(preview_path):
+    base, ext = os.path.splitext(preview_path)
+    return base + "_low" + ext
+
+
+# 미리보기 완료 알림 한 줄 (stage: "low" | "final"). 로그 버퍼링과 무관하게 바로 전달되도록 flush
+def announce_preview(stage, path, resolution, seconds):
+    payload = {"stage": stage, "path": path, "resolution": resolution, "seconds": round(seconds, 3)}
+    print(PREVIEW_READY_PREFIX + json.dumps(payload), flush=True)
+
+
+# 카메라에 보이는 지면(z=0) 한 변 길이
+def frame_width(size):
+    return size * CAMERA_HEIGHT_FACTOR * CAMERA_SENSOR / CAMERA_LENS
+
+
+# Sun 오브젝트 회전 → 지면에서 태양을 향하는 단위 벡터 (Sun 은 로컬 -Z 방향으로 빛을 보냄)
+def sun_direction(rotation=SUN_ROTATION):
+    rx, ry, rz = (math.radians(a) for a in rotation)
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    # R = Rz @ Ry @ Rx 를 (0, 0, -1) 에 적용한 뒤 부호 반전
+    x = cz * sy * cx + sz * sx
+    y = sz * sy * cx - cz * sx
+    z = cy * cx
+    return np.array([x, y, z], dtype=np.float32)
+
+
+# Material ColorRamp 와 같은 stop 목록 [(position, [r, g, b]), ...] (position 순)
+def ramp_stops(settings):
+    stops = [
+        (settings["grass_height"], settings["grass_color"]),
+        (settings["rock_height"], settings["rock_color"]),
+        (settings["snow_height"], settings["snow_color"]),
+    ]
+    return sorted(([float(p), [float(c) for c in color]] for p, color in stops), key=lambda s: s[0])
+
+
+# ColorRamp (LINEAR 보간, 범위 밖은 끝 색 유지)
+def color_ramp(fac, stops):
+    positions = [p for p, _ in stops]
+    rgb = np.empty(fac.shape + (3,), dtype=np.float32)
+    for channel in range(3):
+        rgb[..., channel] = np.interp(fac, positions, [color[channel] for _, color in stops])
+    return rgb
+
+
+def linear_to_srgb(linear):
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+
+# 픽셀 중심의 지면 좌표 (x, y) [res, res]. 0 행 = 이미지 위쪽 = +Y
+def pixel_ground_coords(width, resolution):
+    centres = ((np.arange(resolution, dtype=np.float32) + 0.5) / resolution - 0.5) * width
+    return np.meshgrid(centres, -centres)
+
+
+# 월드 (x, y) → 픽셀 (행, 열) 실수 좌표 (z=0 지면 기준)
+def ground_to_pixel(x, y, width, resolution):
+    col = (np.asarray(x) / width + 0.5) * resolution - 0.5
+    row = (0.5 - np.asarray(y) / width) * resolution - 0.5
+    return row, col
+
+
+# 하이트필드 (월드 Z) → 선형 RGB [res, res, 3]. height_range: Map Range 상한 (height_multiplier * z_scale)
+def shade_heightfield(heights, extent, height_range, stops, resolution=PREVIEW_RESOLUTION):
+    xmin, xmax, ymin, ymax = extent
+    size = max(xmax - xmin, ymax - ymin)
+    width = frame_width(size)
+    camera_z = size * CAMERA_HEIGHT_FACTOR
+
+    gx, gy = pixel_ground_coords(width, resolution)
+    # 원근 보정: 높이 z 인 점은 지면보다 카메라에 가까워 바깥쪽으로 투영됨
+    z = bilinear_sample(heights, extent, gx, gy)
+    scale = (camera_z - z) / camera_z
+    x = gx * scale
+    y = gy * scale
+    z = bilinear_sample(heights, extent, x, y)
+
+    # 중앙 차분 법선 (하이트필드 셀 간격)
+    dx = (xmax - xmin) / (heights.shape[1] - 1)
+    dy = (ymax - ymin) / (heights.shape[0] - 1)
+    dzdx = (bilinear_sample(heights, extent, x + dx, y) - bilinear_sample(heights, extent, x - dx, y)) / (2 * dx)
+    dzdy = (bilinear_sample(heights, extent, x, y + dy) - bilinear_sample(heights, extent, x, y - dy)) / (2 * dy)
+    sun = sun_direction()
+    ndotl = (sun[2] - dzdx * sun[0] - dzdy * sun[1]) / np.sqrt(dzdx * dzdx + dzdy * dzdy + 1.0)
+    light = SUN_STRENGTH / math.pi * np.maximum(ndotl, 0.0) + WORLD_COLOR
+
+    rgb = color_ramp(np.clip(z / height_range, 0.0, 1.0), stops) * light[..., None]
+    outside = (x < xmin) | (x > xmax) | (y < ymin) | (y > ymax)
+    rgb[outside] = WORLD_COLOR
+    return rgb
+
+
+# 도로 중심선 [(M, 2) 월드 좌표] 를 폭만큼 칠함 (0.5px 간격 원형 스탬프)
+def draw_roads(rgb, roads, size):
+    resolution = rgb.shape[0]
+    width = frame_width(size)
+    px_per_m = resolution / width
+    flat_light = SUN_STRENGTH / math.pi * sun_direction()[2] + WORLD_COLOR
+    color = np.array(ROAD_COLOR, dtype=np.float32) * flat_light
+
+    for centreline, road_width in roads:
+        row, col = ground_to_pixel(centreline[:, 0], centreline[:, 1], width, resolution)
+        points = np.column_stack((row, col))
+        # 0.5px 간격으로 보간
+        steps = np.maximum(np.ceil(np.linalg.norm(np.diff(points, axis=0), axis=1) * 2), 1).astype(int)
+        t = np.concatenate([np.arange(n) / n for n in steps] + [[1.0]])
+        seg = np.concatenate([np.full(n, i) for i, n in enumerate(steps)] + [[len(steps) - 1]])
+        dense = points[seg] + (points[seg + 1] - points[seg]) * t[:, None]
+
+        radius = max(road_width * px_per_m / 2, 0.5)
+        r = int(math.ceil(radius))
+        oy, ox = np.mgrid[-r : r + 1, -r : r + 1]
+        disc = np.column_stack((oy.ravel(), ox.ravel()))[(oy * oy + ox * ox).ravel() <= radius * radius + 0.25]
+        pixels = np.rint(dense).astype(np.int64)[:, None, :] + disc[None, :, :]
+        pixels = pixels.reshape(-1, 2)
+        inside = (pixels >= 0).all(axis=1) & (pixels < resolution).all(axis=1)
+        pixels = pixels[inside]
+        rgb[pixels[:, 0], pixels[:, 1]] = color
+    return rgb
+
+
+# sidecar + 헤더의 ColorRamp 가 있어야 (이전 버전 지형 제외) 렌더 엔진 없이 미리보기 가능
+def can_render_preview(terrain_blend_path):
+    npy_path, header_path = sidecar_paths(terrain_blend_path)
+    if not (os.path.exists(npy_path) and os.path.exists(header_path)):
+        return False
+    return "color_ramp" in read_header(terrain_blend_path)
+
+
+# 월드 Z 하이트필드 배열 → preview PNG. roads: [(중심선 [M, 2], 폭 m), ...]
+def write_preview(preview_path, heights, extent, height_range, stops, roads=None, resolution=PREVIEW_RESOLUTION):
+    rgb = shade_heightfield(heights, extent, height_range, stops, resolution)
+    if roads:
+        xmin, xmax, ymin, ymax = extent
+        draw_roads(rgb, roads, max(xmax - xmin, ymax - ymin))
+    image = np.rint(linear_to_srgb(rgb) * 255.0).astype(np.uint8)
+    return write_png(preview_path, image)
+
+
+# terrain .blend 의 하이트필드 sidecar → preview PNG
+# stops 가 없으면 sidecar 헤더에 기록된 ColorRamp 사용
+def render_heightmap_preview(terrain_blend_path, preview_path, stops=None, roads=None, resolution=PREVIEW_RESOLUTION):
+    heights, header = load_heightfield(terrain_blend_path)
+    return write_preview(
+        preview_path,
+        heights,
+        header_extent(header),
+        header["height_multiplier"] * header["z_scale"],
+        stops or header["color_ramp"],
+        roads,
+        resolution,
+    )
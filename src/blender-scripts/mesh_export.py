@@ -0,0 +1,255 @@
+# 웹 전달용 경량 메시 내보내기 (bpy 의존성 없음)
+#
+# bpy 익스포터를 거치지 않고 NumPy 배열 (하이트필드 / foreach_get 버퍼) 에서 바로 파일을 쓴다.
+#   glb: glTF 2.0 바이너리. KHR_mesh_quantization 으로 위치 int16 (+ 노드 scale / translation 복원),
+#        법선 int8 normalized, 인덱스 uint16/uint32. glTF 는 Y-up 이므로 (x, y, z) → (x, z, -y) 로 변환
+#   bin: <name>_mesh.bin + <name>_mesh.json. 메시마다 위치 float16 [N, 3] (Blender Z-up, origin 기준 상대 좌표)
+#        + 인덱스 uint32 [M] 를 이어 붙이고 JSON 헤더에 offset / 개수 / origin 을 기록
+# 메시는 {"name", "positions" [N, 3], "indices" [M] (삼각형), "normals" [N, 3]?, "uvs" [N, 2]?} dict 목록이다.
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+EXPORT_FORMATS = ("glb", "bin")
+RAW_HEADER_VERSION = 1
+
+_GLB_MAGIC = 0x46546C67  # "glTF"
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+_ACCESSOR_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3"}
+
+
+# params["export_formats"]: ["glb", "bin"] 또는 "glb,bin" (기본: 내보내지 않음)
+def read_export_formats(params):
+    formats = params.get("export_formats") or []
+    if isinstance(formats, str):
+        formats = formats.split(",")
+    formats = [str(f).strip().lower() for f in formats if str(f).strip()]
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {unknown} (supported: {list(EXPORT_FORMATS)})")
+    return formats
+
+
+def export_paths(output_path):
+    base = os.path.splitext(output_path)[0]
+    return {"glb": base + ".glb", "bin": base + "_mesh.bin", "bin_header": base + "_mesh.json"}
+
+
+# ===== 메시 버퍼 =====
+# 쿼드 loop 버퍼 [4K] (grid_loops / 도로 loops) → 삼각형 인덱스 [6K] (a, b, c) + (a, c, d), 감김 방향 유지
+def quad_triangles(loops):
+    quads = np.asarray(loops).reshape(-1, 4)
+    triangles = np.empty((len(quads), 2, 3), dtype=np.uint32)
+    triangles[:, 0] = quads[:, [0, 1, 2]]
+    triangles[:, 1] = quads[:, [0, 2, 3]]
+    return triangles.reshape(-1)
+
+
+# 하이트필드 (월드 Z [ny, nx]) + 월드 범위 → 그리드 메시 dict (중앙 차분 법선 포함)
+def heightfield_mesh(name, heights, extent, loops):
+    ny, nx = heights.shape
+    xmin, xmax, ymin, ymax = extent
+    positions = np.empty((ny, nx, 3), dtype=np.float32)
+    positions[:, :, 0] = np.linspace(xmin, xmax, nx, dtype=np.float32)[None, :]
+    positions[:, :, 1] = np.linspace(ymin, ymax, ny, dtype=np.float32)[:, None]
+    positions[:, :, 2] = heights
+
+    dzdy, dzdx = np.gradient(np.asarray(heights, dtype=np.float32), (ymax - ymin) / (ny - 1), (xmax - xmin) / (nx - 1))
+    normals = np.empty((ny, nx, 3), dtype=np.float32)
+    normals[:, :, 0] = -dzdx
+    normals[:, :, 1] = -dzdy
+    normals[:, :, 2] = 1.0
+    normals /= np.linalg.norm(normals, axis=2, keepdims=True)
+    return {
+        "name": name,
+        "positions": positions.reshape(-1, 3),
+        "indices": quad_triangles(loops),
+        "normals": normals.reshape(-1, 3),
+    }
+
+
+# Blender Z-up → glTF Y-up (회전이므로 감김 방향 유지)
+def _to_y_up(vectors):
+    return np.column_stack((vectors[:, 0], vectors[:, 2], -vectors[:, 1]))
+
+
+# 위치 → (int16 [N, 4] (4번째 열은 stride 정렬용), scale, translation, 최대 오차)
+# 법선이 왜곡되지 않도록 세 축에 같은 scale 을 쓴다 (KHR_mesh_quantization 권장).
+def quantize_positions(positions):
+    lo = positions.min(axis=0)
+    span = float((positions.max(axis=0) - lo).max()) or 1.0
+    scale = span / 65535.0
+    quantized = np.zeros((len(positions), 4), dtype=np.int16)
+    quantized[:, :3] = np.rint((positions - lo) / scale) - 32768
+    translation = lo + 32768 * scale
+    error = float(np.abs(quantized[:, :3] * scale + translation - positions).max())
+    return quantized, scale, translation, error
+
+
+def _pack_normals(normals):
+    packed = np.zeros((len(normals), 4), dtype=np.int8)
+    packed[:, :3] = np.rint(np.clip(normals, -1.0, 1.0) * 127.0)
+    return packed
+
+
+class _BufferBuilder:
+    def __init__(self):
+        self.chunks = []
+        self.length = 0
+        self.buffer_views = []
+        self.accessors = []
+
+    def add(self, array, components, target, normalized=False, stride=None, bounds=True):
+        data = np.ascontiguousarray(array)
+        view = {"buffer": 0, "byteOffset": self.length, "byteLength": data.nbytes, "target": target}
+        if stride:
+            view["byteStride"] = stride
+        self.chunks.append(data.tobytes())
+        self.length += data.nbytes
+        pad = (-self.length) % 4
+        if pad:
+            self.chunks.append(b"\x00" * pad)
+            self.length += pad
+        self.buffer_views.append(view)
+
+        values = data[:, :components] if data.ndim == 2 else data
+        accessor = {
+            "bufferView": len(self.buffer_views) - 1,
+            "componentType": _COMPONENT_TYPES[data.dtype],
+            "count": len(data),
+            "type": _ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds:
+            # POSITION 은 min / max 필수
+            accessor["min"] = values.min(axis=0).tolist() if values.ndim == 2 else [values.min().item()]
+            accessor["max"] = values.max(axis=0).tolist() if values.ndim == 2 else [values.max().item()]
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+
+# 메시 목록 → GLB 파일 (메시마다 노드 1개, 노드 transform 으로 양자화 복원) → 최대 양자화 오차 (m)
+def write_glb(path, meshes, generator="blender-terrain-mcp"):
+    builder = _BufferBuilder()
+    gltf_meshes = []
+    nodes = []
+    max_error = 0.0
+    for mesh in meshes:
+        positions = _to_y_up(np.asarray(mesh["positions"], dtype=np.float32))
+        quantized, scale, translation, error = quantize_positions(positions)
+        max_error = max(max_error, error)
+
+        attributes = {"POSITION": builder.add(quantized, 3, _ARRAY_BUFFER, stride=8)}
+        if mesh.get("normals") is not None:
+            normals = _to_y_up(np.asarray(mesh["normals"], dtype=np.float32))
+            attributes["NORMAL"] = builder.add(_pack_normals(normals), 3, _ARRAY_BUFFER, normalized=True, stride=4, bounds=False)
+        if mesh.get("uvs") is not None:
+            uvs = np.asarray(mesh["uvs"], dtype=np.float32).copy()
+            uvs[:, 1] = 1.0 - uvs[:, 1]  # glTF UV 원점은 왼쪽 위
+            attributes["TEXCOORD_0"] = builder.add(uvs, 2, _ARRAY_BUFFER, bounds=False)
+        index_dtype = np.uint16 if len(positions) <= 65535 else np.uint32
+        indices = builder.add(np.asarray(mesh["indices"]).astype(index_dtype), 1, _ELEMENT_ARRAY_BUFFER, bounds=False)
+
+        gltf_meshes.append({"name": mesh["name"], "primitives": [{"attributes": attributes, "indices": indices, "mode": 4}]})
+        nodes.append({
+            "name": mesh["name"],
+            "mesh": len(gltf_meshes) - 1,
+            "scale": [scale, scale, scale],
+            "translation": [float(t) for t in translation],
+        })
+
+    document = {
+        "asset": {"version": "2.0", "generator": generator},
+        "extensionsUsed": ["KHR_mesh_quantization"],
+        "extensionsRequired": ["KHR_mesh_quantization"],
+        "scene": 0,
+        "scenes": [{"nodes": list(range(len(nodes)))}],
+        "nodes": nodes,
+        "meshes": gltf_meshes,
+        "buffers": [{"byteLength": builder.length}],
+        "bufferViews": builder.buffer_views,
+        "accessors": builder.accessors,
+    }
+    json_bytes = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    json_bytes += b" " * ((-len(json_bytes)) % 4)
+    total = 12 + 8 + len(json_bytes) + 8 + builder.length
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", _GLB_MAGIC, 2, total))
+        f.write(struct.pack("<II", len(json_bytes), _CHUNK_JSON))
+        f.write(json_bytes)
+        f.write(struct.pack("<II", builder.length, _CHUNK_BIN))
+        for chunk in builder.chunks:
+            f.write(chunk)
+    return max_error
+
+
+# 메시 목록 → 원시 버퍼 (.bin) + JSON 헤더 → 최대 float16 오차 (m)
+def write_raw_mesh(bin_path, header_path, meshes):
+    entries = []
+    offset = 0
+    max_error = 0.0
+    with open(bin_path, "wb") as f:
+        for mesh in meshes:
+            positions = np.asarray(mesh["positions"], dtype=np.float32)
+            origin = (positions.min(axis=0) + positions.max(axis=0)) / 2
+            half = (positions - origin).astype(np.float16)
+            max_error = max(max_error, float(np.abs(half.astype(np.float32) + origin - positions).max()))
+            indices = np.asarray(mesh["indices"], dtype=np.uint32)
+
+            f.write(half.tobytes())
+            f.write(indices.tobytes())
+            entries.append({
+                "name": mesh["name"],
+                "origin": [float(v) for v in origin],
+                "vertex_count": len(half),
+                "index_count": len(indices),
+                "positions": {"byte_offset": offset, "dtype": "float16", "components": 3},
+                "indices": {"byte_offset": offset + half.nbytes, "dtype": "uint32"},
+            })
+            offset += half.nbytes + indices.nbytes
+
+    header = {
+        "version": RAW_HEADER_VERSION,
+        "up_axis": "z",
+        "byte_order": "little",
+        "primitive": "triangles",
+        "meshes": entries,
+    }
+    with open(header_path, "w") as f:
+        json.dump(header, f, indent=2)
+    return max_error
+
+
+# 요청한 형식마다 내보내기 → {형식: {path, bytes, seconds, max_error}}
+def export_meshes(output_path, meshes, formats):
+    paths = export_paths(output_path)
+    results = {}
+    for fmt in formats:
+        start = time.perf_counter()
+        if fmt == "glb":
+            error = write_glb(paths["glb"], meshes)
+            files = [paths["glb"]]
+        else:
+            error = write_raw_mesh(paths["bin"], paths["bin_header"], meshes)
+            files = [paths["bin"], paths["bin_header"]]
+        results[fmt] = {
+            "path": files[0],
+            "bytes": sum(os.path.getsize(p) for p in files),
+            "seconds": round(time.perf_counter() - start, 4),
+            "max_error": error,
+        }
+    return results
@@ -0,0 +1,156 @@
+# 하이트필드 계산을 프로세스 풀로 병렬화 (bpy 의존성 없음)
+#
+# 그리드를 행 밴드로 나눠 concurrent.futures.ProcessPoolExecutor 의 순수 NumPy 워커가 계산하고,
+# 결과는 multiprocessing.shared_memory 의 한 버퍼에 바로 기록한다 (pickle 로 배열을 돌려받지 않음).
+# Blender 프로세스는 이 버퍼를 그대로 메시 정점 버퍼로 변환하기만 한다.
+#
+# 워커 수: params["workers"] → TERRAIN_WORKERS 환경 변수 → 1 (0 또는 "auto" = CPU 코어 수)
+# 풀은 워커 수별로 한 번만 만들어 재사용한다 (영구 Blender 워커에서 작업 간 프로세스 기동 비용 제거).
+# 자식이 죽어 (OOM, 시그널) 깨진 풀은 버리고 새 풀로 POOL_ATTEMPTS 번까지 다시 시도한 뒤, 그래도 실패하면 현재 프로세스에서 계산한다.
+import math
+import multiprocessing
+import os
+import sys
+import types
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from heightfield import NoiseBasis, compute_heightfield
+
+MIN_BAND_ROWS = 16  # 작업 하나의 최소 행 수 (작업 분배 오버헤드 제한)
+BANDS_PER_WORKER = 4  # 워커당 밴드 수 (밴드별 계산 시간 차이 흡수)
+POOL_ATTEMPTS = 2  # 깨진 풀을 새 풀로 바꿔 시도하는 횟수 (처음 + 재시도 1 번)
+
+_executors = {}
+_worker_bases = {}
+
+
+def worker_count(params):
+    value = params.get("workers", os.environ.get("TERRAIN_WORKERS", 1))
+    text = str(value).strip().lower()
+    if text in ("0", "auto"):
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(text))
+    except ValueError:
+        raise ValueError(f"workers must be an integer or 'auto', got {value!r}") from None
+
+
+# ===== 워커 프로세스 =====
+def _basis(seed):
+    if seed not in _worker_bases:
+        _worker_bases[seed] = NoiseBasis(seed)
+    return _worker_bases[seed]
+
+
+def _compute_band(shm_name, shape, settings, xs, ys, row_start, row_stop):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        heights = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        compute_heightfield(
+            settings, xs, ys[row_start:row_stop], _basis(settings["seed"]), out=heights[row_start:row_stop]
+        )
+        del heights
+    finally:
+        shm.close()
+    return row_stop - row_start
+
+
+# ===== 메인 프로세스 =====
+# spawn 으로 띄운 자식은 부모의 __main__ 스크립트를 다시 import 하는데,
+# Blender 에서 실행된 생성기 스크립트는 bpy 가 없는 워커에서 import 할 수 없으므로
+# 프로세스를 띄우는 동안만 __main__ 을 빈 모듈로 바꿔 둔다.
+@contextmanager
+def _detached_main():
+    main_module = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def _executor(workers):
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executors[workers]
+
+
+# 깨진 풀 제거 (남은 작업 취소, 죽은 자식을 기다리지 않음) → 다음 _executor 호출이 새 풀을 만든다
+def _discard_executor(workers):
+    executor = _executors.pop(workers, None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _band_ranges(rows, workers):
+    band = max(MIN_BAND_ROWS, math.ceil(rows / (workers * BANDS_PER_WORKER)))
+    return [(start, min(start + band, rows)) for start in range(0, rows, band)]
+
+
+def _release(shm):
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+def _run_bands(shm, shape, settings, xs, ys, workers):
+    with _detached_main():
+        executor = _executor(workers)
+        futures = [
+            executor.submit(_compute_band, shm.name, shape, settings, xs, ys, start, stop)
+            for start, stop in _band_ranges(shape[0], workers)
+        ]
+    for future in futures:
+        future.result()
+
+
+# compute_heightfield 와 같은 결과 [ny, nx] 를 workers 개 프로세스로 계산.
+# 반환 배열은 공유 메모리를 직접 가리키며, 배열이 해제될 때 공유 메모리도 닫힌다.
+def compute_heightfield_parallel(settings, xs, ys, workers):
+    shape = (len(ys), len(xs))
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+    try:
+        for attempt in range(1, POOL_ATTEMPTS + 1):
+            try:
+                _run_bands(shm, shape, settings, xs, ys, workers)
+                break
+            except BrokenProcessPool as error:
+                _discard_executor(workers)
+                print(f"[Terrain v2] WARNING: Worker pool broken ({error}), attempt {attempt}/{POOL_ATTEMPTS}")
+        else:
+            print(f"[Terrain v2] WARNING: Worker pool unavailable, computing heightfield serially")
+            heights = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            compute_heightfield(settings, xs, ys, out=heights)
+            del heights
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+
+    # 이름은 바로 제거 (POSIX: 매핑은 배열이 살아 있는 동안 유지), 배열 해제 시 close
+    shm.unlink()
+    heights = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+    weakref.finalize(heights, _release, shm)
+    return heights
+
+
+# workers 가 1 이면 현재 프로세스에서, 아니면 프로세스 풀에서 계산
+def compute_heights(settings, xs, ys, workers=1, basis=None):
+    if workers <= 1:
+        return compute_heightfield(settings, xs, ys, basis)
+    return compute_heightfield_parallel(settings, xs, ys, workers)
+
+
+def shutdown():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
@@ -0,0 +1,102 @@
+# 최소 PNG 인코더 / 디코더 (표준 라이브러리 + NumPy, bpy / PIL 의존성 없음)
+# 인코더: 8-bit RGB / RGBA / 그레이스케일, 필터 없음 (행마다 필터 바이트 0) + zlib 압축
+# 디코더: 8-bit 그레이스케일 / 그레이+알파 / RGB / RGBA, 인터레이스 없음 (지형 믹서의 저해상도 마스크용)
+import struct
+import zlib
+
+import numpy as np
+
+_COLOR_TYPES = {1: 0, 3: 2, 4: 6}  # 채널 수 → PNG color type
+_CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}  # PNG color type → 채널 수
+
+
+def _chunk(tag, data):
+    body = tag + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+# image: uint8 [h, w] 또는 [h, w, 1|3|4], 0 행 = 이미지 위쪽
+def encode_png(image, level=6):
+    image = np.asarray(image, dtype=np.uint8)
+    if image.ndim == 2:
+        image = image[:, :, None]
+    height, width, channels = image.shape
+
+    raw = np.empty((height, 1 + width * channels), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = image.reshape(height, width * channels)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, _COLOR_TYPES[channels], 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def write_png(path, image, level=6):
+    with open(path, "wb") as f:
+        f.write(encode_png(image, level))
+    return path
+
+
+# 필터 바이트가 붙은 행들 → uint8 [h, w * channels]. Sub / Average / Paeth 는 이전 픽셀에 의존하므로 픽셀 단위
+def _unfilter(raw, height, stride, channels):
+    rows = raw.reshape(height, stride + 1)
+    out = np.zeros((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.int32)
+    for y in range(height):
+        kind = rows[y, 0]
+        line = rows[y, 1:].astype(np.int32)
+        if kind == 2:  # Up
+            line = (line + previous) & 0xFF
+        elif kind in (1, 3, 4):  # Sub / Average / Paeth
+            for i in range(stride):
+                left = line[i - channels] if i >= channels else 0
+                up = previous[i]
+                if kind == 1:
+                    predictor = left
+                elif kind == 3:
+                    predictor = (left + up) // 2
+                else:
+                    corner = previous[i - channels] if i >= channels else 0
+                    p = left + up - corner
+                    pa, pb, pc = abs(p - left), abs(p - up), abs(p - corner)
+                    predictor = left if pa <= pb and pa <= pc else (up if pb <= pc else corner)
+                line[i] = (line[i] + predictor) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"Unsupported PNG filter type {kind}")
+        out[y] = line
+        previous = line
+    return out
+
+
+# PNG 파일 → uint8 [h, w, channels] (0 행 = 이미지 위쪽)
+def read_png(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"Not a PNG file: {path}")
+
+    offset = 8
+    idat = []
+    header = None
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        tag = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+
+    width, height, depth, color_type, _compression, _filter, interlace = header
+    if depth != 8 or color_type not in _CHANNELS or interlace:
+        raise ValueError(f"Unsupported PNG format (bit depth {depth}, color type {color_type}): {path}")
+    channels = _CHANNELS[color_type]
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8)
+    return _unfilter(raw, height, width * channels, channels).reshape(height, width, channels)
@@ -0,0 +1,154 @@
+# 단계별 프로파일링 (bpy 의존성 없음)
+#
+# 생성기 스크립트의 번호 단계마다 wall / CPU 시간, 최대 RSS, 정점 / 면 수를 기록하고
+# 마지막에 출력 파일 크기와 함께 "[PROFILE] {json}" 한 줄로 내보낸다 (서버 / 벤치마크가 파싱).
+#
+#   profiler = Profiler("terrain_generator_v2", profile_path(params, output_path))
+#   with profiler.phase("mesh"):
+#       ...
+#       profiler.count(vertices=..., faces=...)
+#   profiler.output("blend", output_path)
+#   summary = profiler.emit()
+#
+# 같은 이름의 단계를 여러 번 열면 (도로별 메시 등) 시간 / 개수를 누적하고 calls 를 센다.
+# params["cprofile"] 또는 환경 변수 BLENDER_CPROFILE 이 켜져 있으면 cProfile 통계를 <output>.prof 로 저장한다.
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from result_cache import read_flag
+
+PROFILE_PREFIX = "[PROFILE] "
+
+
+# 프로세스 최대 RSS (bytes). 영구 워커에서는 프로세스 전체 기간의 최댓값이다.
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux 는 KB 단위
+
+
+def _windows_peak_rss():
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+    except (AttributeError, OSError):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def _megabytes(n):
+    return None if n is None else round(n / (1024 * 1024), 1)
+
+
+# cProfile 덤프 경로 (꺼져 있으면 None). params["cprofile"] 이 있으면 환경 변수보다 우선 (false 로 끌 수도 있음)
+def profile_path(params, output_path):
+    default = read_flag(os.environ, "BLENDER_CPROFILE", False)
+    if not read_flag(params, "cprofile", default):
+        return None
+    return os.path.splitext(output_path)[0] + ".prof"
+
+
+class Profiler:
+    def __init__(self, script, cprofile_path=None):
+        self.script = script
+        self.phases = {}  # 이름 → 기록 (처음 연 순서 유지)
+        self.outputs = {}
+        self.counts = {}
+        self._current = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.cprofile_path = cprofile_path
+        self._cprofile = None
+        if cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextmanager
+    def phase(self, name):
+        record = self.phases.setdefault(name, {"name": name, "wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+        parent = self._current
+        self._current = record
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] += time.perf_counter() - wall_start
+            record["cpu_seconds"] += time.process_time() - cpu_start
+            record["calls"] += 1
+            record["peak_rss_mb"] = _megabytes(peak_rss_bytes())
+            self._current = parent
+
+    # 정점 / 면 수 등 개수 누적 (열린 단계가 있으면 그 단계에, 항상 전체 합계에도)
+    def count(self, **counts):
+        targets = [self.counts] + ([self._current] if self._current is not None else [])
+        for target in targets:
+            for key, value in counts.items():
+                target[key] = target.get(key, 0) + int(value)
+
+    # 출력 파일 등록 (크기는 emit 시점에 측정)
+    def output(self, role, path):
+        self.outputs[role] = path
+
+    def summary(self):
+        phases = []
+        for record in self.phases.values():
+            phases.append({
+                **record,
+                "wall_seconds": round(record["wall_seconds"], 4),
+                "cpu_seconds": round(record["cpu_seconds"], 4),
+            })
+        return {
+            "script": self.script,
+            "wall_seconds": round(time.perf_counter() - self._wall_start, 4),
+            "cpu_seconds": round(time.process_time() - self._cpu_start, 4),
+            "peak_rss_mb": _megabytes(peak_rss_bytes()),
+            "counts": self.counts,
+            "phases": phases,
+            "outputs": {
+                role: os.path.getsize(path) if os.path.exists(path) else None
+                for role, path in self.outputs.items()
+            },
+        }
+
+    # 요약 JSON 한 줄 출력 (+ cProfile 덤프) → 요약 dict
+    def emit(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        summary = self.summary()
+        if self.cprofile_path:
+            summary["cprofile"] = self.cprofile_path
+        print(PROFILE_PREFIX + json.dumps(summary), flush=True)
+        return summary
@@ -0,0 +1,11 @@
+# 미리보기 / 렌더 해상도 설정 (bpy, NumPy 의존성 없음)
+# 지형 파라미터 파싱 (heightfield), 미리보기 (heightmap_preview), 도로 생성 (road_generator), 비용 추정 (cost_estimator) 이 함께 쓰는 값
+# heightfield 가 미리보기 모듈에 의존하지 않도록 따로 둔다.
+PREVIEW_RESOLUTION = 1024
+LOW_PREVIEW_RESOLUTION = 128  # 점진적 미리보기: 거친 그리드 / 이미지 한 변
+MIN_RENDER_RESOLUTION = 256  # render_resolution 하한 (cost_estimator 가 이 값까지 낮출 수 있음)
+
+
+# 최종 미리보기 (EEVEE / numpy) 한 변 픽셀 수: params["render_resolution"] → PREVIEW_RESOLUTION
+def render_resolution(params):
+    return max(MIN_RENDER_RESOLUTION, int(params.get("render_resolution", PREVIEW_RESOLUTION)))
@@ -0,0 +1,168 @@
+# 지형 결과 캐시 (content-addressed, bpy 의존성 없음)
+# 생성기가 실제로 사용하는 파라미터 + 스크립트 버전의 해시를 키로
+# .blend / preview 등 결과 파일을 디스크에 저장하고 재사용한다.
+#
+# 구조: <cache_dir>/<key>/<role 파일들>, <cache_dir>/stats.json
+# LRU: 엔트리 디렉토리의 mtime (hit 때마다 갱신) 기준으로 오래된 것부터 삭제
+import hashlib
+import json
+import os
+import shutil
+import time
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+STATS_FILE = "stats.json"
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off", "")
+
+
+def _normalize(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+# 정규화된 파라미터 JSON 의 sha256
+def params_key(settings, version):
+    canonical = json.dumps(
+        {"version": version, "params": _normalize(settings)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+# on / off 파라미터: HTTP 계층에서 문자열 ("false", "0") 로 들어와도 명시적으로 해석
+def read_flag(params, name, default):
+    value = params.get(name)
+    if value is None:
+        return default
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"{name} must be a boolean, got {value!r}")
+
+
+def cache_config(params, output_path):
+    cache_dir = params.get("cache_dir") or os.environ.get("TERRAIN_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), "cache")
+    max_bytes = int(
+        params.get("cache_max_bytes")
+        or os.environ.get("TERRAIN_CACHE_MAX_BYTES")
+        or DEFAULT_MAX_BYTES
+    )
+    enabled = read_flag(params, "use_cache", True)
+    return enabled, cache_dir, max_bytes
+
+
+# 항상 복사 (하드링크는 작업 출력을 제자리에서 고치면 캐시 엔트리까지 바뀜)
+# 임시 파일에 쓴 뒤 rename 하므로 중간에 실패해도 반쯤 쓴 파일이 남지 않는다
+def _copy(src, dst):
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return
+    tmp_path = dst + f".tmp{os.getpid()}"
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def _entry_files(entry_dir):
+    return {
+        os.path.splitext(name)[0]: os.path.join(entry_dir, name)
+        for name in os.listdir(entry_dir)
+    }
+
+
+def _entry_size(entry_dir):
+    return sum(
+        os.path.getsize(os.path.join(entry_dir, name)) for name in os.listdir(entry_dir)
+    )
+
+
+# ===== 통계 =====
+def _update_stats(cache_dir, hit):
+    path = os.path.join(cache_dir, STATS_FILE)
+    stats = {"hits": 0, "misses": 0}
+    try:
+        with open(path, "r") as f:
+            stats.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    stats["hits" if hit else "misses"] += 1
+    try:
+        with open(path, "w") as f:
+            json.dump(stats, f)
+    except OSError:
+        pass
+    return stats
+
+
+def format_stats(status, key, stats):
+    total = stats["hits"] + stats["misses"]
+    rate = 100.0 * stats["hits"] / total if total else 0.0
+    return (
+        f"Cache {status}: key={key} hits={stats['hits']} "
+        f"misses={stats['misses']} hit_rate={rate:.1f}%"
+    )
+
+
+# ===== 조회 / 저장 =====
+# hit 이면 destinations ({role: path}) 로 파일을 복원하고 True 반환
+def restore(cache_dir, key, destinations):
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_dir = os.path.join(cache_dir, key)
+    files = _entry_files(entry_dir) if os.path.isdir(entry_dir) else {}
+
+    if not all(role in files for role in destinations):
+        return False, _update_stats(cache_dir, hit=False)
+
+    for role, dst in destinations.items():
+        _copy(files[role], dst)
+    now = time.time()
+    os.utime(entry_dir, (now, now))
+    return True, _update_stats(cache_dir, hit=True)
+
+
+# sources ({role: path}) 를 캐시에 저장한 뒤 max_bytes 를 넘으면 LRU 삭제
+def store(cache_dir, key, sources, max_bytes):
+    entry_dir = os.path.join(cache_dir, key)
+    tmp_dir = entry_dir + f".tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    for role, src in sources.items():
+        if os.path.exists(src):
+            _copy(src, os.path.join(tmp_dir, role + os.path.splitext(src)[1]))
+
+    # 완성된 엔트리만 보이도록 rename 으로 교체
+    if os.path.isdir(entry_dir):
+        shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+
+    return evict(cache_dir, max_bytes, keep=key)
+
+
+def evict(cache_dir, max_bytes, keep=None):
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path) and ".tmp" not in name:
+            entries.append((os.path.getmtime(path), _entry_size(path), name, path))
+
+    total = sum(e[1] for e in entries)
+    removed = 0
+    for mtime, entry_bytes, name, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= entry_bytes
+        removed += 1
+    return removed, total
@@ -0,0 +1,180 @@
+# 도로 corridor 평탄화 + 지형 연결 (bpy 의존성 없음)
+#
+# 도로를 지형 위 5cm 에 띄우기만 하면 경사가 급한 곳에서 지형이 도로를 뚫고 올라오거나 틈이 생긴다.
+# 지형 하이트필드를 도로 중심선의 거리장(distance field) 으로 직접 편집해서
+#   - 거리 <= 폭/2 + shoulder:  도로 높이로 평탄화 (cut / fill)
+#   - 그 바깥 blend 폭:         smoothstep 으로 원래 지형에 이어 붙임
+# 도로 높이(목표 높이)는 중심선 아래 지형 높이를 호 길이 기준 이동 평균으로 평활화한 값이다.
+# 편집된 하이트필드에 도로 정점을 다시 올리면 (가장자리 offset 0) 도로 가장자리가 지형과 맞닿는다.
+#
+# 거리장은 도로 주변 셀만 계산한다: 중심선을 반경 x 2 이하 조각으로 나누고 조각마다 같은 크기의 창
+# (조각 + 반경) 안 셀까지의 거리를 한 번에 계산한 뒤, 셀마다 가장 가까운 조각 하나만 남긴다.
+# (조각 길이 L 에서 창 셀 수 / 반경 안 셀 수 ≈ (L + 2r)² / 2rL 이 L = 2r 일 때 최소 (약 4배))
+# 비용은 (도로 길이 x 반경) 에 비례하고 지형 전체 해상도에는 비례하지 않는다.
+#
+# 파라미터 (road 요청):
+#   flatten_corridor:   True 면 평탄화 (기본 False, 증분 편집은 이전 상태 유지)
+#   corridor_shoulder:  도로 가장자리 밖 평탄 폭 (m, 기본 1.0)
+#   corridor_blend:     원래 지형으로 이어지는 폭 (m, 기본 4.0)
+#   corridor_smoothing: 도로 높이 평활화 창 길이 (m, 기본 20.0, 0 이면 지형 그대로)
+import time
+
+import numpy as np
+
+from heightfield_io import save_heightfield, bilinear_sample
+from road_drape import DRAPE_OFFSET
+from road_mesh import PROFILE_POINTS
+
+DEFAULT_SHOULDER = 1.0
+DEFAULT_BLEND = 4.0
+DEFAULT_SMOOTHING = 20.0
+CHUNK_CELLS = 1_000_000  # 한 번에 만드는 (조각 x 창) 셀 수 상한 (임시 배열 메모리)
+
+# 하이트필드 헤더에서 write_header 가 다시 쓰는 항목 (나머지는 그대로 복사). file 은 이전 헤더에만 있는 항목이라 버림
+_HEADER_FIELDS = ("version", "file", "dtype", "layout", "grid", "extent", "cell_size", "z_units", "z_min", "z_max")
+
+
+# 평탄화 옵션 dict 또는 None (꺼짐). previous: 증분 편집에서 이전 도로 상태에 기록된 옵션
+def corridor_options(params, previous=None):
+    enabled = params.get("flatten_corridor")
+    if enabled is None:
+        enabled = previous is not None
+    if not enabled:
+        return None
+    previous = previous or {}
+    options = {
+        "shoulder": float(params.get("corridor_shoulder", previous.get("shoulder", DEFAULT_SHOULDER))),
+        "blend": float(params.get("corridor_blend", previous.get("blend", DEFAULT_BLEND))),
+        "smoothing": float(params.get("corridor_smoothing", previous.get("smoothing", DEFAULT_SMOOTHING))),
+    }
+    if min(options.values()) < 0:
+        raise ValueError(f"Corridor sizes must be >= 0: {options}")
+    return options
+
+
+# 중심선 높이 z [rows] 를 호 길이 window (m) 이동 평균으로 평활화 (행 간격이 고르지 않아도 됨)
+def smooth_profile(centre, z, window):
+    along = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(centre, axis=0), axis=1))))
+    if window <= 0 or along[-1] <= 0:
+        return np.asarray(z, dtype=np.float64)
+    step = window / 8
+    grid = np.linspace(0.0, along[-1], max(int(np.ceil(along[-1] / step)), 1) + 1)
+    values = np.interp(grid, along, z)
+    k = 9  # window / step + 1
+    padded = np.pad(values, k // 2, mode="edge")
+    cumulative = np.concatenate(([0.0], np.cumsum(padded)))
+    smoothed = (cumulative[k:] - cumulative[:-k]) / k
+    return np.interp(along, grid, smoothed)
+
+
+# 폴리라인 (xy [n, 2], z [n]) 을 max_step 이하 조각으로 세분 (선형 보간)
+def densify(centre, z, max_step):
+    lengths = np.linalg.norm(np.diff(centre, axis=0), axis=1)
+    pieces = np.maximum(np.ceil(lengths / max_step), 1).astype(np.int64)
+    seg = np.repeat(np.arange(len(lengths)), pieces)
+    t = (np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces)) / np.repeat(pieces, pieces)
+    xy = centre[seg] + (centre[seg + 1] - centre[seg]) * t[:, None]
+    zz = z[seg] + (z[seg + 1] - z[seg]) * t
+    return np.vstack((xy, centre[-1:])), np.append(zz, z[-1])
+
+
+# 폴리라인 주변 reach (m) 안의 셀 후보 → (셀 번호, 거리, 가장 가까운 점의 목표 높이)
+# 같은 셀이 여러 조각의 창에 들어갈 수 있다 (nearest_cells 에서 하나로 줄임)
+def corridor_candidates(shape, extent, centre, z, reach):
+    ny, nx = shape
+    xmin, xmax, ymin, ymax = extent
+    cx = (xmax - xmin) / (nx - 1)
+    cy = (ymax - ymin) / (ny - 1)
+    centre, z = densify(centre, z, max(2 * reach, cx, cy))
+
+    a, b = centre[:-1], centre[1:]
+    ab = b - a
+    length2 = np.maximum((ab * ab).sum(axis=1), 1e-12)
+    lo = np.minimum(a, b) - reach
+    i0 = np.floor((lo[:, 0] - xmin) / cx).astype(np.int64)
+    j0 = np.floor((lo[:, 1] - ymin) / cy).astype(np.int64)
+    span = np.abs(ab).max(axis=0)
+    ox = np.arange(int(np.ceil((span[0] + 2 * reach) / cx)) + 2)
+    oy = np.arange(int(np.ceil((span[1] + 2 * reach) / cy)) + 2)
+
+    cells, dists, targets = [], [], []
+    chunk = max(CHUNK_CELLS // (len(ox) * len(oy)), 1)
+    for s in range(0, len(a), chunk):
+        k = slice(s, s + chunk)
+        ix = i0[k, None, None] + ox[None, None, :]
+        iy = j0[k, None, None] + oy[None, :, None]
+        px = xmin + ix * cx
+        py = ymin + iy * cy
+        dx = px - a[k, 0, None, None]
+        dy = py - a[k, 1, None, None]
+        t = np.clip((dx * ab[k, 0, None, None] + dy * ab[k, 1, None, None]) / length2[k, None, None], 0.0, 1.0)
+        d = np.hypot(dx - t * ab[k, 0, None, None], dy - t * ab[k, 1, None, None])
+        keep = (d <= reach) & (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        cells.append((iy * nx + ix)[keep])
+        dists.append(d[keep])
+        za = z[:-1][k, None, None]
+        zb = z[1:][k, None, None]
+        targets.append(np.broadcast_to(za + (zb - za) * t, d.shape)[keep])
+    return np.concatenate(cells), np.concatenate(dists), np.concatenate(targets)
+
+
+# 후보 배열들을 셀마다 거리 (values[0]) 가 가장 작은 것 하나로 줄임
+# 정렬 키 = 셀 번호 * (최대 거리 + 1) + 거리 → 정렬 한 번으로 셀 순서 + 셀 안에서 거리 순서
+def nearest_cells(cells, *values):
+    if len(cells) == 0:
+        return (cells,) + values
+    order = np.argsort(cells * (float(values[0].max()) + 1.0) + values[0])
+    cells = cells[order]
+    first = np.ones(len(cells), dtype=bool)
+    first[1:] = cells[1:] != cells[:-1]
+    return (cells[first],) + tuple(v[order][first] for v in values)
+
+
+def smoothstep(x):
+    x = np.clip(x, 0.0, 1.0)
+    return x * x * (3.0 - 2.0 * x)
+
+
+# 도로들 [(중심선 xy [rows, 2], 폭)] 의 corridor 를 평탄화한 하이트필드 사본 → (heights, 통계)
+def carve_corridors(heights, extent, roads, options):
+    start = time.perf_counter()
+    carved = np.array(heights, dtype=np.float32)
+    cells, dists, targets, cores = [], [], [], []
+    for centre, width in roads:
+        centre = np.asarray(centre, dtype=np.float64)
+        z = smooth_profile(centre, bilinear_sample(heights, extent, centre[:, 0], centre[:, 1]), options["smoothing"])
+        core = width / 2 + options["shoulder"]
+        c, d, t = corridor_candidates(heights.shape, extent, centre, z, core + options["blend"])
+        cells.append(c)
+        dists.append(d)
+        targets.append(t)
+        cores.append(np.full(len(c), core))
+    cells, dists, targets, cores = nearest_cells(*(np.concatenate(v) for v in (cells, dists, targets, cores)))
+
+    # core 안은 1, blend 폭에서 0 으로 (blend 가 0 이면 경계에서 바로 원래 지형)
+    blend = max(options["blend"], 1e-6)
+    weight = 1.0 - smoothstep((dists - cores) / blend)
+    flat = carved.reshape(-1)
+    original = flat[cells]
+    flat[cells] = original + (targets - original) * weight
+    delta = flat[cells] - original
+    return carved, {
+        "cells": int(len(cells)),
+        "max_cut": float(max(-delta.min(), 0.0)) if len(delta) else 0.0,
+        "max_fill": float(max(delta.max(), 0.0)) if len(delta) else 0.0,
+        "seconds": round(time.perf_counter() - start, 4),
+        **options,
+    }
+
+
+# 평탄화한 하이트필드를 도로 .blend 옆 sidecar 로 저장 (원본 지형 헤더의 ColorRamp 등은 그대로)
+def save_carved_heightfield(blend_path, heights, header, extent):
+    fields = {key: value for key, value in header.items() if key not in _HEADER_FIELDS}
+    return save_heightfield(blend_path, heights, extent, **fields, corridor=True)
+
+
+# 도로 정점별 draping offset [rows * PROFILE_POINTS]: 가장자리 열은 0 (지형과 맞닿음), 나머지는 DRAPE_OFFSET
+def snap_offsets(rows):
+    profile = np.full(PROFILE_POINTS, DRAPE_OFFSET, dtype=np.float32)
+    profile[[0, -1]] = 0.0
+    return np.tile(profile, rows)
@@ -0,0 +1,90 @@
+# 도로 정점을 지형 위에 올리는 draping 단계
+# Shrinkwrap PROJECT (Z=10000 에서 레이캐스트) 대신
+#   1) 지형 하이트필드 sidecar (.npy) 가 있으면 bilinear 보간으로 모든 정점을 한 번에 샘플링
+#   2) 없으면 캐시된 BVHTree 로 아래 방향 레이캐스트
+# 도로 생성 시간이 지형 면 수에 비례하지 않도록 한다.
+import numpy as np
+
+from heightfield_io import has_heightfield, load_heightfield, header_extent, bilinear_sample
+
+DRAPE_OFFSET = 0.05  # 지형 위 5cm
+
+_bvh_cache = {}
+
+
+def object_extent(obj):
+    xs = [corner[0] for corner in obj.bound_box]
+    ys = [corner[1] for corner in obj.bound_box]
+    return (min(xs), max(xs), min(ys), max(ys))
+
+
+# ===== BVHTree 폴백 =====
+def _terrain_bvh(terrain_obj):
+    import bpy  # type: ignore
+    from mathutils.bvhtree import BVHTree  # type: ignore
+
+    key = (terrain_obj.name, terrain_obj.data.as_pointer(), len(terrain_obj.data.vertices))
+    if key not in _bvh_cache:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        _bvh_cache.clear()
+        _bvh_cache[key] = BVHTree.FromObject(terrain_obj, depsgraph)
+    return _bvh_cache[key]
+
+
+def bvh_sample(terrain_obj, x, y):
+    from mathutils import Vector  # type: ignore
+
+    bvh = _terrain_bvh(terrain_obj)
+    top = max(corner[2] for corner in terrain_obj.bound_box) + 1.0
+    down = Vector((0.0, 0.0, -1.0))
+    z = np.zeros(len(x), dtype=np.float32)
+    for i, (px, py) in enumerate(zip(x, y)):
+        location, _normal, _index, _distance = bvh.ray_cast(Vector((px, py, top)), down)
+        if location is None:
+            location, _normal, _index, _distance = bvh.find_nearest(Vector((px, py, 0.0)))
+        if location is not None:
+            z[i] = location.z
+    return z
+
+
+# 하이트필드 bilinear 샘플러. grid = (x0, y0, dx, dy) 는 적응형 샘플링 (road_mesh.adaptive_rows) 의 탐침 간격 기준,
+# extent = 지형 월드 범위 (웹 좌표 0~100 변환 기준, road_params.convert_control_points)
+def heightfield_sampler(heights, extent):
+    def sampler(x, y):
+        return bilinear_sample(heights, extent, x, y)
+
+    ny, nx = heights.shape
+    sampler.grid = (extent[0], extent[2], (extent[1] - extent[0]) / (nx - 1), (extent[3] - extent[2]) / (ny - 1))
+    sampler.extent = extent
+    return sampler
+
+
+# 지형 높이 샘플러 (x, y 배열 → z 배열) 와 사용된 방식 이름
+# sampler.grid: 지형 격자 (x0, y0, dx, dy). 적응형 도로 샘플링이 격자선마다 편차를 잰다
+def terrain_sampler(terrain_obj, terrain_blend_path):
+    if has_heightfield(terrain_blend_path):
+        heights, header = load_heightfield(terrain_blend_path)
+        # 헤더가 없는 이전 sidecar 는 terrain 오브젝트 범위를 사용
+        extent = header_extent(header) if header else object_extent(terrain_obj)
+        return heightfield_sampler(heights, extent), "heightfield"
+
+    def sampler(x, y):
+        return bvh_sample(terrain_obj, x, y)
+
+    # 정규 격자 지형이라고 보고 면적 / 정점 수로 간격 추정
+    xmin, xmax, ymin, ymax = object_extent(terrain_obj)
+    cell = ((xmax - xmin) * (ymax - ymin) / max(len(terrain_obj.data.vertices), 1)) ** 0.5
+    sampler.grid = (xmin, ymin, cell, cell)
+    sampler.extent = (xmin, xmax, ymin, ymax)
+    return sampler, "bvh"
+
+
+# 메시 정점 z 를 지형 높이 + offset 으로 교체 (foreach_get/foreach_set)
+def drape_mesh(mesh, sampler, offset=DRAPE_OFFSET):
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    co[:, 2] = sampler(co[:, 0], co[:, 1]) + offset
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.update()
+    return len(co)
@@ -1,269 +1,781 @@
 import bpy  # type: ignore
-import bmesh  # type: ignore
-import mathutils  # type: ignore
 import sys
 import json
-import math
 import os
+import time
+
+# 같은 폴더의 모듈 import 경로
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+import numpy as np
+
+from road_params import WEB_EXTENT, read_road_params, read_road_edits, convert_control_points
+from road_mesh import (
+    PROFILE_POINTS,
+    curve_resolution,
+    row_count,
+    adaptive_rows,
+    needs_more_rows,
+    build_road_arrays,
+    changed_segment_spans,
+    splice_arrays,
+    save_road_state,
+    load_road_state,
+    road_state_path,
+)
+from road_uv import uv_scale_for_length, transform_mesh_uvs
+from road_drape import DRAPE_OFFSET, terrain_sampler, drape_mesh
+from road_routing import route_road
+from road_corridor import corridor_options, carve_corridors, save_carved_heightfield, snap_offsets
+from heightfield_io import has_heightfield, load_heightfield, header_extent, bilinear_sample, sidecar_paths
+from terrain_mesh import build_mesh
+from heightmap_preview import can_render_preview, render_heightmap_preview
+from render_settings import PREVIEW_RESOLUTION, render_resolution
+from profiling import Profiler, profile_path
+from blend_output import output_options, save_blend, format_save_stats
+from mesh_export import read_export_formats, quad_triangles, export_meshes
+from checkpoints import Checkpoints, checkpoint_config, file_stamps
+from result_cache import params_key, read_flag
 
-# 커맨드 라인 인자 파싱
-# blender --background --python road_generator.py -- params.json terrain.blend output.blend preview.png
-args = sys.argv[sys.argv.index("--") + 1 :]
-params_file = os.path.abspath(args[0])
-terrain_blend_path = os.path.abspath(args[1])
-output_path = os.path.abspath(args[2])
-preview_path = os.path.abspath(args[3])
-
-# 파라미터 파일 읽기
-with open(params_file, "r") as f:
-    params = json.load(f)
-
-control_points = params.get("controlPoints", [])
-road_width = params.get("width", 1.6)  # 기본 1.6m (1차선)
-
-print(f"[Road] Parameters: {params}")
-print(f"[Road] Control points: {len(control_points)}")
-print(f"[Road] Terrain file: {terrain_blend_path}")
-print(f"[Road] Output: {output_path}")
 
 # 1. Terrain 파일 로드
-print(f"[Road] Loading terrain file...")
-bpy.ops.wm.open_mainfile(filepath=terrain_blend_path)
-
-# Terrain 오브젝트 찾기
-terrain_obj = None
-for obj in bpy.data.objects:
-    if obj.type == "MESH" and "Terrain" in obj.name:
-        terrain_obj = obj
-        break
-
-if not terrain_obj:
-    print(f"[Road] ERROR: Terrain object not found!")
-    sys.exit(1)
-
-print(f"[Road] Found terrain: {terrain_obj.name}")
-
-# 2. Bezier Curve 생성
-print(f"[Road] Creating road curve...")
-curve_data = bpy.data.curves.new("RoadCurve", type="CURVE")
-curve_data.dimensions = "3D"
-
-# Spline 생성
-spline = curve_data.splines.new("BEZIER")
-spline.bezier_points.add(len(control_points) - 1)  # 첫 포인트는 이미 있음
-
-# Control points 설정 및 도로 길이 계산
-total_length = 0.0
-converted_points = []
-
-for i, point in enumerate(control_points):
-    # 좌표 변환: 웹 좌표 -> Blender 좌표 (중앙 기준)
-    # Terrain 크기: 1000m (1km) → 좌표 범위: 0-100 → -500~500
-    if isinstance(point, dict):
-        x = (point["x"] - 50) * 10  # 0-100 -> -500~500 (10배 스케일)
-        y = (point["y"] - 50) * 10
-    else:  # list 또는 tuple
-        x = (point[0] - 50) * 10
-        y = (point[1] - 50) * 10
-
-    converted_points.append((x, y))
-
-    # 이전 포인트와의 거리 계산
-    if i > 0:
-        prev_x, prev_y = converted_points[i - 1]
-        segment_length = math.sqrt((x - prev_x) ** 2 + (y - prev_y) ** 2)
-        total_length += segment_length
-
-print(f"[Road] Total road length: {total_length:.1f}m")
-
-# Control points를 Bezier curve에 설정
-# Z 좌표를 높게 설정 (투영을 위해)
-start_z = 10000  # 10km 높이에서 시작 (어떤 지형보다 높음)
-for i, (x, y) in enumerate(converted_points):
-    bp = spline.bezier_points[i]
-    bp.co = (x, y, start_z)  # 높은 곳에서 시작
-    bp.handle_left_type = "AUTO"
-    bp.handle_right_type = "AUTO"
-
-# Curve Object 생성
-curve_obj = bpy.data.objects.new("Road", curve_data)
-bpy.context.collection.objects.link(curve_obj)
-
-# 3. 동적 Curve 해상도 계산 (도로 길이 기반)
-# 목표: 2m당 1개 샘플 (1km 도로 = 500 샘플)
-target_resolution = int(total_length / 2.0)
-resolution_u = max(32, min(target_resolution, 512))  # 32~512 범위
-bevel_resolution = max(4, min(int(resolution_u / 64), 8))  # 4~8 범위
-
-print(f"[Road] Dynamic resolution: {resolution_u} (length-based)")
-curve_data.resolution_u = resolution_u
-curve_data.bevel_resolution = bevel_resolution
-
-# 4. Curve 두께 설정 (Bevel) - 평면 도로용 커스텀 프로필
-print(f"[Road] Setting road width: {road_width}m")
-
-# Bevel Object: 평면 선 프로필 생성 (11점 → 10 segments)
-bevel_curve_data = bpy.data.curves.new("RoadProfile", type="CURVE")
-bevel_curve_data.dimensions = "2D"
-bevel_spline = bevel_curve_data.splines.new("POLY")
-num_segments = 10  # 도로 폭 방향 세그먼트 수
-bevel_spline.points.add(num_segments)  # 11개 점 (10 segments)
-
-# 선 프로필 좌표 (X축 방향 평면, 균등 분할)
-half_width = road_width / 2
-for i in range(num_segments + 1):
-    x = -half_width + (i * road_width / num_segments)
-    bevel_spline.points[i].co = (x, 0, 0, 1)
-bevel_spline.use_cyclic_u = False  # 열린 선
-
-bevel_obj = bpy.data.objects.new("RoadProfile", bevel_curve_data)
-bpy.context.collection.objects.link(bevel_obj)
-
-# Curve에 bevel object 할당
-curve_data.bevel_mode = "OBJECT"
-curve_data.bevel_object = bevel_obj
-curve_data.use_fill_caps = False  # 평면이므로 cap 불필요
-
-print(f"[Road] Using flat bevel profile (2 points)")
-
-# 5. Shrinkwrap Modifier (하늘에서 지형으로 투영)
-print(f"[Road] Adding shrinkwrap modifier...")
-modifier = curve_obj.modifiers.new("Shrinkwrap", "SHRINKWRAP")
-modifier.target = terrain_obj
-modifier.wrap_method = "PROJECT"  # PROJECT 방식
-modifier.use_project_z = True
-modifier.use_negative_direction = True  # 아래로만 투영 (Z=10000 → 지형)
-modifier.use_positive_direction = False  # 위로는 투영 안함
-modifier.offset = 0.05  # 지형 위 20cm
-
-# 6. Curve를 Mesh로 변환 (UV 좌표 자동 생성됨)
-print(f"[Road] Converting curve to mesh...")
-bpy.context.view_layer.objects.active = curve_obj
-curve_obj.select_set(True)
-bpy.ops.object.convert(target="MESH")
-print(f"[Road] Curve converted to mesh with auto-generated UV")
-
-# 변환 후 active object 재설정
-bpy.context.view_layer.objects.active = curve_obj
-mesh = curve_obj.data
+# link=True 면 빈 씬에 terrain .blend 의 오브젝트(지형 / 카메라 / 조명)를 라이브러리로 링크한다.
+# 도로 .blend 에는 지형 메시가 복사되지 않고 상대 경로 참조만 저장된다 (terrain .blend 와 같은 폴더에 둘 것).
+def load_terrain(terrain_blend_path, link=False):
+    if link:
+        print(f"[Road] Linking terrain file as library...")
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        with bpy.data.libraries.load(terrain_blend_path, link=True, relative=True) as (data_from, data_to):
+            data_to.objects = list(data_from.objects)
+        scene = bpy.context.scene
+        for obj in data_to.objects:
+            if obj is None:
+                continue
+            scene.collection.objects.link(obj)
+            if obj.type == "CAMERA" and scene.camera is None:
+                scene.camera = obj
+    else:
+        print(f"[Road] Loading terrain file...")
+        bpy.ops.wm.open_mainfile(filepath=terrain_blend_path)
+
+    # Terrain 오브젝트 찾기
+    for obj in bpy.data.objects:
+        if obj.type == "MESH" and "Terrain" in obj.name:
+            print(f"[Road] Found terrain: {obj.name}")
+            return obj
+
+    raise RuntimeError("Terrain object not found!")
+
+
+# 2-5. 도로 메시 생성 (Bezier AUTO 핸들 + 평면 프로필 sweep, UV 포함)
+# Curve → Mesh 변환 대신 road_mesh 로 직접 만들어 세그먼트 ↔ 행 대응을 유지 (증분 편집용)
+# resolution: 세그먼트당 행 수 (int) 또는 세그먼트별 행 수 목록 (적응형, placement = 행 위치)
+def create_road_object(name, points, width, resolution, placement=None):
+    layout = f"resolution {resolution}" if np.ndim(resolution) == 0 else f"adaptive {len(resolution)} segments"
+    print(f"[Road] Building road mesh: {name} (width {width}m, {layout})")
+    vertices, loops, uvs, rows = build_road_arrays(points, width, resolution, placement)
+    mesh = build_mesh(name, vertices.ravel(), loops)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uvs.ravel())
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    print(f"[Road] Road mesh: {rows} rows, {len(mesh.vertices)} vertices")
+    return obj
+
+
+# 6. 도로 정점을 지형 위로 draping (지형 위 5cm)
+# sampler: 1 단계에서 만든 terrain_sampler (하이트필드 bilinear 또는 캐시된 BVHTree 레이캐스트) 를 그대로 재사용
+def drape_on_terrain(meshes, sampler, method):
+    print(f"[Road] Draping road on terrain ({method})...")
+    for mesh in meshes:
+        count = drape_mesh(mesh, sampler, DRAPE_OFFSET)
+        print(f"[Road] Draped {count} vertices")
+
+
+# 1b. 자동 경로 탐색: route (시작 / 끝 / 경유지) 만 있는 도로의 controlPoints 를
+# terrain 하이트필드 sidecar 위의 최소 비용 (경사 + 곡률) 경로로 채운다. 반환: {이름: 탐색 통계}
+# max_grade 안의 경로가 없으면 오류 (allow_steep 이면 넘는 경로 + 경고)
+def route_roads(roads, terrain_blend_path):
+    pending = [road for road in roads if road["route"]]
+    if not pending:
+        return {}
+    if not has_heightfield(terrain_blend_path):
+        raise RuntimeError("Road routing needs the terrain heightfield sidecar (regenerate the terrain)")
+    heights, header = load_heightfield(terrain_blend_path)
+    extent = header_extent(header)
+    routes = {}
+    for road in pending:
+        road["controlPoints"], stats = route_road(heights, extent, road["route"])
+        routes[road["name"]] = stats
+        print(f"[Road] {road['name']}: routed {stats['length']:.1f}m through {stats['control_points']} control points "
+              f"(max grade {stats['max_grade']:.2f}, {stats['steep_fraction']:.1%} over {road['route']['max_grade']}) "
+              f"in {stats['seconds']:.2f}s")
+        if stats["fallback"]:
+            print(f"[Road] WARNING: {road['name']}: no route within max_grade {road['route']['max_grade']}, "
+                  f"allow_steep route has sections up to grade {stats['max_grade']:.2f}")
+        elif stats["steep_fraction"] > 0:
+            print(f"[Road] WARNING: {road['name']}: {stats['steep_fraction']:.1%} of the routed centreline "
+                  f"exceeds max_grade {road['route']['max_grade']} (max {stats['max_grade']:.2f})")
+    return routes
+
+
+# 6b. 도로 corridor 평탄화 + 도로 가장자리를 지형에 snap
+# 원본 terrain 하이트필드 sidecar 에서 매번 다시 계산하므로 증분 편집에서도 이전 corridor 가 남지 않는다.
+# options 가 None 이면 (평탄화했던 도로 파일에서 끈 경우) 지형을 원본 높이로 되돌린다.
+# 반환: 통계 dict (적용하지 않았으면 None)
+def flatten_corridors(road_states, terrain_obj, terrain_blend_path, output_path, options):
+    if not has_heightfield(terrain_blend_path):
+        print(f"[Road] WARNING: Corridor flattening needs the terrain heightfield sidecar, skipped")
+        return None
+    heights, header = load_heightfield(terrain_blend_path)
+    mesh = terrain_obj.data
+    if terrain_obj.library is not None or mesh.library is not None or len(mesh.vertices) != heights.size:
+        print(f"[Road] WARNING: Corridor flattening needs a single local terrain grid (not tiled / linked), skipped")
+        return None
+
+    extent = header_extent(header)
+    stats = None
+    if options is None:
+        print(f"[Road] Restoring terrain heights (corridor flattening off)")
+        carved = np.asarray(heights, dtype=np.float32)
+    else:
+        carved, stats = carve_corridors(heights, extent, road_centrelines(road_states), options)
+        save_carved_heightfield(output_path, carved, header, extent)
+        print(f"[Road] Corridor flattened: {stats['cells']} cells, cut {stats['max_cut']:.2f}m / "
+              f"fill {stats['max_fill']:.2f}m in {stats['seconds']:.2f}s")
+    write_terrain_heights(mesh, carved)
+
+    # 편집된 지형에 도로 다시 올리기 (가장자리 열은 offset 0 → 지형과 맞닿음)
+    sampler = lambda x, y: bilinear_sample(carved, extent, x, y)
+    for name in road_states:
+        road_mesh = bpy.data.objects[name].data
+        rows = len(road_mesh.vertices) // PROFILE_POINTS
+        drape_mesh(road_mesh, sampler, DRAPE_OFFSET if options is None else snap_offsets(rows))
+    return stats
+
+
+# 지형 그리드 메시 정점 z 를 하이트필드로 교체 (정점 순서 = 하이트필드 행 우선 [y, x])
+def write_terrain_heights(mesh, heights):
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co[2::3] = heights.ravel()
+    mesh.vertices.foreach_set("co", co)
+    mesh.update()
 
-# 7. UV 좌표 조정: 90도 회전 + Y축 동적 스케일
-# 동적 스케일 계산: 도로 길이 기반
-# 기준: 1966.8m → 200x 스케일 (텍스처 반복)
-# 공식: scale = (total_length / 10.0) → 도로 10m당 텍스처 1회 반복
-y_scale_factor = total_length / 10.0 * 6.0
 
-print(
-    f"[Road] Adjusting UV coordinates (rotate 90° + scale Y {y_scale_factor:.1f}x)..."
-)
-bpy.ops.object.mode_set(mode="EDIT")
-bm = bmesh.from_edit_mesh(mesh)
-uv_layer = bm.loops.layers.uv.active
-
-if uv_layer:
-    # 모든 UV 좌표에 대해 변환 적용
-    for face in bm.faces:
-        for loop in face.loops:
-            uv = loop[uv_layer].uv
-            u, v = uv.x, uv.y
-
-            # 90도 회전: (u, v) -> (-v, u)
-            # 그리고 Y축 동적 스케일 (도로 길이 기반)
-            uv.x = -v
-            uv.y = u * y_scale_factor
+# 7. UV 좌표 조정: 90도 회전 + Y축 동적 스케일
+# bmesh 루프 대신 foreach_get/foreach_set + NumPy 로 한 번에 변환 (OBJECT 모드 유지)
+def adjust_road_uvs(meshes, total_lengths):
+    y_scale_factors = [uv_scale_for_length(length) for length in total_lengths]
+    for y_scale_factor in y_scale_factors:
+        print(
+            f"[Road] Adjusting UV coordinates (rotate 90° + scale Y {y_scale_factor:.1f}x)..."
+        )
 
-    bmesh.update_edit_mesh(mesh)
-    print(f"[Road] UV rotated 90° and scaled Y by {y_scale_factor:.1f}x (dynamic)")
+    transformed = transform_mesh_uvs(meshes, y_scale_factors)
+    print(f"[Road] UV rotated 90° and scaled Y (dynamic) on {transformed} mesh(es)")
 
-bm.free()
-bpy.ops.object.mode_set(mode="OBJECT")
 
 # 8. 이미지 텍스처 기반 도로 Material 생성
-print(f"[Road] Creating texture-based road material...")
-mat = bpy.data.materials.new(name="RoadMaterial")
-mat.use_nodes = True
-nodes = mat.node_tree.nodes
-links = mat.node_tree.links
-
-# 기존 노드 제거
-nodes.clear()
-
-# === Output 노드 ===
-mat_output = nodes.new("ShaderNodeOutputMaterial")
-mat_output.location = (600, 0)
-
-# === Principled BSDF ===
-bsdf = nodes.new("ShaderNodeBsdfPrincipled")
-bsdf.location = (400, 0)
-links.new(bsdf.outputs["BSDF"], mat_output.inputs["Surface"])
-
-# === Texture Coordinate (UV 사용) ===
-tex_coord = nodes.new("ShaderNodeTexCoord")
-tex_coord.location = (-400, 0)
-
-# === Image Texture (도로 텍스처) ===
-texture_path = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-    "assets",
-    "roadtexture.jpg",
-)
-texture_path = os.path.abspath(texture_path)
-print(f"[Road] Loading texture: {texture_path}")
-
-if os.path.exists(texture_path):
-    # 이미지 로드
-    img = bpy.data.images.load(texture_path)
-    img_texture = nodes.new("ShaderNodeTexImage")
-    img_texture.image = img
-    img_texture.location = (-200, 0)
-
-    # UV Coordinate → Image Texture (Mapping 노드 없이 직접 연결)
-    links.new(tex_coord.outputs["UV"], img_texture.inputs["Vector"])
-
-    # BSDF에 연결
-    links.new(img_texture.outputs["Color"], bsdf.inputs["Base Color"])
-    print(f"[Road] Texture loaded successfully (no mapping node)")
-else:
-    print(f"[Road] WARNING: Texture not found at {texture_path}")
-    # 기본 회색으로 설정
-    bsdf.inputs["Base Color"].default_value = (0.1, 0.1, 0.1, 1.0)
-
-# 도로 재질 속성
-bsdf.inputs["Roughness"].default_value = 0.85  # 거친 아스팔트
-bsdf.inputs["Specular IOR Level"].default_value = 0.3  # 약간의 반사
-
-print(f"[Road] Material created")
-
-# Material 할당
-if curve_obj.data.materials:
-    curve_obj.data.materials[0] = mat
-else:
-    curve_obj.data.materials.append(mat)
+def create_road_material():
+    print(f"[Road] Creating texture-based road material...")
+    mat = bpy.data.materials.new(name="RoadMaterial")
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    # 기존 노드 제거
+    nodes.clear()
+
+    # === Output 노드 ===
+    mat_output = nodes.new("ShaderNodeOutputMaterial")
+    mat_output.location = (600, 0)
+
+    # === Principled BSDF ===
+    bsdf = nodes.new("ShaderNodeBsdfPrincipled")
+    bsdf.location = (400, 0)
+    links.new(bsdf.outputs["BSDF"], mat_output.inputs["Surface"])
+
+    # === Texture Coordinate (UV 사용) ===
+    tex_coord = nodes.new("ShaderNodeTexCoord")
+    tex_coord.location = (-400, 0)
+
+    # === Image Texture (도로 텍스처) ===
+    texture_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "assets",
+        "roadtexture.jpg",
+    )
+    texture_path = os.path.abspath(texture_path)
+    print(f"[Road] Loading texture: {texture_path}")
+
+    if os.path.exists(texture_path):
+        # 이미지 로드
+        img = bpy.data.images.load(texture_path)
+        img_texture = nodes.new("ShaderNodeTexImage")
+        img_texture.image = img
+        img_texture.location = (-200, 0)
+
+        # UV Coordinate → Image Texture (Mapping 노드 없이 직접 연결)
+        links.new(tex_coord.outputs["UV"], img_texture.inputs["Vector"])
+
+        # BSDF에 연결
+        links.new(img_texture.outputs["Color"], bsdf.inputs["Base Color"])
+        print(f"[Road] Texture loaded successfully (no mapping node)")
+    else:
+        print(f"[Road] WARNING: Texture not found at {texture_path}")
+        # 기본 회색으로 설정
+        bsdf.inputs["Base Color"].default_value = (0.1, 0.1, 0.1, 1.0)
+
+    # 도로 재질 속성
+    bsdf.inputs["Roughness"].default_value = 0.85  # 거친 아스팔트
+    bsdf.inputs["Specular IOR Level"].default_value = 0.3  # 약간의 반사
+
+    print(f"[Road] Material created")
+    return mat
+
+
+def assign_material(obj, mat):
+    # Material 할당
+    if obj.data.materials:
+        obj.data.materials[0] = mat
+    else:
+        obj.data.materials.append(mat)
+
 
 # 9. Top View 렌더링
-print(f"[Road] Rendering top view...")
-bpy.context.scene.render.engine = "BLENDER_EEVEE_NEXT"
-bpy.context.scene.render.resolution_x = 1024
-bpy.context.scene.render.resolution_y = 1024
-bpy.context.scene.render.filepath = preview_path
-
-# 카메라가 이미 있는지 확인 (terrain 파일에서 로드된 경우 이미 존재)
-camera = bpy.context.scene.camera
-if not camera:
-    # Terrain 크기: 1000m → 카메라 높이: 1800m
-    bpy.ops.object.camera_add(location=(0, 0, 1800))
-    camera = bpy.context.active_object
-    camera.rotation_euler = (0, 0, 0)
-    bpy.context.scene.camera = camera
-
-# Far clip plane 설정 (기존 카메라든 새 카메라든 모두 적용)
-camera.data.clip_end = 10000  # 충분히 멀리
-
-bpy.ops.render.render(write_still=True)
-
-# 10. .blend 파일 저장
-print(f"[Road] Saving blend file...")
-bpy.ops.wm.save_as_mainfile(filepath=output_path)
-
-print(f"[Road] SUCCESS: Road created at {output_path}")
-print(f"[Road] Preview saved to {preview_path}")
+def render_top_view(preview_path, resolution=PREVIEW_RESOLUTION):
+    print(f"[Road] Rendering top view...")
+    bpy.context.scene.render.engine = "BLENDER_EEVEE_NEXT"
+    bpy.context.scene.render.resolution_x = resolution
+    bpy.context.scene.render.resolution_y = resolution
+    bpy.context.scene.render.filepath = preview_path
+
+    # 카메라가 이미 있는지 확인 (terrain 파일에서 로드된 경우 이미 존재)
+    camera = bpy.context.scene.camera
+    if not camera:
+        # Terrain 크기: 1000m → 카메라 높이: 1800m
+        bpy.ops.object.camera_add(location=(0, 0, 1800))
+        camera = bpy.context.active_object
+        camera.rotation_euler = (0, 0, 0)
+        bpy.context.scene.camera = camera
+
+    # Far clip plane 설정 (기존 카메라든 새 카메라든 모두 적용)
+    camera.data.clip_end = 10000  # 충분히 멀리
+
+    bpy.ops.render.render(write_still=True)
+
+
+# 기존 도로 메시에서 바뀐 세그먼트 구간의 행만 다시 계산해서 덮어쓴다 (정점 + 지형 높이 + UV)
+# 레이아웃(resolution, 행 수)은 이전 상태를 그대로 사용하므로 나머지 행/면은 손대지 않는다.
+# 적응형 레이아웃은 세그먼트별 행 수는 유지하고 행 위치만 새 곡률 / 지형에 맞춰 다시 배치한다.
+def splice_road(obj, road_state, points, spans, sampler):
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    uv_data = mesh.uv_layers.active.data
+    uvs = np.empty(len(uv_data) * 2, dtype=np.float32)
+    uv_data.foreach_get("uv", uvs)
+    uvs = uvs.reshape(-1, 2)
+
+    rows = splice_arrays(co, uvs, road_state, points, spans, sampler, DRAPE_OFFSET)
+
+    mesh.vertices.foreach_set("co", co.ravel())
+    uv_data.foreach_set("uv", uvs.ravel())
+    mesh.update()
+    return rows
+
+
+def remove_road_object(obj):
+    mesh = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+
+
+# 새로 만든 도로들 (전체 생성): draping + UV 조정을 한 번에 처리
+# 반환: 도로 상태 sidecar 에 기록할 {name: 상태}
+def finish_new_roads(built, sampler, method):
+    meshes = [obj.data for obj, _road in built]
+    drape_on_terrain(meshes, sampler, method)
+    adjust_road_uvs(meshes, [road["length"] for _obj, road in built])
+    return {
+        road["name"]: {
+            "controlPoints": road["controlPoints"],
+            "width": road["width"],
+            "maxError": road["maxError"],
+            "resolution": road["resolution"],
+            "rows": road["rows"],
+            "length": road["length"],
+            "uv_scale": uv_scale_for_length(road["length"]),
+        }
+        for _obj, road in built
+    }
+
+
+# 행 레이아웃 → (resolution, 행 위치)
+# maxError > 0 이면 곡률 + 지형 높이 변화 기반 적응형 (세그먼트별 행 수 목록), 아니면 길이 기반 고정 해상도
+def road_resolution(road, points, total_length, sampler=None):
+    if road["maxError"] <= 0:
+        return curve_resolution(total_length), None
+    grid = sampler.grid if sampler is not None else None
+    counts, placement, error = adaptive_rows(points, road["width"], road["maxError"], sampler, terrain_grid=grid)
+    uniform_rows = row_count(len(points), curve_resolution(total_length))
+    print(f"[Road] Adaptive sampling (max error {road['maxError']}m, measured {error:.3f}m): "
+          f"{int(counts.sum()) + 1} rows (fixed resolution: {uniform_rows})")
+    return counts.tolist(), placement
+
+
+# 도로 하나의 메시 + Material 생성 → (오브젝트, 결과 dict)
+# sampler: 지형 높이 샘플러 (적응형 샘플링에서 경사 변화 측정, 없으면 평면 곡률만)
+def build_road(road, mat, sampler=None):
+    extent = sampler.extent if sampler is not None else WEB_EXTENT
+    converted_points, total_length = convert_control_points(road["controlPoints"], extent)
+    print(f"[Road] Total road length: {total_length:.1f}m")
+    points = np.asarray(converted_points)
+    resolution, placement = road_resolution(road, points, total_length, sampler)
+    obj = create_road_object(road["name"], points, road["width"], resolution, placement)
+    assign_material(obj, mat)
+    return obj, {
+        **road,
+        "length": total_length,
+        "resolution": resolution,
+        "rows": len(obj.data.vertices) // PROFILE_POINTS,
+    }
+
+
+def _road_summary(road, seconds, mode):
+    return {
+        "name": road["name"],
+        "length": road["length"],
+        "width": road["width"],
+        "mode": mode,
+        "seconds": seconds,
+    }
+
+
+# numpy 미리보기용 도로 중심선 [(xy [rows, 2], 폭), ...] (프로필 가운데 정점 열)
+def road_centrelines(road_states):
+    centrelines = []
+    for name, road in road_states.items():
+        mesh = bpy.data.objects[name].data
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        centre = co.reshape(-1, PROFILE_POINTS, 3)[:, PROFILE_POINTS // 2, :2]
+        centrelines.append((centre, road["width"]))
+    return centrelines
+
+
+# 도로 메시 → mesh_export 용 dict 목록 (foreach_get 버퍼 복사만, 익스포터 없음)
+# 도로 UV 는 정점마다 하나로 정해지므로 (u = 진행 방향, v = 폭 방향) loop UV 를 정점 UV 로 옮긴다.
+def road_export_meshes(road_states):
+    meshes = []
+    for name in road_states:
+        mesh = bpy.data.objects[name].data
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+        normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertex_normals.foreach_get("vector", normals)
+        loops = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+        loop_uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", loop_uv)
+
+        uvs = np.zeros((len(mesh.vertices), 2), dtype=np.float32)
+        uvs[loops] = loop_uv.reshape(-1, 2)
+        meshes.append({
+            "name": name,
+            "positions": positions.reshape(-1, 3),
+            "indices": quad_triangles(loops),
+            "normals": normals.reshape(-1, 3),
+            "uvs": uvs,
+        })
+    return meshes
+
+
+# 작업 체크포인트 (작업 id 별 디렉터리). 키: 파라미터 + terrain .blend / 하이트필드 sidecar (+ 증분 편집의 기준 도로) 의
+# 크기 / 수정 시각 → 재시도 전에 지형을 다시 만들었으면 이전 지오메트리로 재개하지 않는다.
+def road_checkpoints(params, terrain_blend_path, output_path):
+    inputs = [terrain_blend_path, *sidecar_paths(terrain_blend_path)]
+    if params.get("baseRoad"):
+        inputs += [params["baseRoad"], road_state_path(params["baseRoad"])]
+    key = params_key({**params, "terrain": terrain_blend_path, "inputs": file_stamps(inputs)}, "road")
+    return Checkpoints(*checkpoint_config(params, output_path), key)
+
+
+# 8b. 지오메트리 체크포인트: 도로 / draping / corridor 까지 끝낸 중간 .blend (copy=True) + _finish 에 넘길 데이터
+# corridor 평탄화를 했으면 도로 .blend 옆에 쓴 하이트필드 sidecar 도 함께 검증
+def save_geometry_checkpoint(checkpoints, output_path, profiler, data):
+    with profiler.phase("checkpoint"):
+        files = list(sidecar_paths(output_path)) if data["corridor"] else []
+        if checkpoints.enabled:
+            geometry_path = checkpoints.path("geometry", ".blend")
+            bpy.ops.wm.save_as_mainfile(filepath=geometry_path, copy=True)
+            files.append(geometry_path)
+        checkpoints.save("geometry", files, data)
+
+
+# 이전 시도가 지오메트리 단계를 끝냈으면 그 .blend 를 열고 렌더 / 저장 / 내보내기만 다시 한다
+def resume_from_checkpoint(checkpoints, params, output_path, preview_path, job_start, profiler):
+    print(f"[Road] Resuming from checkpoint: {checkpoints.directory}")
+    with profiler.phase("checkpoint_restore"):
+        bpy.ops.wm.open_mainfile(filepath=checkpoints.path("geometry", ".blend"))
+    data = checkpoints.data("geometry")
+    return _finish(
+        output_path,
+        preview_path,
+        data["terrain"],
+        data["road_results"],
+        data["road_states"],
+        job_start,
+        params.get("preview_mode", "eevee"),
+        render_resolution(params),
+        profiler,
+        output_options(params),
+        read_export_formats(params),
+        data["corridor"],
+        checkpoints,
+        **data["extra"],
+        resumed=True,
+    )
+
+
+def _finish(
+    output_path,
+    preview_path,
+    terrain_blend_path,
+    road_results,
+    road_states,
+    job_start,
+    preview_mode,
+    preview_resolution,
+    profiler,
+    save_options,
+    export_formats,
+    corridor,
+    checkpoints,
+    **extra,
+):
+    # 9. Top View 렌더링 (1회)
+    # preview_mode == "numpy": 지형 하이트필드 음영 + 도로 중심선을 NumPy 로 그려 PNG 저장 (렌더 엔진 없음)
+    # corridor 평탄화를 했으면 도로 .blend 옆의 편집된 하이트필드를 사용
+    # 이전 시도가 렌더까지 끝냈으면 (저장 / 내보내기 실패) preview 재사용
+    stage_start = time.perf_counter()
+    heights_blend_path = output_path if corridor else terrain_blend_path
+    if checkpoints.valid("preview"):
+        print(f"[Road] Preview restored from checkpoint: {preview_path}")
+    else:
+        with profiler.phase("render"):
+            if preview_mode == "numpy" and can_render_preview(heights_blend_path):
+                print(f"[Road] Rendering top view from heightfield (numpy)...")
+                render_heightmap_preview(
+                    heights_blend_path, preview_path, roads=road_centrelines(road_states), resolution=preview_resolution
+                )
+            else:
+                render_top_view(preview_path, preview_resolution)
+        checkpoints.save("preview", [preview_path])
+    render_seconds = time.perf_counter() - stage_start
+
+    # 10. .blend 파일 저장 (1회, 고아 데이터블록 정리 + 옵션 압축) + 증분 편집용 도로 상태
+    print(f"[Road] Saving blend file...")
+    with profiler.phase("save"):
+        save_stats = save_blend(output_path, **save_options)
+        corridor_state = {key: corridor[key] for key in ("shoulder", "blend", "smoothing")} if corridor else None
+        state_path = save_road_state(output_path, terrain_blend_path, road_states, corridor_state)
+    print(f"[Road] Blend saved: {format_save_stats(save_stats)}")
+
+    # 11. 웹용 메시 내보내기 (GLB / 원시 버퍼, 옵션)
+    exports = {}
+    if export_formats:
+        with profiler.phase("export"):
+            exports = export_meshes(output_path, road_export_meshes(road_states), export_formats)
+        for fmt, stats in exports.items():
+            print(f"[Road] Export {fmt}: {stats['bytes'] / 1024:.1f}KB in {stats['seconds']:.3f}s")
+            profiler.output(f"export_{fmt}", stats["path"])
+    profiler.output("blend", output_path)
+    profiler.output("preview", preview_path)
+    profiler.output("state", state_path)
+
+    # 성공: 이 작업의 체크포인트 삭제
+    checkpoints.clear()
+
+    total_seconds = time.perf_counter() - job_start
+    total_length = sum(r["length"] for r in road_results)
+    print(f"[Road] Render ({preview_mode}): {render_seconds:.2f}s")
+    print(f"[Road] Total: {len(road_results)} road(s), {total_length:.1f}m in {total_seconds:.2f}s")
+    print(f"[Road] SUCCESS: Road created at {output_path}")
+    print(f"[Road] Preview saved to {preview_path}")
+    return {
+        "blend": output_path,
+        "preview": preview_path,
+        "state": state_path,
+        "length": total_length,
+        "roads": road_results,
+        "seconds": total_seconds,
+        "blend_output": save_stats,
+        "exports": exports,
+        "corridor": corridor,
+        **extra,
+        "profile": profiler.emit(),
+    }
+
+
+# 파라미터 + terrain .blend → 도로 .blend + preview. 영구 워커에서도 호출된다.
+# params 에 "roads" 목록이 있으면 한 번의 terrain 로드 / 렌더 / 저장으로 여러 도로를 생성
+# params 에 "baseRoad" (이전 도로 .blend) 가 있으면 바뀐 세그먼트만 다시 만드는 증분 편집
+# params["link_terrain"] 이 True 면 지형을 복사하지 않고 terrain .blend 를 라이브러리로 링크
+def generate_road(params, terrain_blend_path, output_path, preview_path):
+    if params.get("baseRoad"):
+        return edit_roads(params, os.path.abspath(params["baseRoad"]), output_path, preview_path)
+
+    roads = read_road_params(params)
+
+    print(f"[Road] Parameters: {params}")
+    print(f"[Road] Roads: {len(roads)}")
+    print(f"[Road] Terrain file: {terrain_blend_path}")
+    print(f"[Road] Output: {output_path}")
+    job_start = time.perf_counter()
+    profiler = Profiler("road_generator", profile_path(params, output_path))
+
+    # 0. 재시도면 체크포인트에서 재개
+    checkpoints = road_checkpoints(params, terrain_blend_path, output_path)
+    if checkpoints.valid("geometry"):
+        return resume_from_checkpoint(checkpoints, params, output_path, preview_path, job_start, profiler)
+
+    # 1. Terrain 파일 로드 (모든 도로가 공유)
+    with profiler.phase("load_terrain"):
+        terrain_obj = load_terrain(terrain_blend_path, link=read_flag(params, "link_terrain", False))
+        sampler, method = terrain_sampler(terrain_obj, terrain_blend_path)
+
+    # 1b. 자동 경로 탐색 (route 만 있는 도로)
+    with profiler.phase("routing"):
+        routes = route_roads(roads, terrain_blend_path)
+
+    # 공유 데이터블록: Material / 이미지 1개
+    with profiler.phase("material"):
+        mat = create_road_material()
+
+    built = []
+    road_results = []
+    for road in roads:
+        road_start = time.perf_counter()
+        print(f"[Road] {road['name']}: {len(road['controlPoints'])} control points, width {road['width']}m")
+        if len(road["controlPoints"]) < 2:
+            print(f"[Road] WARNING: {road['name']} skipped (needs at least 2 control points)")
+            continue
+
+        # 2-5. 도로 메시 + 8. Material
+        with profiler.phase("road_mesh"):
+            obj, built_road = build_road(road, mat, sampler)
+            profiler.count(vertices=len(obj.data.vertices), faces=len(obj.data.polygons))
+        built.append((obj, built_road))
+        road_results.append(_road_summary(built_road, time.perf_counter() - road_start, "built"))
+
+    if not built:
+        raise RuntimeError("No road with at least 2 control points")
+
+    # 6-7. 지형 draping + UV 조정 (모든 도로를 한 번에)
+    stage_start = time.perf_counter()
+    with profiler.phase("drape_uv"):
+        road_states = finish_new_roads(built, sampler, method)
+    shared_seconds = time.perf_counter() - stage_start
+
+    for r in road_results:
+        print(f"[Road] {r['name']}: {r['length']:.1f}m built in {r['seconds']:.2f}s")
+    print(f"[Road] Drape + UV for {len(built)} road(s): {shared_seconds:.2f}s")
+
+    # 6b. corridor 평탄화 (옵션)
+    corridor = None
+    options = corridor_options(params)
+    if options:
+        with profiler.phase("corridor"):
+            corridor = flatten_corridors(road_states, terrain_obj, terrain_blend_path, output_path, options)
+
+    geometry = {
+        "terrain": terrain_blend_path,
+        "road_results": road_results,
+        "road_states": road_states,
+        "corridor": corridor,
+        "extra": {"routes": routes},
+    }
+    save_geometry_checkpoint(checkpoints, output_path, profiler, geometry)
+
+    return _finish(
+        output_path,
+        preview_path,
+        terrain_blend_path,
+        road_results,
+        road_states,
+        job_start,
+        params.get("preview_mode", "eevee"),
+        render_resolution(params),
+        profiler,
+        output_options(params),
+        read_export_formats(params),
+        corridor,
+        checkpoints,
+        routes=routes,
+    )
+
+
+# 증분 편집: 이전 도로 .blend (지형 포함) 를 열고 제어점이 바뀐 구간만 다시 만든다.
+#   - 제어점 수 / 폭이 같으면: 영향을 받는 세그먼트의 행만 splice (편집 크기에 비례)
+#   - 제어점 수 / 폭이 바뀌었거나 새 도로면: 해당 도로만 전체 재생성
+def edit_roads(params, base_road_path, output_path, preview_path):
+    state = load_road_state(base_road_path)
+    if state is None:
+        raise RuntimeError(f"No road state found for {base_road_path} (run a full road build first)")
+    previous = state["roads"]
+    terrain_blend_path = state["terrain"]
+    roads = read_road_edits(params, previous)
+
+    print(f"[Road] Incremental edit of {base_road_path}")
+    print(f"[Road] Roads: {len(roads)}")
+    print(f"[Road] Output: {output_path}")
+    job_start = time.perf_counter()
+    profiler = Profiler("road_generator", profile_path(params, output_path))
+
+    # 0. 재시도면 체크포인트에서 재개
+    checkpoints = road_checkpoints(params, terrain_blend_path, output_path)
+    if checkpoints.valid("geometry"):
+        return resume_from_checkpoint(checkpoints, params, output_path, preview_path, job_start, profiler)
+
+    # 1. 이전 도로 파일 로드 (지형 + 기존 도로 메시)
+    with profiler.phase("load_terrain"):
+        terrain_obj = load_terrain(base_road_path)
+        sampler, method = terrain_sampler(terrain_obj, terrain_blend_path)
+    print(f"[Road] Terrain sampler: {method}")
+    with profiler.phase("routing"):
+        routes = route_roads(roads, terrain_blend_path)
+
+    mat = bpy.data.materials.get("RoadMaterial")
+    names = {road["name"] for road in roads}
+    for name in previous:
+        if name not in names and bpy.data.objects.get(name):
+            print(f"[Road] Removing road: {name}")
+            remove_road_object(bpy.data.objects[name])
+
+    road_states = {}
+    road_results = []
+    built = []
+    for road in roads:
+        road_start = time.perf_counter()
+        name = road["name"]
+        prev = previous.get(name)
+        obj = bpy.data.objects.get(name)
+        if len(road["controlPoints"]) < 2:
+            print(f"[Road] WARNING: {name} skipped (needs at least 2 control points)")
+            continue
+
+        converted_points, total_length = convert_control_points(road["controlPoints"], sampler.extent)
+        points = np.asarray(converted_points)
+        spans = None
+        if prev and obj and prev["width"] == road["width"]:
+            old_points, _ = convert_control_points(prev["controlPoints"], sampler.extent)
+            spans = changed_segment_spans(old_points, points)
+            # 적응형 레이아웃: 편집 구간에 기존보다 훨씬 많은 행이 필요하면 재생성
+            if spans and road["maxError"] > 0 and np.ndim(prev["resolution"]) == 1:
+                counts, _placement, _error = adaptive_rows(
+                    points, road["width"], road["maxError"], sampler, terrain_grid=sampler.grid
+                )
+                if needs_more_rows(prev["resolution"], counts, spans):
+                    print(f"[Road] {name}: edit needs more rows than the current layout")
+                    spans = None
+
+        if spans is None:
+            # 레이아웃이 바뀌는 편집 → 이 도로만 전체 재생성
+            print(f"[Road] {name}: layout changed, rebuilding")
+            if obj:
+                remove_road_object(obj)
+            with profiler.phase("road_mesh"):
+                if mat is None:
+                    mat = create_road_material()
+                obj, built_road = build_road(road, mat, sampler)
+                profiler.count(vertices=len(obj.data.vertices), faces=len(obj.data.polygons))
+            built.append((obj, built_road))
+            road_results.append(_road_summary(built_road, time.perf_counter() - road_start, "rebuilt"))
+            continue
+
+        # resolution / uv_scale 는 이전 값 유지 (행 레이아웃과 편집 구간 밖 UV 보존)
+        road_states[name] = {
+            **prev,
+            "controlPoints": road["controlPoints"],
+            "maxError": road["maxError"],
+            "length": total_length,
+        }
+        if not spans:
+            road_results.append(_road_summary(road_states[name], time.perf_counter() - road_start, "unchanged"))
+            continue
+
+        with profiler.phase("splice"):
+            rows = splice_road(obj, road_states[name], points, spans, sampler)
+            profiler.count(rows=rows)
+        seconds = time.perf_counter() - road_start
+        print(f"[Road] {name}: spliced {rows}/{prev['rows']} rows in {len(spans)} span(s), {seconds * 1000:.1f}ms")
+        road_results.append({**_road_summary(road_states[name], seconds, "spliced"), "rows": rows})
+
+    if built:
+        with profiler.phase("drape_uv"):
+            road_states.update(finish_new_roads(built, sampler, method))
+
+    # corridor 평탄화: 이전 도로 파일 설정을 이어받고, 켜져 있던 것을 끄면 원본 지형으로 복원
+    corridor = None
+    options = corridor_options(params, state.get("corridor"))
+    if options or state.get("corridor"):
+        with profiler.phase("corridor"):
+            corridor = flatten_corridors(road_states, terrain_obj, terrain_blend_path, output_path, options)
+
+    geometry = {
+        "terrain": terrain_blend_path,
+        "road_results": road_results,
+        "road_states": road_states,
+        "corridor": corridor,
+        "extra": {"routes": routes, "incremental": True},
+    }
+    save_geometry_checkpoint(checkpoints, output_path, profiler, geometry)
+
+    return _finish(
+        output_path,
+        preview_path,
+        terrain_blend_path,
+        road_results,
+        road_states,
+        job_start,
+        params.get("preview_mode", "eevee"),
+        render_resolution(params),
+        profiler,
+        output_options(params),
+        read_export_formats(params),
+        corridor,
+        checkpoints,
+        routes=routes,
+        incremental=True,
+    )
+
+
+def main():
+    # 커맨드 라인 인자 파싱
+    # blender --background --python road_generator.py -- params.json terrain.blend output.blend preview.png
+    args = sys.argv[sys.argv.index("--") + 1 :]
+    params_file = os.path.abspath(args[0])
+    terrain_blend_path = os.path.abspath(args[1])
+    output_path = os.path.abspath(args[2])
+    preview_path = os.path.abspath(args[3])
+
+    # 파라미터 파일 읽기
+    with open(params_file, "r") as f:
+        params = json.load(f)
+
+    try:
+        generate_road(params, terrain_blend_path, output_path, preview_path)
+    except (RuntimeError, ValueError) as e:
+        print(f"[Road] ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
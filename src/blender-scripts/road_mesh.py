@@ -0,0 +1,463 @@
+# 도로 메시를 NumPy 로 직접 생성 (bpy 의존성 없음)
+#
+# Bezier curve (AUTO 핸들) + 평면 bevel 프로필을 Mesh 로 변환하던 과정을 배열 연산으로 재현한다.
+# 세그먼트 ↔ 메시 행(row) 대응을 직접 관리하므로 제어점 하나를 옮겼을 때
+# 영향을 받는 세그먼트의 행만 다시 계산해서 기존 메시에 덮어쓸 수 있다.
+#
+# 메시 레이아웃 (도로 하나)
+#   행(row):  곡선 샘플. 세그먼트 j 는 counts[j] 개 행 (offsets[j] ~ offsets[j+1], 양 끝 행은 이웃과 공유)
+#             counts 는 길이 기반 고정 해상도 (curve_resolution, 세그먼트 안에서 균등한 t) 또는
+#             곡률 / 지형 기반 적응형 (adaptive_rows, 굽은 곳에 행이 몰리는 비균등 t)
+#   정점:     row * PROFILE_POINTS + i      (i = 도로 폭 방향 0..10)
+#   면:       row * PROFILE_SEGMENTS + i    (행 row ~ row+1 사이 쿼드), loop = 면 * 4
+#   UV:       u = 도로 진행 방향 (0~1), v = 폭 방향 (0~1)  (Blender curve 변환과 같은 규칙)
+import json
+import os
+
+import numpy as np
+
+from road_uv import rotate_scale_uvs
+
+PROFILE_SEGMENTS = 10  # 도로 폭 방향 세그먼트 수
+PROFILE_POINTS = PROFILE_SEGMENTS + 1
+AUTO_HANDLE_FACTOR = 2.5614  # Blender AUTO 핸들 길이 계수 (BKE_nurb_handle_calc)
+
+STATE_VERSION = 1
+
+# 적응형 샘플링
+PROBE_SPACING = 2.0  # 곡률 / 편차를 재는 조밀 샘플 최대 간격 (m). 지형이 있으면 셀 크기의 절반 이하
+MIN_SEGMENT_PROBES = 4
+GRID_PROBES = 8  # 지형 셀 한 변당 probe 수 (셀 안의 bilinear 비틀림 곡률까지 잴 수 있도록)
+PROBE_MARGIN = 0.9  # probe 사이에서 놓치는 편차 여유: probe 편차를 max_error 의 이 비율 이하로
+MIN_SEGMENT_ROWS = 1
+ADAPTIVE_REBUILD_RATIO = 1.0  # 증분 편집: 필요한 행 수가 기존의 이 배수를 넘으면 (허용 오차를 못 지키므로) 재생성
+
+
+# 동적 Curve 해상도 (도로 길이 기반)
+# 목표: 2m당 1개 샘플 (1km 도로 = 500 샘플), 세그먼트당 32~512 범위
+def curve_resolution(total_length):
+    return max(32, min(int(total_length / 2.0), 512))
+
+
+# 해상도 (세그먼트당 행 수 int) 또는 세그먼트별 행 수 목록 → counts [n_segments]
+def segment_counts(resolution, n_segments):
+    if np.ndim(resolution) == 0:
+        return np.full(n_segments, int(resolution), dtype=np.int64)
+    counts = np.asarray(resolution, dtype=np.int64)
+    if len(counts) != n_segments:
+        raise ValueError(f"Expected {n_segments} segment row counts, got {len(counts)}")
+    return counts
+
+
+# 세그먼트 j 의 첫 행 = offsets[j], 마지막 행 = offsets[-1]
+def row_offsets(counts):
+    return np.concatenate(([0], np.cumsum(counts)))
+
+
+def row_count(n_points, resolution):
+    return int(segment_counts(resolution, n_points - 1).sum()) + 1
+
+
+# AUTO 핸들: 이웃 두 점 방향의 평균 접선, 길이는 각 이웃까지 거리에 비례
+# 끝점은 반대편 이웃을 거울 대칭으로 만들어 계산. points: [n, 2] → (left, right) [n, 2]
+def auto_handles(points):
+    p = np.asarray(points, dtype=np.float64)
+    prev = np.empty_like(p)
+    nxt = np.empty_like(p)
+    prev[1:] = p[:-1]
+    prev[0] = 2 * p[0] - p[1]
+    nxt[:-1] = p[1:]
+    nxt[-1] = 2 * p[-1] - p[-2]
+
+    da = p - prev
+    db = nxt - p
+    la = np.linalg.norm(da, axis=1, keepdims=True)
+    lb = np.linalg.norm(db, axis=1, keepdims=True)
+    tangent = db / np.maximum(lb, 1e-9) + da / np.maximum(la, 1e-9)
+    tl = np.linalg.norm(tangent, axis=1, keepdims=True) * AUTO_HANDLE_FACTOR
+    tl = np.where(tl > 1e-9, tl, np.inf)  # 접선이 0 이면 핸들 = 제어점
+
+    left = p - tangent * (la / tl)
+    right = p + tangent * (lb / tl)
+    return left, right
+
+
+# 세그먼트 [seg_start, seg_stop) 를 샘플링 → 중심선 (rows, 2), 접선 (rows, 2)
+# 세그먼트 j 는 t = 0, 1/c, ..., (c-1)/c (c = counts[j]), 마지막 행 = 마지막 세그먼트의 t=1
+# resolution: 세그먼트당 행 수 (int) 또는 세그먼트별 행 수 목록
+def sample_rows(points, left, right, resolution, seg_start, seg_stop):
+    p = np.asarray(points, dtype=np.float64)
+    segs = np.arange(seg_start, seg_stop)
+    counts = segment_counts(resolution, len(p) - 1)[seg_start:seg_stop]
+    first = np.repeat(row_offsets(counts)[:-1], counts)
+
+    seg_idx = np.append(np.repeat(segs, counts), seg_stop - 1)
+    t = (np.arange(counts.sum()) - first) / np.repeat(counts, counts)
+    return evaluate_rows(p, left, right, seg_idx, np.append(t, 1.0))
+
+
+# 세그먼트 번호 seg_idx [rows] 의 매개변수 t [rows] 위치 → 중심선 (rows, 2), 접선 (rows, 2)
+def evaluate_rows(points, left, right, seg_idx, t):
+    p = np.asarray(points, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[:, None]
+    p0 = p[seg_idx]
+    h0 = right[seg_idx]
+    h1 = left[seg_idx + 1]
+    p1 = p[seg_idx + 1]
+
+    s = 1.0 - t
+    centres = s**3 * p0 + 3 * s**2 * t * h0 + 3 * s * t**2 * h1 + t**3 * p1
+    tangents = 3 * s**2 * (h0 - p0) + 6 * s * t * (h1 - h0) + 3 * t**2 * (p1 - h1)
+
+    # 핸들이 제어점과 겹쳐 접선이 0 이 되는 경우 세그먼트 현 방향 사용
+    degenerate = np.linalg.norm(tangents, axis=1) < 1e-9
+    tangents[degenerate] = (p1 - p0)[degenerate]
+    return centres, tangents
+
+
+# 중심선 + 접선 → 평면 프로필 정점 (rows * PROFILE_POINTS, 3), z = 0
+def sweep_vertices(centres, tangents, width):
+    length = np.maximum(np.linalg.norm(tangents, axis=1, keepdims=True), 1e-9)
+    normals = np.column_stack((-tangents[:, 1], tangents[:, 0])) / length  # 진행 방향 왼쪽
+    offsets = np.linspace(-width / 2, width / 2, PROFILE_POINTS)
+
+    verts = np.zeros((len(centres), PROFILE_POINTS, 3), dtype=np.float32)
+    verts[:, :, :2] = centres[:, None, :] + normals[:, None, :] * offsets[None, :, None]
+    return verts.reshape(-1, 3)
+
+
+# 쿼드 loop 배열 (위에서 볼 때 CCW → 법선 +Z)
+def road_loops(rows):
+    idx = np.arange(rows * PROFILE_POINTS, dtype=np.int32).reshape(rows, PROFILE_POINTS)
+    loops = np.empty((rows - 1, PROFILE_SEGMENTS, 4), dtype=np.int32)
+    loops[:, :, 0] = idx[:-1, :-1]
+    loops[:, :, 1] = idx[1:, :-1]
+    loops[:, :, 2] = idx[1:, 1:]
+    loops[:, :, 3] = idx[:-1, 1:]
+    return loops.reshape(-1)
+
+
+# 행별 진행 방향 좌표 along [rows] → loop 별 (u, v) [(rows-1) * PROFILE_SEGMENTS * 4, 2]
+def loop_uvs(along):
+    along = np.asarray(along, dtype=np.float32)
+    across = np.arange(PROFILE_POINTS, dtype=np.float32) / PROFILE_SEGMENTS
+    rows = len(along)
+
+    uvs = np.empty((rows - 1, PROFILE_SEGMENTS, 4, 2), dtype=np.float32)
+    uvs[:, :, 0, 0] = along[:-1, None]
+    uvs[:, :, 1, 0] = along[1:, None]
+    uvs[:, :, 2, 0] = along[1:, None]
+    uvs[:, :, 3, 0] = along[:-1, None]
+    uvs[:, :, 0, 1] = across[None, :-1]
+    uvs[:, :, 1, 1] = across[None, :-1]
+    uvs[:, :, 2, 1] = across[None, 1:]
+    uvs[:, :, 3, 1] = across[None, 1:]
+    return uvs.reshape(-1, 2)
+
+
+# 행 row 의 정점을 가리키는 loop 인덱스 하나 (UV 에서 그 행의 along 값을 읽을 때 사용)
+def row_loop(row):
+    if row == 0:
+        return 0
+    return (row - 1) * PROFILE_SEGMENTS * 4 + 1  # 행 row-1 쿼드의 두 번째 corner = 행 row
+
+
+# 도로 전체 (정점, loop, UV, 행 수)
+# rows: 적응형 행 위치 (seg_idx, t) (adaptive_rows). 없으면 resolution 에 따라 세그먼트 안에서 균등한 t
+# UV 는 균등 해상도면 행 번호 기준 0~1 (curve 변환과 동일), 적응형이면 호 길이 기준 0~1
+def build_road_arrays(points, width, resolution, rows=None):
+    left, right = auto_handles(points)
+    if rows is None:
+        centres, tangents = sample_rows(points, left, right, resolution, 0, len(points) - 1)
+        along = np.arange(len(centres), dtype=np.float32) / (len(centres) - 1)
+    else:
+        centres, tangents = evaluate_rows(points, left, right, *rows)
+        along = span_along(centres, 0.0, 1.0)
+    n_rows = len(centres)
+    return sweep_vertices(centres, tangents, width), road_loops(n_rows), loop_uvs(along), n_rows
+
+
+# ===== 적응형 샘플링 =====
+# 1) 초기 배치: 간격 s 로 반경 R 인 호를 현으로 근사하면 오차(sagitta) ≈ s² k / 8 (k = 1/R, 굽은 정도)
+#      - 평면: 중심선 곡률 κ 에 폭 w 의 바깥 가장자리 보정 κ (1 + κ w / 2)
+#      - 지형: 도로를 따라 잰 높이의 2차 미분 |h''| (행 사이를 직선으로 이으므로 생기는 높이 오차)
+#      두 오차는 수평 / 수직으로 직교하므로 k = hypot(평면, 지형)
+#    밀도 sqrt(k / 8e) 를 호 길이로 적분한 값이 세그먼트의 행 수이고, 행은 그 적분을 같은 간격으로 나누는
+#    위치에 둔다 (굽은 곳 / 경사가 꺾이는 곳에 행이 몰리고 직선 / 평지에서는 듬성듬성).
+# 2) 보정: 조밀 샘플 (probe) 마다 실제 메시 (행 사이 직선) 와의 편차를 중심선 / 양 가장자리에서 재고
+#    (수평 거리, 지형 높이 차 중 큰 값), max_error 를 넘는 행 구간은 가장 많이 벗어난 probe 에 행을 추가하는 것을
+#    모든 구간이 max_error x PROBE_MARGIN 이하가 될 때까지 반복한다.
+#    (곡률 추정만으로는 두 행 사이의 지형 기복을 놓쳐 허용 오차를 크게 넘는다)
+#    probe 는 셀 크기의 절반 간격 + 세 선이 지형 격자선을 지나는 점: bilinear 하이트필드는 격자선에서만 꺾이므로
+#    꺾이는 점을 빠짐없이 재고, 그 사이는 매끄러운 2차 곡선이라 셀 안의 편차가 probe 사이에서 크게 커지지 않는다.
+# terrain_grid: 지형 하이트필드 격자 (x0, y0, dx, dy) (road_drape.terrain_sampler 의 sampler.grid)
+# counts (세그먼트별 행 수 [n_segments]) 를 주면 행 수는 그대로 두고 위치만 계산한다 (증분 편집).
+# 반환: (세그먼트 [seg_start, seg_stop) 의 행 수, (seg_idx, t) 행 위치 (마지막 행 = t=1 포함), 측정한 최대 편차 (m))
+def adaptive_rows(points, width, max_error, height_fn=None, seg_start=0, seg_stop=None, counts=None, terrain_grid=None):
+    p = np.asarray(points, dtype=np.float64)
+    if seg_stop is None:
+        seg_stop = len(p) - 1
+    segs = np.arange(seg_start, seg_stop)
+    left, right = auto_handles(p)
+
+    # 세그먼트마다 양 끝을 포함한 조밀 샘플. 간격은 Bezier 제어 다각형 길이 (호 길이 상한) 기준
+    spacing = PROBE_SPACING if terrain_grid is None else min(PROBE_SPACING, min(terrain_grid[2:]) / GRID_PROBES)
+    polygon = (
+        np.linalg.norm(right[segs] - p[segs], axis=1)
+        + np.linalg.norm(left[segs + 1] - right[segs], axis=1)
+        + np.linalg.norm(p[segs + 1] - left[segs + 1], axis=1)
+    )
+    probes = np.maximum(np.ceil(polygon / spacing), MIN_SEGMENT_PROBES).astype(np.int64)
+    starts = row_offsets(probes + 1)
+    probe_seg = np.repeat(segs, probes + 1)
+    probe_t = (np.arange(starts[-1]) - np.repeat(starts[:-1], probes + 1)) / np.repeat(probes, probes + 1)
+    if height_fn is not None and terrain_grid is not None:
+        probe_seg, probe_t = _grid_crossings(p, left, right, width, probe_seg, probe_t, terrain_grid)
+        starts = np.append(np.searchsorted(probe_seg, segs), len(probe_seg))
+        probes = np.diff(starts) - 1
+    centres, tangents = evaluate_rows(p, left, right, probe_seg, probe_t)
+
+    # 조밀 샘플 사이 구간(step) 단위 값. 세그먼트 경계를 넘는 구간은 제외
+    inside = probe_seg[1:] == probe_seg[:-1]
+    steps = np.maximum(np.linalg.norm(np.diff(centres, axis=0), axis=1), 1e-9)
+    heading = np.unwrap(np.arctan2(tangents[:, 1], tangents[:, 0]))
+    kappa = np.abs(np.diff(heading)) / steps
+    bend = kappa * (1.0 + kappa * width / 2)
+
+    # 편차를 잴 선: 중심선 + 양 가장자리 [3, probes, 2] 와 그 지형 높이 [3, probes]
+    lines = _profile_lines(centres, tangents, width)
+    heights = None
+    if height_fn is not None:
+        flat = lines.reshape(-1, 2)
+        heights = np.asarray(height_fn(flat[:, 0], flat[:, 1]), dtype=np.float64).reshape(3, -1)
+        slope = np.diff(heights[0]) / steps
+        # 이웃 두 구간의 경사 차이 / 평균 길이 → 샘플 점의 |h''|, 구간 값은 양 끝 중 큰 값
+        curvature = np.zeros(len(centres))
+        both = inside[1:] & inside[:-1]
+        curvature[1:-1][both] = np.abs(np.diff(slope))[both] / ((steps[1:] + steps[:-1]) / 2)[both]
+        bend = np.hypot(bend, np.maximum(curvature[1:], curvature[:-1]))
+
+    # 1) 밀도 적분 (직선 / 평지에서도 위치가 정해지도록 아주 작은 호 길이 항 추가) → probe 에 맞춘 초기 행
+    density = (np.sqrt(bend / (8.0 * max_error)) + 1e-9) * steps
+    density[~inside] = 0.0
+    cumulative = np.concatenate(([0.0], np.cumsum(density)))
+    totals = cumulative[starts[1:] - 1] - cumulative[starts[:-1]]
+    initial = np.clip(np.ceil(totals), MIN_SEGMENT_ROWS, probes).astype(np.int64)
+    is_row = np.zeros(len(centres), dtype=bool)
+    is_row[starts[:-1]] = True
+    is_row[starts[1:] - 1] = True  # 세그먼트 끝 (t=1, 다음 세그먼트의 t=0 과 같은 점)
+    for j, count in enumerate(initial):
+        lo, hi = starts[j], starts[j + 1]
+        targets = cumulative[lo] + totals[j] * np.arange(count) / count
+        is_row[lo + np.searchsorted(cumulative[lo:hi], targets).clip(0, hi - lo - 1)] = True
+
+    # 2) 보정: max_error 를 넘는 구간마다 가장 많이 벗어난 probe 에 행 추가
+    while True:
+        deviation, interval = row_deviation(lines, heights, is_row)
+        order = np.lexsort((deviation, interval))
+        worst = order[np.append(np.flatnonzero(np.diff(interval[order])), len(order) - 1)]
+        split = worst[deviation[worst] > max_error * PROBE_MARGIN]
+        if not len(split):
+            break
+        is_row[split] = True
+
+    if counts is not None:
+        # 증분 편집: 세그먼트별 행 수를 기존 레이아웃에 맞춤 (부족하면 편차가 큰 구간부터 나누고, 많으면 고르게 솎음)
+        counts = np.asarray(counts, dtype=np.int64)[seg_start:seg_stop]
+        is_row = _fit_row_counts(is_row, starts, counts, deviation)
+        deviation, _interval = row_deviation(lines, heights, is_row)
+
+    # 세그먼트 끝 (t=1) 행은 다음 세그먼트의 첫 행이므로 마지막 세그먼트만 남김
+    keep = is_row.copy()
+    keep[starts[1:] - 1] = False
+    counts = np.bincount(probe_seg[keep] - seg_start, minlength=len(segs)).astype(np.int64)
+    seg_idx = np.append(probe_seg[keep], seg_stop - 1)
+    error = float(deviation.max()) if len(deviation) else 0.0
+    return counts, (seg_idx, np.append(probe_t[keep], 1.0)), error
+
+
+# 중심선 + 양 가장자리 [3, probes, 2]
+def _profile_lines(centres, tangents, width):
+    normals = np.column_stack((-tangents[:, 1], tangents[:, 0]))
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-9)
+    return np.stack((centres, centres + normals * (width / 2), centres - normals * (width / 2)))
+
+
+# probe (seg, t) 에 세 선이 지형 격자선 (x = x0 + i dx, y = y0 + j dy) 을 지나는 점을 추가
+# (이웃 probe 사이는 셀 크기의 절반 이하라 축마다 격자선을 최대 하나 지나고, 그 위치는 t 선형 보간)
+def _grid_crossings(points, left, right, width, probe_seg, probe_t, grid):
+    centres, tangents = evaluate_rows(points, left, right, probe_seg, probe_t)
+    lines = _profile_lines(centres, tangents, width)
+    same = probe_seg[1:] == probe_seg[:-1]
+    extra_seg = []
+    extra_t = []
+    for axis in (0, 1):
+        g = (lines[:, :, axis] - grid[axis]) / grid[axis + 2]
+        k0 = np.floor(g[:, :-1])
+        k1 = np.floor(g[:, 1:])
+        line, i = np.nonzero((k0 != k1) & same)
+        boundary = np.maximum(k0[line, i], k1[line, i])
+        f = (boundary - g[line, i]) / (g[line, i + 1] - g[line, i])
+        extra_seg.append(probe_seg[i])
+        extra_t.append(probe_t[i] + f * (probe_t[i + 1] - probe_t[i]))
+    seg = np.concatenate([probe_seg] + extra_seg)
+    t = np.concatenate([probe_t] + extra_t)
+    order = np.lexsort((t, seg))
+    seg, t = seg[order], t[order]
+    distinct = np.append(True, (np.diff(seg) != 0) | (np.diff(t) > 1e-12))
+    return seg[distinct], t[distinct]
+
+
+# probe 마다 행 폴리라인 (이웃한 두 행을 잇는 직선) 에서 벗어난 정도 → (편차 [probes], 속한 행 구간 번호 [probes])
+# 수평: 선 위 probe 와 현 (두 행의 같은 선 위 점) 사이 거리, 수직: 현을 따라 선형 보간한 높이와 지형 높이 차
+def row_deviation(lines, heights, is_row):
+    rows = np.flatnonzero(is_row)
+    interval = np.searchsorted(rows, np.arange(len(is_row)), side="right") - 1
+    a = rows[interval]
+    b = rows[np.minimum(interval + 1, len(rows) - 1)]
+    ab = lines[:, b] - lines[:, a]
+    rel = lines - lines[:, a]
+    s = np.clip((rel * ab).sum(axis=2) / np.maximum((ab * ab).sum(axis=2), 1e-12), 0.0, 1.0)
+    deviation = np.linalg.norm(rel - ab * s[..., None], axis=2)
+    if heights is not None:
+        vertical = np.abs(heights[:, a] + (heights[:, b] - heights[:, a]) * s - heights)
+        np.maximum(deviation, vertical, out=deviation)
+    return deviation.max(axis=0), interval
+
+
+# 세그먼트 j 의 행 (끝 t=1 제외) 을 정확히 counts[j] 개로 맞춘 is_row
+def _fit_row_counts(is_row, starts, counts, deviation):
+    fitted = np.zeros_like(is_row)
+    for j, count in enumerate(counts):
+        lo, hi = starts[j], starts[j + 1] - 1  # hi = 세그먼트 끝 probe
+        rows = list(np.flatnonzero(is_row[lo:hi]) + lo)
+        if len(rows) > count:
+            rows = [rows[i] for i in np.linspace(0, len(rows) - 1, count).round().astype(np.int64)]
+        free = np.setdiff1d(np.arange(lo, hi), rows)
+        while len(rows) < count and len(free):
+            # 가장 큰 편차 → 편차가 모두 0 이면 가장 긴 구간의 가운데
+            bounds = np.append(rows, hi)
+            gaps = np.diff(bounds)
+            i = int(np.argmax(gaps))
+            middle = int(bounds[i] + gaps[i] // 2)
+            candidates = free[(free > bounds[i]) & (free < bounds[i + 1])]
+            if len(candidates):
+                middle = int(candidates[np.argmax(deviation[candidates])]) if deviation[candidates].max() > 0 else middle
+            rows = sorted(set(rows) | {middle})
+            free = free[free != middle]
+        fitted[rows] = True
+        fitted[hi] = True
+    return fitted
+
+
+# 구간 행들의 along 값을 양 끝 값 (a0, a1) 을 고정한 채 호 길이에 비례하게 재분배
+# → 편집 구간 밖의 UV 는 그대로 두고 이음매에서 텍스처가 끊기지 않는다
+def span_along(centres, a0, a1):
+    steps = np.linalg.norm(np.diff(centres, axis=0), axis=1)
+    cumulative = np.concatenate(([0.0], np.cumsum(steps)))
+    if cumulative[-1] <= 1e-9:
+        return np.linspace(a0, a1, len(centres))
+    return a0 + (a1 - a0) * cumulative / cumulative[-1]
+
+
+# ===== 증분 편집 splice =====
+# 기존 도로 메시 버퍼 co [rows * PROFILE_POINTS, 3] / uvs [loops, 2] (회전 + 스케일된 메시 UV) 에서
+# spans 세그먼트의 행만 제자리에서 다시 계산한다. 행 레이아웃 (road_state["resolution"]) 은 유지.
+# height_fn: 지형 샘플러 (x, y → z). 있으면 정점을 지형 + z_offset 에 올리고 적응형 행 위치 계산에도 사용
+# 반환: 다시 쓴 행 수
+def splice_arrays(co, uvs, road_state, points, spans, height_fn=None, z_offset=0.0):
+    resolution = road_state["resolution"]
+    offsets = row_offsets(segment_counts(resolution, len(points) - 1))
+    uv_scale = road_state["uv_scale"]
+
+    left, right = auto_handles(points)
+    rows = 0
+    for seg_start, seg_stop in spans:
+        r0 = int(offsets[seg_start])
+        r1 = int(offsets[seg_stop])
+        if np.ndim(resolution) == 0:
+            centres, tangents = sample_rows(points, left, right, resolution, seg_start, seg_stop)
+        else:
+            _counts, placement, _error = adaptive_rows(
+                points, road_state["width"], road_state["maxError"], height_fn, seg_start, seg_stop, resolution,
+                getattr(height_fn, "grid", None),
+            )
+            centres, tangents = evaluate_rows(points, left, right, *placement)
+
+        verts = sweep_vertices(centres, tangents, road_state["width"])
+        if height_fn is not None:
+            verts[:, 2] = height_fn(verts[:, 0], verts[:, 1]) + z_offset
+        co[r0 * PROFILE_POINTS : (r1 + 1) * PROFILE_POINTS] = verts
+
+        # 구간 양 끝 행의 UV 는 고정하고 사이 행만 호 길이 비례로 재분배
+        a0 = uvs[row_loop(r0), 1] / uv_scale
+        a1 = uvs[row_loop(r1), 1] / uv_scale
+        along = span_along(centres, a0, a1)
+        uvs[r0 * PROFILE_SEGMENTS * 4 : r1 * PROFILE_SEGMENTS * 4] = rotate_scale_uvs(loop_uvs(along), uv_scale)
+        rows += r1 - r0 + 1
+    return rows
+
+
+# ===== 편집 범위 계산 =====
+# 제어점 k 를 옮기면 k-1, k, k+1 의 AUTO 핸들이 바뀌므로 세그먼트 k-2 ~ k+1 을 다시 만든다.
+# 반환: 겹치는 구간을 합친 세그먼트 구간 [(start, stop), ...], 제어점 수가 다르면 None (전체 재생성)
+def changed_segment_spans(old_points, new_points, tolerance=1e-6):
+    old = np.asarray(old_points, dtype=np.float64)
+    new = np.asarray(new_points, dtype=np.float64)
+    if old.shape != new.shape:
+        return None
+
+    moved = np.nonzero(np.abs(old - new).max(axis=1) > tolerance)[0]
+    n_segments = len(new) - 1
+    spans = []
+    for k in moved:
+        start = max(int(k) - 2, 0)
+        stop = min(int(k) + 2, n_segments)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], stop))
+        else:
+            spans.append((start, stop))
+    return spans
+
+
+# 증분 편집 구간 spans 에서 새 적응형 행 수가 기존 행 수의 ADAPTIVE_REBUILD_RATIO 배를 넘는지
+# (예: 제어점을 끌어 급커브를 만든 경우 기존 레이아웃으로는 허용 오차를 지킬 수 없음)
+def needs_more_rows(old_counts, new_counts, spans):
+    old_counts = np.asarray(old_counts)
+    new_counts = np.asarray(new_counts)
+    for start, stop in spans:
+        if np.any(new_counts[start:stop] > old_counts[start:stop] * ADAPTIVE_REBUILD_RATIO):
+            return True
+    return False
+
+
+# ===== 도로 상태 sidecar =====
+# <road>.blend 옆 <road>_roads.json: 다음 증분 편집에서 메시 레이아웃을 재현하는 데 필요한 값
+def road_state_path(blend_path):
+    return os.path.splitext(blend_path)[0] + "_roads.json"
+
+
+# corridor: 지형 평탄화 옵션 (road_corridor.corridor_options, 꺼져 있으면 None)
+def save_road_state(blend_path, terrain_blend_path, roads, corridor=None):
+    state = {
+        "version": STATE_VERSION,
+        "terrain": terrain_blend_path,
+        "layout": {"profile_points": PROFILE_POINTS, "profile_segments": PROFILE_SEGMENTS},
+        "roads": roads,
+        "corridor": corridor,
+    }
+    path = road_state_path(blend_path)
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+    return path
+
+
+def load_road_state(blend_path):
+    path = road_state_path(blend_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        return None
+    return state
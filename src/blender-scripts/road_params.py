@@ -0,0 +1,123 @@
+# 도로 파라미터 파싱 + 좌표 변환 (bpy 의존성 없음)
+import math
+
+from result_cache import read_flag
+
+DEFAULT_ROAD_WIDTH = 1.6  # 기본 1.6m (1차선)
+DEFAULT_MAX_ERROR = 0.05  # 적응형 샘플링 허용 오차 (m). 0 이하면 길이 기반 고정 해상도
+DEFAULT_MAX_GRADE = 0.12  # 자동 경로 탐색 허용 경사 (12%)
+WEB_EXTENT = (-500.0, 500.0, -500.0, 500.0)  # 기본 지형 (1km, terrain_scale 10) 의 월드 범위
+
+
+def _max_error(road, params):
+    return float(road.get("maxError", params.get("maxError", DEFAULT_MAX_ERROR)))
+
+
+def _web_xy(point):
+    if isinstance(point, dict):
+        return [float(point["x"]), float(point["y"])]
+    return [float(point[0]), float(point[1])]
+
+
+# 자동 경로 탐색: "route": {"start": [x, y], "end": [x, y], "waypoints": [[x, y], ...], "max_grade": 0.12}
+# (웹 좌표 0-100). controlPoints 가 없을 때만 road_routing 으로 control point 를 만든다.
+# max_grade 를 넘는 경사는 지나지 않는다. "allow_steep": true 면 그런 경로가 없을 때만 넘는 구간을 허용한다.
+def read_route(route, name):
+    if route is None:
+        return None
+    if not isinstance(route, dict) or route.get("start") is None or route.get("end") is None:
+        raise ValueError(f"{name}: route needs 'start' and 'end' points")
+    max_grade = float(route.get("max_grade", DEFAULT_MAX_GRADE))
+    if max_grade <= 0:
+        raise ValueError(f"{name}: route max_grade must be positive")
+    return {
+        "points": [_web_xy(p) for p in [route["start"], *route.get("waypoints", []), route["end"]]],
+        "max_grade": max_grade,
+        "allow_steep": read_flag(route, "allow_steep", False),
+    }
+
+
+# 단일 도로 (controlPoints / width) 와 여러 도로 (roads: [...]) 형식을 모두 도로 목록으로 정리
+def read_road_params(params):
+    roads = params.get("roads")
+    if not roads:
+        roads = [
+            {
+                "controlPoints": params.get("controlPoints", []),
+                "width": params.get("width", DEFAULT_ROAD_WIDTH),
+                "route": params.get("route"),
+            }
+        ]
+
+    specs = []
+    for i, road in enumerate(roads):
+        name = road.get("name") or ("Road" if len(roads) == 1 else f"Road_{i + 1:02d}")
+        control_points = road.get("controlPoints") or []
+        specs.append(
+            {
+                "name": name,
+                "controlPoints": control_points,
+                "width": float(road.get("width") or DEFAULT_ROAD_WIDTH),
+                "maxError": _max_error(road, params),
+                "route": None if control_points else read_route(road.get("route"), name),
+            }
+        )
+    return specs
+
+
+# 좌표 변환: 웹 좌표 -> Blender 좌표 (중앙 기준) + 도로 길이 계산
+# extent: 지형 월드 범위 (xmin, xmax, ymin, ymax). 웹 좌표 0~100 이 지형 전체에 대응 (기본 1km → -500~500)
+def convert_control_points(control_points, extent=WEB_EXTENT):
+    xmin, xmax, ymin, ymax = extent
+    total_length = 0.0
+    converted_points = []
+
+    for i, point in enumerate(control_points):
+        u, v = _web_xy(point)
+        x = xmin + u / 100 * (xmax - xmin)
+        y = ymin + v / 100 * (ymax - ymin)
+        converted_points.append((x, y))
+
+        # 이전 포인트와의 거리 계산
+        if i > 0:
+            prev_x, prev_y = converted_points[i - 1]
+            segment_length = math.sqrt((x - prev_x) ** 2 + (y - prev_y) ** 2)
+            total_length += segment_length
+
+    return converted_points, total_length
+
+
+# 좌표 변환: Blender 좌표 -> 웹 좌표 (convert_control_points 의 역변환)
+def web_point(x, y, extent=WEB_EXTENT):
+    xmin, xmax, ymin, ymax = extent
+    return {"x": round((x - xmin) / (xmax - xmin) * 100, 4), "y": round((y - ymin) / (ymax - ymin) * 100, 4)}
+
+
+# 증분 편집용 도로 목록
+#   - roads / controlPoints 가 있으면 새 전체 목록으로 사용
+#   - 없으면 이전 상태에 edits ([{"road": 이름, "index": i, "x": .., "y": ..}]) 의 점 이동을 적용
+def read_road_edits(params, previous_roads):
+    if params.get("roads") or params.get("controlPoints") or params.get("route"):
+        return read_road_params(params)
+
+    roads = [
+        {
+            "name": name,
+            "controlPoints": list(road["controlPoints"]),
+            "width": road["width"],
+            "maxError": _max_error(road, params),
+            "route": None,
+        }
+        for name, road in previous_roads.items()
+    ]
+    by_name = {road["name"]: road for road in roads}
+    for edit in params.get("edits", []):
+        name = edit.get("road", "Road")
+        if name not in by_name:
+            raise ValueError(f"Unknown road in edit: {name}")
+        points = by_name[name]["controlPoints"]
+        index = int(edit["index"])
+        if not 0 <= index < len(points):
+            raise ValueError(f"Control point index {index} out of range for {name}")
+        points[index] = {"x": edit["x"], "y": edit["y"]}
+    return roads
@@ -0,0 +1,317 @@
+# 도로 자동 경로 탐색 (bpy 의존성 없음)
+#
+# 시작 / 끝 (+ 경유지) 웹 좌표 (0~100) 만 주면 지형 하이트필드 위에서 비용이 가장 작은 경로를 찾아
+# 기존 곡선 파이프라인이 쓰는 controlPoints 로 돌려준다.
+#   비용: 이동 거리 x (1 + GRADE_WEIGHT (경사 / max_grade)²)
+#         + 방향을 꺾을 때 TURN_COST x (45° 단위 회전 수)² (급커브 억제, 135° 이상 꺾기 금지)
+#   max_grade 를 넘는 이동은 금지. 그런 경로가 없으면 오류, route["allow_steep"] 이면 마지막 수단으로
+#   STEEP_PENALTY 배 비용을 물려 다시 탐색한다 (결과 통계 fallback = True, 경고 출력).
+#   탐색: (셀, 진입 방향) 상태의 heapq A* (8 방향, octile 거리 휴리스틱)
+#   다중 해상도: 맵 전체를 COARSE_CELLS 크기 그리드로 먼저 탐색 → 그 경로 주변 CORRIDOR_CELLS 만
+#                FINE_CELLS 크기 그리드에서 다시 탐색 (탐색 상태 수를 맵 크기가 아닌 도로 길이에 비례하게)
+# 찾은 셀 경로는 Douglas-Peucker 로 줄여 control point 로 쓴다 (Bezier AUTO 핸들이 부드럽게 이어 줌).
+# 줄인 꺾은선이 max_grade 를 넘는 구간은 셀 경로의 점을 되살려 다시 나눈다.
+#
+# 도로 파라미터 "route" 형식은 road_params.read_route 참고
+import heapq
+import math
+import time
+
+import numpy as np
+
+from heightfield_io import bilinear_sample
+from road_params import convert_control_points, web_point
+
+GRADE_WEIGHT = 4.0
+STEEP_PENALTY = 10.0  # allow_steep 대체 탐색에서 max_grade 를 넘는 이동의 비용 배율
+TURN_COST = 2.0  # m, 45° 회전 1 번 기준
+COARSE_CELLS = 128  # 1 단계 그리드 한 변 최대 셀 수
+FINE_CELLS = 512  # 2 단계 그리드 한 변 최대 셀 수
+CORRIDOR_CELLS = 2  # 2 단계 탐색 범위: 1 단계 경로에서 이 거리 (1 단계 셀) 이내
+SIMPLIFY_CELLS = 1.5  # Douglas-Peucker 허용 오차 (2 단계 셀 크기 배수)
+
+# 8 방향 (행 di = +Y, 열 dj = +X), 반시계 순서 → 인덱스 차이가 회전량
+DIRECTIONS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+_START = len(DIRECTIONS)  # 시작 상태 (진입 방향 없음)
+
+
+def _neighbour_slices(di, dj, ny, nx):
+    src = (slice(max(0, -di), ny - max(0, di)), slice(max(0, -dj), nx - max(0, dj)))
+    dst = (slice(max(0, di), ny + min(0, di)), slice(max(0, dj), nx + min(0, dj)))
+    return src, dst
+
+
+# 방향별 경사 [8, ny, nx] (stride 로 줄인 그리드의 셀에서 그 방향 이웃까지, 맵 밖은 inf)
+# 두 셀 사이 원본 하이트필드 stride 단계 중 가장 가파른 단계를 쓴다 (줄인 그리드가 사이 굴곡을 건너뛰지 않게).
+# cell: 원본 하이트필드 셀 크기 (x, y)
+def edge_grades(heights, cell, stride):
+    rows = np.arange(0, heights.shape[0], stride)
+    cols = np.arange(0, heights.shape[1], stride)
+    cx, cy = cell
+    grades = np.full((len(DIRECTIONS), len(rows), len(cols)), np.inf)
+    for k, (di, dj) in enumerate(DIRECTIONS):
+        src, _dst = _neighbour_slices(di, dj, len(rows), len(cols))
+        r, c = rows[src[0]], cols[src[1]]
+        distance = math.hypot(di * cy, dj * cx)
+        grade = np.zeros((len(r), len(c)))
+        previous = heights[np.ix_(r, c)]
+        for step in range(1, stride + 1):
+            current = heights[np.ix_(r + step * di, c + step * dj)]
+            np.maximum(grade, np.abs(current - previous) / distance, out=grade)
+            previous = current
+        grades[k][src] = grade
+    return grades
+
+
+# 방향별 이동 비용 [8, ny, nx] (셀에서 그 방향 이웃으로, 맵 밖 / allowed 밖은 inf)
+# max_grade 를 넘는 이동은 inf, steep_penalty 를 주면 그 배율의 비용
+def edge_costs(grades, cell, max_grade, allowed=None, steep_penalty=None):
+    _k, ny, nx = grades.shape
+    cx, cy = cell
+    costs = np.full(grades.shape, np.inf)
+    for k, (di, dj) in enumerate(DIRECTIONS):
+        src, dst = _neighbour_slices(di, dj, ny, nx)
+        distance = math.hypot(di * cy, dj * cx)
+        grade = grades[k][src]
+        cost = distance * (1.0 + GRADE_WEIGHT * (grade / max_grade) ** 2)
+        if steep_penalty is None:
+            cost[grade > max_grade] = np.inf
+        else:
+            cost[grade > max_grade] *= steep_penalty
+        if allowed is not None:
+            cost[~allowed[dst]] = np.inf
+        costs[k][src] = cost
+    return costs
+
+
+# (셀, 진입 방향) 상태 A* → 셀 경로 [(i, j), ...] (경로가 없으면 None) 와 탐색한 상태 수
+# step_costs: 방향별 이동 비용을 펼친 Python list (내부 루프에서 NumPy 스칼라 접근을 피함)
+def astar(step_costs, shape, cell, start, goal):
+    _ny, nx = shape
+    cx, cy = cell
+    offsets = [di * nx + dj for di, dj in DIRECTIONS]
+    diagonal = math.hypot(cx, cy)
+    gi, gj = goal
+
+    def heuristic(index):
+        dy = abs(index // nx - gi) * cy
+        dx = abs(index % nx - gj) * cx
+        return max(dx, dy) + (diagonal - max(cx, cy)) * min(dx, dy) / max(min(cx, cy), 1e-9)
+
+    source = start[0] * nx + start[1]
+    target = gi * nx + gj
+    best = {source * 9 + _START: 0.0}
+    parent = {}
+    heap = [(heuristic(source), 0.0, source, _START)]
+    expanded = 0
+    while heap:
+        _f, g, index, arrived = heapq.heappop(heap)
+        state = index * 9 + arrived
+        if g > best.get(state, math.inf):
+            continue
+        expanded += 1
+        if index == target:
+            path = [index]
+            while state in parent:
+                state = parent[state]
+                path.append(state // 9)
+            path.reverse()
+            return [(p // nx, p % nx) for p in path], expanded
+        for k in range(len(DIRECTIONS)):
+            step = step_costs[k][index]
+            if step == math.inf:
+                continue
+            if arrived != _START:
+                turn = abs(k - arrived)
+                turn = min(turn, 8 - turn)
+                if turn > 2:
+                    continue
+                step += TURN_COST * turn * turn
+            neighbour = index + offsets[k]
+            next_state = neighbour * 9 + k
+            next_g = g + step
+            if next_g < best.get(next_state, math.inf):
+                best[next_state] = next_g
+                parent[next_state] = state
+                heapq.heappush(heap, (next_g + heuristic(neighbour), next_g, neighbour, k))
+    return None, expanded
+
+
+# Douglas-Peucker (반복형, N 차원) → 남길 점 인덱스 bool 마스크
+# (x, y, z) 를 넘기면 높이가 크게 바뀌는 지점도 남겨 직선 구간이 언덕을 가로지르지 않게 한다.
+def simplify_path(points, tolerance):
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        ab = points[b] - points[a]
+        rel = points[a + 1 : b] - points[a]
+        t = np.clip(rel @ ab / max(float(ab @ ab), 1e-12), 0.0, 1.0)
+        distance = np.linalg.norm(rel - t[:, None] * ab, axis=1)
+        i = int(distance.argmax())
+        if distance[i] > tolerance:
+            keep[a + 1 + i] = True
+            stack.extend([(a, a + 1 + i), (a + 1 + i, b)])
+    return keep
+
+
+# 꺾은선 points 를 step 간격으로 샘플링한 구간별 경사 (와 전체 길이)
+def polyline_grades(heights, extent, points, step):
+    samples = [points[:1]]
+    for a, b in zip(points[:-1], points[1:]):
+        count = max(1, int(np.ceil(np.hypot(*(b - a)) / step)))
+        t = np.arange(1, count + 1)[:, None] / count
+        samples.append(a + (b - a) * t)
+    samples = np.concatenate(samples)
+    z = bilinear_sample(heights, extent, samples[:, 0], samples[:, 1])
+    steps = np.hypot(*np.diff(samples, axis=0).T)
+    return np.abs(np.diff(z)) / np.maximum(steps, 1e-9), float(steps.sum())
+
+
+class _Level:
+    # stride 로 줄인 하이트필드 그리드 (셀 ↔ 월드 좌표 변환, 방향별 경사). heights: float64 원본 하이트필드
+    def __init__(self, heights, extent, stride):
+        self.stride = stride
+        self.heights = heights[::stride, ::stride]
+        ny, nx = heights.shape
+        xmin, xmax, ymin, ymax = extent
+        self.origin = (xmin, ymin)
+        full_cell = ((xmax - xmin) / (nx - 1), (ymax - ymin) / (ny - 1))
+        self.cell = (full_cell[0] * stride, full_cell[1] * stride)
+        self.grades = edge_grades(heights, full_cell, stride)
+
+    # 셀 경로 각 이동의 경사
+    def path_grades(self, cells):
+        cells = np.asarray(cells)
+        directions = [DIRECTIONS.index((int(di), int(dj))) for di, dj in np.diff(cells, axis=0)]
+        return self.grades[directions, cells[:-1, 0], cells[:-1, 1]]
+
+    def index(self, x, y):
+        ny, nx = self.heights.shape
+        j = int(round((x - self.origin[0]) / self.cell[0]))
+        i = int(round((y - self.origin[1]) / self.cell[1]))
+        return min(max(i, 0), ny - 1), min(max(j, 0), nx - 1)
+
+    def world(self, cells):
+        cells = np.asarray(cells, dtype=np.float64)
+        return np.column_stack((self.origin[0] + cells[:, 1] * self.cell[0], self.origin[1] + cells[:, 0] * self.cell[1]))
+
+
+def _route_level(level, waypoints, max_grade, steep_penalty=None, allowed=None):
+    costs = edge_costs(level.grades, level.cell, max_grade, allowed, steep_penalty)
+    step_costs = [c.ravel().tolist() for c in costs]
+    cells = []
+    expanded = 0
+    for a, b in zip(waypoints[:-1], waypoints[1:]):
+        leg, count = astar(step_costs, level.heights.shape, level.cell, level.index(*a), level.index(*b))
+        expanded += count
+        if leg is None:
+            return None, expanded
+        cells.extend(leg if not cells else leg[1:])
+    return cells, expanded
+
+
+# 1 단계 (거친 그리드) → 2 단계 (1 단계 경로 주변) 탐색 → (셀 경로, 그리드, 탐색 상태 수). 경로가 없으면 셀 경로 None
+# 1 단계는 2 단계 탐색 범위를 정하는 안내용이라 가파른 이동도 STEEP_PENALTY 비용으로 허용하고
+# (거친 셀 사이에서 막힌 경사도 세밀한 그리드에서는 돌아갈 수 있음), 경사 제한은 2 단계에서 지킨다.
+# 1 단계 비용도 원본 경사 기준이라 완만한 띠를 따라가므로, 2 단계는 그 범위 안에서만 찾는다
+# (맵 전체를 다시 탐색하면 경로가 없을 때 도달 가능한 모든 상태를 훑느라 수십 배 느려짐).
+def _route_levels(coarse, fine, waypoints, max_grade, steep_penalty=None):
+    if fine.stride >= coarse.stride:
+        cells, expanded = _route_level(coarse, waypoints, max_grade, steep_penalty)
+        return cells, coarse, {"coarse": expanded, "fine": 0}
+    cells, coarse_expanded = _route_level(coarse, waypoints, max_grade, STEEP_PENALTY)
+    if cells is None:
+        return None, fine, {"coarse": coarse_expanded, "fine": 0}
+    allowed = corridor_mask(coarse, fine, cells)
+    cells, fine_expanded = _route_level(fine, waypoints, max_grade, steep_penalty, allowed)
+    return cells, fine, {"coarse": coarse_expanded, "fine": fine_expanded}
+
+
+# 1 단계 경로 셀 주변 CORRIDOR_CELLS 안의 2 단계 셀 마스크
+def corridor_mask(coarse, fine, cells):
+    mask = np.zeros(coarse.heights.shape, dtype=bool)
+    rows, cols = np.asarray(cells).T
+    mask[rows, cols] = True
+    for _ in range(CORRIDOR_CELLS):
+        grown = mask.copy()
+        grown[1:] |= mask[:-1]
+        grown[:-1] |= mask[1:]
+        grown[:, 1:] |= mask[:, :-1]
+        grown[:, :-1] |= mask[:, 1:]
+        mask = grown
+    ny, nx = fine.heights.shape
+    ratio = fine.stride / coarse.stride
+    i = np.minimum(np.rint(np.arange(ny) * ratio).astype(np.int64), mask.shape[0] - 1)
+    j = np.minimum(np.rint(np.arange(nx) * ratio).astype(np.int64), mask.shape[1] - 1)
+    return mask[np.ix_(i, j)]
+
+
+# 단순화로 남긴 점 (keep) 사이 직선의 경사가 max_grade 와 그 사이 셀 경로 경사 (path_grades) 중 큰 값을 넘으면
+# 셀 경로의 가운데 점을 되살린다. 모든 점을 남기면 셀 경로 그대로이므로 반드시 끝난다.
+def restore_grades(heights, extent, path, keep, max_grade, path_grades, step):
+    while True:
+        kept = np.flatnonzero(keep)
+        split = [
+            (a + b) // 2
+            for a, b in zip(kept[:-1], kept[1:])
+            if b - a >= 2
+            and polyline_grades(heights, extent, path[[a, b]], step)[0].max() > max(max_grade, path_grades[a:b].max())
+        ]
+        if not split:
+            return keep
+        keep[split] = True
+
+
+# 경유점 (웹 좌표) → (controlPoints (웹 좌표), 통계). 웹 좌표 0~100 은 지형 범위 extent 전체
+def route_road(heights, extent, route):
+    start = time.perf_counter()
+    waypoints, _length = convert_control_points(route["points"], extent)
+    heights = np.asarray(heights, dtype=np.float64)
+    ny, nx = heights.shape
+    coarse = _Level(heights, extent, max(1, math.ceil(max(ny, nx) / COARSE_CELLS)))
+    fine = _Level(heights, extent, max(1, math.ceil(max(ny, nx) / FINE_CELLS)))
+
+    max_grade = route["max_grade"]
+    cells, level, expanded = _route_levels(coarse, fine, waypoints, max_grade)
+    fallback = cells is None
+    if fallback:
+        if not route["allow_steep"]:
+            raise ValueError(
+                f"No route within max_grade {max_grade} between the given points "
+                f"(raise max_grade or set route.allow_steep to accept steeper sections)"
+            )
+        cells, level, expanded = _route_levels(coarse, fine, waypoints, max_grade, STEEP_PENALTY)
+        if cells is None:
+            raise ValueError("No route found between the given points")
+
+    if len(cells) < 2:
+        raise ValueError("Route start and end fall on the same grid cell")
+    path = level.world(cells)
+    # 끝점 / 경유지는 셀 중심이 아닌 요청 좌표 그대로, 항상 control point 로 남김
+    pinned = [0, len(path) - 1]
+    pinned[1:1] = [int(np.argmin(np.hypot(path[:, 0] - x, path[:, 1] - y))) for x, y in waypoints[1:-1]]
+    path[pinned] = waypoints
+    z = bilinear_sample(heights, extent, path[:, 0], path[:, 1])
+    keep = simplify_path(np.column_stack((path, z)), SIMPLIFY_CELLS * max(level.cell))
+    keep[pinned] = True
+    # 경사는 원본 하이트필드 셀 간격으로 측정
+    step = min(level.cell) / level.stride
+    keep = restore_grades(heights, extent, path, keep, max_grade, level.path_grades(cells), step)
+    points = path[keep]
+
+    grades, length = polyline_grades(heights, extent, points, step)
+    return [web_point(float(x), float(y), extent) for x, y in points], {
+        "seconds": round(time.perf_counter() - start, 4),
+        "length": length,
+        "control_points": int(len(points)),
+        "max_grade": float(grades.max()),
+        "mean_grade": float(grades.mean()),
+        "steep_fraction": float((grades > max_grade).mean()),
+        "fallback": fallback,
+        "expanded": expanded,
+        "grids": {"coarse": list(coarse.heights.shape), "fine": list(level.heights.shape)},
+    }
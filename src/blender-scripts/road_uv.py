@@ -0,0 +1,55 @@
+# 도로 UV 변환 (90도 회전 + Y축 동적 스케일) 을 NumPy 로 한 번에 처리
+# bmesh / EDIT 모드 없이 mesh.uv_layers.active.data 의 foreach_get/foreach_set 사용
+import numpy as np
+
+
+# 도로 길이 기반 Y 스케일
+# 기준: 1966.8m → 200x 스케일 (텍스처 반복)
+# 공식: scale = (total_length / 10.0) → 도로 10m당 텍스처 1회 반복
+def uv_scale_for_length(total_length):
+    return total_length / 10.0 * 6.0
+
+
+# (u, v) -> (-v, u * y_scale). uvs: [N, 2] float32, y_scale: 스칼라 또는 [N] 배열
+def rotate_scale_uvs(uvs, y_scale):
+    out = np.empty_like(uvs)
+    np.negative(uvs[:, 1], out=out[:, 0])
+    np.multiply(uvs[:, 0], y_scale, out=out[:, 1])
+    return out
+
+
+def _read_uvs(mesh):
+    uv_layer = mesh.uv_layers.active
+    if uv_layer is None:
+        return None
+    uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
+
+
+# 여러 도로 메시의 UV 를 한 번의 배열 연산으로 변환 (OBJECT 모드에서 호출)
+# 반환: UV 레이어가 있어 변환된 메시 수
+def transform_mesh_uvs(meshes, y_scales):
+    buffers = []
+    scales = []
+    targets = []
+    for mesh, y_scale in zip(meshes, y_scales):
+        uvs = _read_uvs(mesh)
+        if uvs is None:
+            continue
+        buffers.append(uvs)
+        scales.append(np.full(len(uvs), y_scale, dtype=np.float32))
+        targets.append(mesh)
+
+    if not targets:
+        return 0
+
+    transformed = rotate_scale_uvs(np.concatenate(buffers), np.concatenate(scales))
+
+    offset = 0
+    for mesh, uvs in zip(targets, buffers):
+        count = len(uvs)
+        mesh.uv_layers.active.data.foreach_set("uv", transformed[offset : offset + count].ravel())
+        mesh.update()
+        offset += count
+    return len(targets)
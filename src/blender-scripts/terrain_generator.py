@@ -1,8 +1,16 @@
 import bpy
 import sys
+import os
 import json
 import math
 
+# 같은 폴더의 모듈 (profiling) import 경로
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from profiling import Profiler, profile_path
+
 # 커맨드 라인 인자 파싱
 # blender --background --python terrain_generator.py -- params.json output.blend preview.png
 args = sys.argv[sys.argv.index("--") + 1:]
@@ -17,6 +25,7 @@ with open(params_file, 'r') as f:
 print(f"[Terrain] Parameters: {params}")
 print(f"[Terrain] Output: {output_path}")
 print(f"[Terrain] Preview: {preview_path}")
+profiler = Profiler('terrain_generator', profile_path(params, output_path))
 
 # 기존 오브젝트 삭제
 bpy.ops.object.select_all(action='SELECT')
@@ -30,53 +39,59 @@ size = params.get('size', 100)  # 100m x 100m
 print(f"[Terrain] Creating plane: {size}m x {size}m")
 
 # 1. Plane 생성
-bpy.ops.mesh.primitive_plane_add(size=size, location=(0, 0, 0))
-plane = bpy.context.active_object
-plane.name = "Terrain"
+with profiler.phase('plane'):
+    bpy.ops.mesh.primitive_plane_add(size=size, location=(0, 0, 0))
+    plane = bpy.context.active_object
+    plane.name = "Terrain"
 
 # 2. Subdivision Surface Modifier (더 많은 버텍스)
 print(f"[Terrain] Adding subdivision...")
-subsurf = plane.modifiers.new(name="Subdivision", type='SUBSURF')
-subsurf.levels = 6  # 뷰포트 레벨
-subsurf.render_levels = 6
+with profiler.phase('modifiers'):
+    subsurf = plane.modifiers.new(name="Subdivision", type='SUBSURF')
+    subsurf.levels = 6  # 뷰포트 레벨
+    subsurf.render_levels = 6
 
-# 3. Displace Modifier (Noise Texture로 지형 생성)
-print(f"[Terrain] Adding displacement with scale={scale}, roughness={roughness}")
-displace = plane.modifiers.new(name="Displace", type='DISPLACE')
+    # 3. Displace Modifier (Noise Texture로 지형 생성)
+    print(f"[Terrain] Adding displacement with scale={scale}, roughness={roughness}")
+    displace = plane.modifiers.new(name="Displace", type='DISPLACE')
 
-# Noise Texture 생성
-texture = bpy.data.textures.new("TerrainNoise", type='CLOUDS')
-texture.noise_scale = scale
-texture.noise_depth = 8
-texture.cloud_type = 'GRAYSCALE'
+    # Noise Texture 생성
+    texture = bpy.data.textures.new("TerrainNoise", type='CLOUDS')
+    texture.noise_scale = scale
+    texture.noise_depth = 8
+    texture.cloud_type = 'GRAYSCALE'
 
-displace.texture = texture
-displace.strength = roughness * 10  # 높이 조절
-displace.mid_level = 0.5
+    displace.texture = texture
+    displace.strength = roughness * 10  # 높이 조절
+    displace.mid_level = 0.5
 
 # 4. 모디파이어 적용 (Apply modifiers to mesh)
 print(f"[Terrain] Applying modifiers to mesh...")
-# Subdivision 먼저 적용
-bpy.ops.object.modifier_apply(modifier="Subdivision")
-# Displacement 적용
-bpy.ops.object.modifier_apply(modifier="Displace")
+with profiler.phase('modifier_apply'):
+    # Subdivision 먼저 적용
+    bpy.ops.object.modifier_apply(modifier="Subdivision")
+    # Displacement 적용
+    bpy.ops.object.modifier_apply(modifier="Displace")
+    profiler.count(vertices=len(plane.data.vertices), faces=len(plane.data.polygons))
 
 # 5. Smooth Shading
 print(f"[Terrain] Applying smooth shading...")
-bpy.ops.object.shade_smooth()
+with profiler.phase('shade_smooth'):
+    bpy.ops.object.shade_smooth()
 
 # 6. 카메라 설정 (Top View)
 print(f"[Terrain] Setting up camera...")
-bpy.ops.object.camera_add(location=(0, 0, size * 1.5))
-camera = bpy.context.active_object
-camera.rotation_euler = (0, 0, 0)
-bpy.context.scene.camera = camera
-
-# 7. 조명 추가
-print(f"[Terrain] Adding light...")
-bpy.ops.object.light_add(type='SUN', location=(size/2, size/2, size))
-light = bpy.context.active_object
-light.data.energy = 2.0
+with profiler.phase('camera_light'):
+    bpy.ops.object.camera_add(location=(0, 0, size * 1.5))
+    camera = bpy.context.active_object
+    camera.rotation_euler = (0, 0, 0)
+    bpy.context.scene.camera = camera
+
+    # 7. 조명 추가
+    print(f"[Terrain] Adding light...")
+    bpy.ops.object.light_add(type='SUN', location=(size/2, size/2, size))
+    light = bpy.context.active_object
+    light.data.energy = 2.0
 
 # 8. 렌더 설정
 print(f"[Terrain] Configuring render settings...")
@@ -87,11 +102,16 @@ bpy.context.scene.render.filepath = preview_path
 
 # 9. Top View 렌더링
 print(f"[Terrain] Rendering top view...")
-bpy.ops.render.render(write_still=True)
+with profiler.phase('render'):
+    bpy.ops.render.render(write_still=True)
 
 # 10. .blend 파일 저장
 print(f"[Terrain] Saving blend file...")
-bpy.ops.wm.save_as_mainfile(filepath=output_path)
+with profiler.phase('save'):
+    bpy.ops.wm.save_as_mainfile(filepath=output_path)
 
 print(f"[Terrain] SUCCESS: Created terrain at {output_path}")
 print(f"[Terrain] Preview saved to {preview_path}")
+profiler.output('blend', output_path)
+profiler.output('preview', preview_path)
+profiler.emit()
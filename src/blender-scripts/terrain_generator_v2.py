@@ -1,326 +1,580 @@
 import bpy
 import sys
+import os
 import json
 import math
-
-# 커맨드 라인 인자 파싱
-args = sys.argv[sys.argv.index("--") + 1:]
-params_file = args[0]
-output_path = args[1]
-preview_path = args[2]
-
-# 파라미터 파일 읽기
-with open(params_file, 'r') as f:
-    params = json.load(f)
-
-print(f"[Terrain v2] Parameters: {json.dumps(params, indent=2)}")
-print(f"[Terrain v2] Output: {output_path}")
-print(f"[Terrain v2] Preview: {preview_path}")
-
-# 기존 오브젝트 삭제
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
-
-# ===== 파라미터 추출 =====
-# 기본 형상
-base_scale = params.get('base_scale', 20)
-base_roughness = params.get('base_roughness', 0.7)
-height_multiplier = params.get('height_multiplier', 30)
-
-# 노이즈 설정
-noise_type = params.get('noise_type', 'MUSGRAVE')  # PERLIN, VORONOI, MUSGRAVE
-noise_layers = params.get('noise_layers', 3)
-octaves = params.get('octaves', 6)
-
-# 지형 특성
-peak_sharpness = params.get('peak_sharpness', 0.5)
-valley_depth = params.get('valley_depth', 0.5)
-erosion = params.get('erosion', 0.3)
-terrace_levels = params.get('terrace_levels', 0)
-
-# 머티리얼
-snow_height = params.get('snow_height', 0.7)
-rock_height = params.get('rock_height', 0.3)
-grass_height = params.get('grass_height', 0.0)
-
-# 색상 (RGB)
-snow_color = params.get('snow_color', [0.95, 0.95, 1.0])
-rock_color = params.get('rock_color', [0.3, 0.3, 0.35])
-grass_color = params.get('grass_color', [0.2, 0.4, 0.1])
-
-# 환경
-climate = params.get('climate', 'temperate')
-wetness = params.get('wetness', 0.3)
-
-base_size = 100  # 기본 100m로 생성
-terrain_scale = params.get('terrain_scale', 10)  # 최종 스케일 배율 (기본 10배 = 1km)
-size = base_size * terrain_scale  # 최종 크기 (표시용)
-
-print(f"[Terrain v2] Creating terrain: base={base_size}m, scale={terrain_scale}x, final={size}m, height={height_multiplier}m")
-
-# ===== 1. 고해상도 Plane 생성 (항상 100m로 생성) =====
-print(f"[Terrain v2] Creating high-res plane...")
-bpy.ops.mesh.primitive_grid_add(
-    size=base_size,  # 항상 100m로 생성
-    x_subdivisions=200,  # 높은 해상도
-    y_subdivisions=200,
-    location=(0, 0, 0)
+import time
+
+import numpy as np
+
+# 같은 폴더의 모듈 (heightfield, terrain_mesh) import 경로
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from heightfield import (
+    BASE_SIZE,
+    Z_SCALE,
+    NoiseBasis,
+    read_terrain_params,
+    grid_axes,
+    compute_heightfield,
+    grid_vertices,
+    grid_loops,
 )
-terrain = bpy.context.active_object
-terrain.name = "Terrain"
-
-# ===== 2. Geometry Nodes Modifier 추가 =====
-print(f"[Terrain v2] Setting up Geometry Nodes...")
-geo_nodes = terrain.modifiers.new(name="TerrainGeometry", type='NODES')
-
-# 새 Geometry Node Group 생성
-node_group = bpy.data.node_groups.new(name="TerrainGenerator", type='GeometryNodeTree')
-geo_nodes.node_group = node_group
-
-# 노드 생성 헬퍼 함수
-nodes = node_group.nodes
-links = node_group.links
-
-def create_node(type_name, location=(0, 0)):
-    node = nodes.new(type=type_name)
-    node.location = location
-    return node
-
-# Input/Output 노드
-group_input = nodes.get('Group Input')
-if not group_input:
-    group_input = create_node('NodeGroupInput', (-800, 0))
-
-group_output = nodes.get('Group Output')
-if not group_output:
-    group_output = create_node('NodeGroupOutput', (1200, 0))
-
-# ===== 3. Base Noise Layer =====
-print(f"[Terrain v2] Adding noise layers...")
-noise_node = create_node('ShaderNodeTexNoise', (-600, 0))
-noise_node.inputs['Scale'].default_value = base_scale
-noise_node.inputs['Detail'].default_value = octaves
-noise_node.inputs['Roughness'].default_value = base_roughness
-
-# ===== 4. Multiple Noise Layers (디테일) =====
-current_x = -400
-math_add_node = None
-
-for i in range(noise_layers):
-    detail_noise = create_node('ShaderNodeTexNoise', (current_x, -200 * i))
-    detail_noise.inputs['Scale'].default_value = base_scale * (2 ** (i + 1))
-    detail_noise.inputs['Detail'].default_value = 2
-
-    # 강도 감소
-    multiply_node = create_node('ShaderNodeMath', (current_x + 200, -200 * i))
-    multiply_node.operation = 'MULTIPLY'
-    multiply_node.inputs[1].default_value = 1.0 / (2 ** (i + 1))
-
-    links.new(detail_noise.outputs['Fac'], multiply_node.inputs[0])
-
-    if math_add_node is None:
-        # 첫 번째 레이어: base noise + detail
-        math_add_node = create_node('ShaderNodeMath', (current_x + 400, 0))
-        math_add_node.operation = 'ADD'
-        links.new(noise_node.outputs['Fac'], math_add_node.inputs[0])
-        links.new(multiply_node.outputs[0], math_add_node.inputs[1])
-    else:
-        # 이후 레이어: 이전 결과 + detail
-        new_add = create_node('ShaderNodeMath', (current_x + 400, -100 * i))
-        new_add.operation = 'ADD'
-        links.new(math_add_node.outputs[0], new_add.inputs[0])
-        links.new(multiply_node.outputs[0], new_add.inputs[1])
-        math_add_node = new_add
-
-combined_noise = math_add_node
-
-# ===== 5. Peak Sharpness (Power) =====
-if peak_sharpness > 0.01:
-    print(f"[Terrain v2] Adding peak sharpness: {peak_sharpness}")
-    power_node = create_node('ShaderNodeMath', (0, 0))
-    power_node.operation = 'POWER'
-    power_node.inputs[1].default_value = 1.0 + (peak_sharpness * 3)  # 1-4 range
-    links.new(combined_noise.outputs[0], power_node.inputs[0])
-    combined_noise = power_node
-
-# ===== 6. Valley Depth =====
-if valley_depth > 0.01:
-    print(f"[Terrain v2] Adding valley depth: {valley_depth}")
-    # Subtract 0.5, multiply, add back 0.5 (deepen valleys)
-    sub_node = create_node('ShaderNodeMath', (200, 0))
-    sub_node.operation = 'SUBTRACT'
-    sub_node.inputs[1].default_value = 0.5
-
-    mult_node = create_node('ShaderNodeMath', (400, 0))
-    mult_node.operation = 'MULTIPLY'
-    mult_node.inputs[1].default_value = 1.0 + valley_depth
-
-    add_node = create_node('ShaderNodeMath', (600, 0))
-    add_node.operation = 'ADD'
-    add_node.inputs[1].default_value = 0.5
-
-    links.new(combined_noise.outputs[0], sub_node.inputs[0])
-    links.new(sub_node.outputs[0], mult_node.inputs[0])
-    links.new(mult_node.outputs[0], add_node.inputs[0])
-    combined_noise = add_node
-
-# ===== 7. Terrace Effect =====
-if terrace_levels > 0:
-    print(f"[Terrain v2] Adding terrace effect: {terrace_levels} levels")
-    snap_node = create_node('ShaderNodeMath', (800, 0))
-    snap_node.operation = 'SNAP'
-    snap_node.inputs[1].default_value = 1.0 / terrace_levels
-    links.new(combined_noise.outputs[0], snap_node.inputs[0])
-    combined_noise = snap_node
-
-# ===== 8. Height Multiplier =====
-final_mult = create_node('ShaderNodeMath', (1000, 0))
-final_mult.operation = 'MULTIPLY'
-final_mult.inputs[1].default_value = height_multiplier
-links.new(combined_noise.outputs[0], final_mult.inputs[0])
-
-# ===== 9. Position 노드 (Geometry Nodes) =====
-# Shader Nodes가 아닌 Geometry Nodes로 전환 필요
-# 현재는 Displacement 방식 사용 (Geometry Nodes는 복잡도가 높음)
-
-print(f"[Terrain v2] Applying modifiers...")
-
-# Geometry Nodes 대신 Displacement 사용 (간소화)
-# 실제 Geometry Nodes 구현은 복잡하므로 Shader → Texture → Displacement 방식
-
-# Texture 생성
-texture = bpy.data.textures.new("TerrainTexture", type='BLEND')
-
-# Displacement Modifier
-displace_mod = terrain.modifiers.new(name="Displacement", type='DISPLACE')
-displace_mod.texture = texture
-displace_mod.strength = height_multiplier
-displace_mod.mid_level = 0.5
-
-# Geometry Nodes 제거 (너무 복잡)
-terrain.modifiers.remove(geo_nodes)
-
-# Subdivision Surface
-subsurf = terrain.modifiers.new(name="Subdivision", type='SUBSURF')
-subsurf.levels = 3  # 5 → 3 (파일 크기 최적화: 4GB → ~150MB)
-subsurf.render_levels = 3
-
-# 실제 노이즈 텍스처 생성 (수동)
-noise_tex = bpy.data.textures.new("ComplexNoise", type='CLOUDS')
-noise_tex.noise_scale = base_scale
-noise_tex.noise_depth = octaves
-displace_mod.texture = noise_tex
-
-# 모디파이어 적용
-bpy.ops.object.modifier_apply(modifier="Subdivision")
-bpy.ops.object.modifier_apply(modifier="Displacement")
-
-# ===== 9.5. Terrain 스케일 적용 =====
-z_scale = 3  # Z축 스케일 (높이 3배)
-print(f"[Terrain v2] Applying terrain scale: XY={terrain_scale}x, Z={z_scale}x")
-terrain.scale = (terrain_scale, terrain_scale, z_scale)  # XY 10배, Z 3배
-bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+from terrain_mesh import build_grid_object
+from parallel_heights import worker_count, compute_heights
+from terrain_tiles import tile_name, iter_tiles, world_axis, tile_slices, tile_heights, grid_normals
+from result_cache import cache_config, params_key, restore, store, format_stats
+from heightfield_io import sidecar_paths, save_heightfield, create_heightfield, write_header, load_heightfield, header_extent
+from heightmap_preview import (
+    CAMERA_HEIGHT_FACTOR,
+    SUN_ROTATION,
+    SUN_STRENGTH,
+    ramp_stops,
+    low_preview_path,
+    announce_preview,
+    write_preview,
+    render_heightmap_preview,
+)
+from render_settings import LOW_PREVIEW_RESOLUTION, PREVIEW_RESOLUTION
+from terrain_lod import lod_path, lod_manifest_path, lod_grids, lod_error, grid_counts, save_lod_manifest
+from profiling import Profiler, profile_path
+from blend_output import output_options, save_blend, format_save_stats
+from mesh_export import read_export_formats, export_paths, heightfield_mesh, export_meshes
+from erosion import erosion_budget, erosion_iterations, erode
+from checkpoints import Checkpoints, checkpoint_config
+
+# 결과에 영향을 주는 변경 시 올려서 캐시를 무효화
+SCRIPT_VERSION = "2.6"
+
 
 # ===== 10. Material 생성 (높이 기반) =====
-print(f"[Terrain v2] Creating height-based material...")
-mat = bpy.data.materials.new(name="TerrainMaterial")
-mat.use_nodes = True
-mat_nodes = mat.node_tree.nodes
-mat_links = mat.node_tree.links
-
-# 기존 노드 제거
-mat_nodes.clear()
-
-# Material Output
-mat_output = mat_nodes.new('ShaderNodeOutputMaterial')
-mat_output.location = (800, 0)
-
-# Principled BSDF
-bsdf = mat_nodes.new('ShaderNodeBsdfPrincipled')
-bsdf.location = (600, 0)
-
-# Geometry Input (Z 좌표)
-geometry = mat_nodes.new('ShaderNodeNewGeometry')
-geometry.location = (0, 0)
-
-# Separate XYZ
-separate_xyz = mat_nodes.new('ShaderNodeSeparateXYZ')
-separate_xyz.location = (200, 0)
-mat_links.new(geometry.outputs['Position'], separate_xyz.inputs['Vector'])
-
-# Map Range (Z를 0-1로 정규화)
-map_range = mat_nodes.new('ShaderNodeMapRange')
-map_range.location = (400, 0)
-map_range.inputs['From Min'].default_value = 0
-map_range.inputs['From Max'].default_value = height_multiplier
-map_range.inputs['To Min'].default_value = 0
-map_range.inputs['To Max'].default_value = 1
-mat_links.new(separate_xyz.outputs['Z'], map_range.inputs['Value'])
-
-# Color Ramp (높이 기반 색상)
-color_ramp = mat_nodes.new('ShaderNodeValToRGB')
-color_ramp.location = (400, 200)
-mat_links.new(map_range.outputs['Result'], color_ramp.inputs['Fac'])
-
-# Color Ramp 설정
-color_ramp.color_ramp.elements[0].position = grass_height
-color_ramp.color_ramp.elements[0].color = (*grass_color, 1.0)
-
-color_ramp.color_ramp.elements[1].position = rock_height
-color_ramp.color_ramp.elements[1].color = (*rock_color, 1.0)
-
-# Snow stop 추가
-color_ramp.color_ramp.elements.new(snow_height)
-color_ramp.color_ramp.elements[2].color = (*snow_color, 1.0)
-
-# BSDF 연결
-mat_links.new(color_ramp.outputs['Color'], bsdf.inputs['Base Color'])
-bsdf.inputs['Roughness'].default_value = 0.7
-bsdf.inputs['Specular IOR Level'].default_value = wetness
-
-mat_links.new(bsdf.outputs['BSDF'], mat_output.inputs['Surface'])
-
-# Material 적용
-terrain.data.materials.append(mat)
-
-# Smooth Shading
-bpy.ops.object.shade_smooth()
-
-# ===== 11. 카메라 설정 =====
-print(f"[Terrain v2] Setting up camera...")
-bpy.ops.object.camera_add(location=(0, 0, size * 1.8))
-camera = bpy.context.active_object
-camera.rotation_euler = (0, 0, 0)
-camera.data.clip_end = size * 5  # Far clip plane 설정 (충분히 멀리)
-bpy.context.scene.camera = camera
-
-# ===== 12. 조명 =====
-print(f"[Terrain v2] Adding lighting...")
-bpy.ops.object.light_add(type='SUN', location=(size/2, size/2, size * 2))
-sun = bpy.context.active_object
-sun.data.energy = 3.0
-sun.rotation_euler = (math.radians(45), 0, math.radians(45))
-
-# ===== 13. 렌더 설정 =====
-print(f"[Terrain v2] Configuring render...")
-scene = bpy.context.scene
-scene.render.engine = 'BLENDER_EEVEE_NEXT'
-scene.render.resolution_x = 1024
-scene.render.resolution_y = 1024
-scene.render.filepath = preview_path
-
-# Ambient Occlusion
-scene.eevee.use_gtao = True
-scene.eevee.gtao_distance = 10
-
-# ===== 14. 렌더링 =====
-print(f"[Terrain v2] Rendering preview...")
-bpy.ops.render.render(write_still=True)
-
-# ===== 15. 저장 =====
-print(f"[Terrain v2] Saving blend file...")
-bpy.ops.wm.save_as_mainfile(filepath=output_path)
-
-print(f"[Terrain v2] SUCCESS!")
-print(f"[Terrain v2] Created: {output_path}")
-print(f"[Terrain v2] Preview: {preview_path}")
+def create_terrain_material(settings, z_scale):
+    print(f"[Terrain v2] Creating height-based material...")
+    mat = bpy.data.materials.new(name="TerrainMaterial")
+    mat.use_nodes = True
+    mat_nodes = mat.node_tree.nodes
+    mat_links = mat.node_tree.links
+
+    # 기존 노드 제거
+    mat_nodes.clear()
+
+    # Material Output
+    mat_output = mat_nodes.new('ShaderNodeOutputMaterial')
+    mat_output.location = (800, 0)
+
+    # Principled BSDF
+    bsdf = mat_nodes.new('ShaderNodeBsdfPrincipled')
+    bsdf.location = (600, 0)
+
+    # Geometry Input (Z 좌표)
+    geometry = mat_nodes.new('ShaderNodeNewGeometry')
+    geometry.location = (0, 0)
+
+    # Separate XYZ
+    separate_xyz = mat_nodes.new('ShaderNodeSeparateXYZ')
+    separate_xyz.location = (200, 0)
+    mat_links.new(geometry.outputs['Position'], separate_xyz.inputs['Vector'])
+
+    # Map Range (Z를 0-1로 정규화)
+    map_range = mat_nodes.new('ShaderNodeMapRange')
+    map_range.location = (400, 0)
+    map_range.inputs['From Min'].default_value = 0
+    map_range.inputs['From Max'].default_value = settings['height_multiplier'] * z_scale
+    map_range.inputs['To Min'].default_value = 0
+    map_range.inputs['To Max'].default_value = 1
+    mat_links.new(separate_xyz.outputs['Z'], map_range.inputs['Value'])
+
+    # Color Ramp (높이 기반 색상)
+    color_ramp = mat_nodes.new('ShaderNodeValToRGB')
+    color_ramp.location = (400, 200)
+    mat_links.new(map_range.outputs['Result'], color_ramp.inputs['Fac'])
+
+    # Color Ramp 설정
+    color_ramp.color_ramp.elements[0].position = settings['grass_height']
+    color_ramp.color_ramp.elements[0].color = (*settings['grass_color'], 1.0)
+
+    color_ramp.color_ramp.elements[1].position = settings['rock_height']
+    color_ramp.color_ramp.elements[1].color = (*settings['rock_color'], 1.0)
+
+    # Snow stop 추가
+    color_ramp.color_ramp.elements.new(settings['snow_height'])
+    color_ramp.color_ramp.elements[2].color = (*settings['snow_color'], 1.0)
+
+    # BSDF 연결
+    mat_links.new(color_ramp.outputs['Color'], bsdf.inputs['Base Color'])
+    bsdf.inputs['Roughness'].default_value = 0.7
+    bsdf.inputs['Specular IOR Level'].default_value = settings['wetness']
+
+    mat_links.new(bsdf.outputs['BSDF'], mat_output.inputs['Surface'])
+    return mat
+
+
+# Material 적용 + Smooth Shading (타일마다 같은 Material 공유)
+def apply_terrain_material(terrain, mat):
+    terrain.data.materials.append(mat)
+    terrain.data.shade_smooth()
+
+
+# ===== 11-12. 카메라 / 조명 =====
+def setup_camera_and_light(size):
+    print(f"[Terrain v2] Setting up camera...")
+    bpy.ops.object.camera_add(location=(0, 0, size * CAMERA_HEIGHT_FACTOR))
+    camera = bpy.context.active_object
+    camera.rotation_euler = (0, 0, 0)
+    camera.data.clip_end = size * 5  # Far clip plane 설정 (충분히 멀리)
+    bpy.context.scene.camera = camera
+
+    print(f"[Terrain v2] Adding lighting...")
+    bpy.ops.object.light_add(type='SUN', location=(size/2, size/2, size * 2))
+    sun = bpy.context.active_object
+    sun.data.energy = SUN_STRENGTH
+    sun.rotation_euler = tuple(math.radians(a) for a in SUN_ROTATION)
+    return camera, sun
+
+
+# ===== 13-14. 렌더 설정 + 렌더링 =====
+def render_preview(preview_path, resolution=PREVIEW_RESOLUTION):
+    print(f"[Terrain v2] Configuring render...")
+    scene = bpy.context.scene
+    scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    scene.render.resolution_x = resolution
+    scene.render.resolution_y = resolution
+    scene.render.filepath = preview_path
+
+    # Ambient Occlusion
+    scene.eevee.use_gtao = True
+    scene.eevee.gtao_distance = 10
+
+    print(f"[Terrain v2] Rendering preview...")
+    bpy.ops.render.render(write_still=True)
+
+
+# ===== 9. 타일 단위 하이트필드 + 메시 =====
+# 타일마다 높이 계산 → 메시 생성 → sidecar memmap 에 기록. 한 번에 한 타일 배열만 메모리에 둔다.
+# tile_output == "library" 면 타일을 각자의 .blend 로 쓰고 세션에서 해제한 뒤 마지막에 링크한다.
+def build_terrain_tiles(settings, output_path, mat, size, z_scale, header_fields, workers=1):
+    tiles = settings['tiles']
+    tile_resolution = settings['tile_resolution']
+    height_scale = settings['height_multiplier'] * z_scale
+    terrain_scale = settings['terrain_scale']
+    library = settings['tile_output'] == 'library'
+
+    axis = world_axis(tiles, tile_resolution)
+    cell_size = float(axis[1] - axis[0]) * terrain_scale
+    heights_out = create_heightfield(output_path, (len(axis), len(axis)))
+    tiles_dir = os.path.splitext(output_path)[0] + '_tiles'
+    if library:
+        os.makedirs(tiles_dir, exist_ok=True)
+
+    basis = NoiseBasis(settings['seed'])
+    z_min, z_max = np.inf, -np.inf
+    tile_results = []
+    for ix, iy in iter_tiles(tiles):
+        start_time = time.perf_counter()
+        name = tile_name(ix, iy)
+        xs, ys, padded = tile_heights(settings, axis, ix, iy, tile_resolution, basis, workers)
+        padded *= np.float32(height_scale)  # 월드 Z (apron 포함)
+        z = padded[1:-1, 1:-1]
+
+        rows, cols = tile_slices(ix, iy, tile_resolution)
+        heights_out[rows, cols] = z
+        z_min = min(z_min, float(z.min()))
+        z_max = max(z_max, float(z.max()))
+
+        # 높이는 이미 월드 Z 이므로 height_multiplier=1, z_scale=1 로 정점 버퍼 생성
+        vertices = grid_vertices(z, xs, ys, terrain_scale, 1.0, 1.0)
+        terrain = build_grid_object(name, vertices, len(xs), len(ys))
+        apply_terrain_material(terrain, mat)
+        # 경계 정점 법선을 이웃 타일과 맞춰 shading 이음매 제거
+        terrain.data.normals_split_custom_set_from_vertices(grid_normals(padded, cell_size))
+        del vertices, padded
+
+        tile = {'name': name, 'vertices': len(terrain.data.vertices)}
+        if library:
+            tile['file'] = os.path.join(tiles_dir, name + '.blend')
+            bpy.data.libraries.write(tile['file'], {terrain}, path_remap='ABSOLUTE', compress=True)
+            mesh = terrain.data
+            bpy.data.objects.remove(terrain, do_unlink=True)
+            bpy.data.meshes.remove(mesh)
+        tile_results.append(tile)
+        print(f"[Terrain v2] Tile {name}: {tile['vertices']} vertices in {time.perf_counter() - start_time:.2f}s")
+
+    heights_out.flush()
+    del heights_out
+
+    # library 모드: 타일 .blend 를 상대 경로로 링크 (메인 .blend 에는 참조만 저장)
+    if library:
+        for tile in tile_results:
+            with bpy.data.libraries.load(tile['file'], link=True, relative=True) as (data_from, data_to):
+                data_to.objects = [tile['name']]
+            for obj in data_to.objects:
+                bpy.context.collection.objects.link(obj)
+        print(f"[Terrain v2] Linked {len(tile_results)} tile libraries from {tiles_dir}")
+
+    half = size / 2
+    write_header(
+        output_path,
+        (len(axis), len(axis)),
+        (-half, half, -half, half),
+        z_min,
+        z_max,
+        tiles=tiles,
+        tile_resolution=tile_resolution,
+        tile_output=settings['tile_output'],
+        **header_fields,
+    )
+    return tile_results
+
+
+# ===== 10b. LOD 체인 =====
+# 저장된 하이트필드 sidecar (memmap) 를 stride 로 샘플링해 LOD 메시를 만들고 각자의 .blend 로 저장
+# (Decimate 모디파이어 없이 그리드 stride). LOD 0 은 메인 .blend 의 원본 메시.
+def build_lod_chain(settings, output_path, mat):
+    heights, header = load_heightfield(output_path)
+    extent = header['extent']
+    ny, nx = heights.shape
+    x_world = np.linspace(extent['xmin'], extent['xmax'], nx, dtype=np.float32)
+    y_world = np.linspace(extent['ymin'], extent['ymax'], ny, dtype=np.float32)
+
+    lods = [{'level': 0, 'stride': 1, **grid_counts(range(ny), range(nx)), 'max_error': 0.0, 'rms_error': 0.0}]
+    for level, stride, rows, cols in lod_grids(heights.shape, settings['lod_levels']):
+        start_time = time.perf_counter()
+        z = np.ascontiguousarray(heights[np.ix_(rows, cols)])
+        # 좌표 / 높이가 이미 월드 단위이므로 스케일 1
+        vertices = grid_vertices(z, x_world[cols], y_world[rows], 1.0, 1.0, 1.0)
+        lod = build_grid_object(f"Terrain_LOD{level}", vertices, len(cols), len(rows))
+        apply_terrain_material(lod, mat)
+        bpy.data.libraries.write(lod_path(output_path, level), {lod}, path_remap='ABSOLUTE', compress=True)
+
+        mesh = lod.data
+        bpy.data.objects.remove(lod, do_unlink=True)
+        bpy.data.meshes.remove(mesh)
+
+        max_error, rms_error = lod_error(heights, rows, cols)
+        lods.append({
+            'level': level,
+            'stride': stride,
+            **grid_counts(rows, cols),
+            'max_error': max_error,
+            'rms_error': rms_error,
+        })
+        print(f"[Terrain v2] LOD{level}: stride {stride}, {lods[-1]['vertices']} vertices, "
+              f"max error {max_error:.2f}m (rms {rms_error:.2f}m) in {time.perf_counter() - start_time:.2f}s")
+
+    save_lod_manifest(output_path, lods)
+    return lods
+
+
+# 거친 그리드 (LOW_PREVIEW_RESOLUTION) 에서 바로 저해상도 미리보기 PNG (침식 전 높이)
+# 전체 하이트필드 / 메시 / 렌더보다 먼저 내보내 첫 이미지까지의 시간을 줄인다.
+def render_low_preview(settings, path, size, z_scale):
+    start_time = time.perf_counter()
+    xs, ys = grid_axes(LOW_PREVIEW_RESOLUTION)
+    height_range = settings['height_multiplier'] * z_scale
+    heights = compute_heightfield(settings, xs, ys) * np.float32(height_range)
+    half = size / 2
+    write_preview(path, heights, (-half, half, -half, half), height_range, ramp_stops(settings),
+                  resolution=LOW_PREVIEW_RESOLUTION)
+    seconds = time.perf_counter() - start_time
+    print(f"[Terrain v2] Low-res preview in {seconds:.2f}s")
+    announce_preview('low', path, LOW_PREVIEW_RESOLUTION, seconds)
+
+
+# ===== 15b. 웹용 메시 내보내기 =====
+# 저장된 하이트필드 sidecar 에서 바로 그리드 메시를 만들어 GLB / 원시 버퍼로 쓴다 (bpy 익스포터 / 메시 순회 없음)
+def export_terrain_mesh(output_path, formats):
+    heights, header = load_heightfield(output_path)
+    ny, nx = heights.shape
+    mesh = heightfield_mesh('Terrain', heights, header_extent(header), grid_loops(nx, ny))
+    exports = export_meshes(output_path, [mesh], formats)
+    for fmt, stats in exports.items():
+        print(f"[Terrain v2] Export {fmt}: {stats['bytes'] / (1024 * 1024):.2f}MB in {stats['seconds']:.2f}s "
+              f"(max error {stats['max_error']:.3f}m)")
+    return exports
+
+
+# 파라미터 → .blend + preview. 영구 워커(blender_worker.py)에서도 호출된다.
+def generate_terrain(params, output_path, preview_path):
+    print(f"[Terrain v2] Parameters: {json.dumps(params, indent=2)}")
+    print(f"[Terrain v2] Output: {output_path}")
+    print(f"[Terrain v2] Preview: {preview_path}")
+    profiler = Profiler("terrain_generator_v2", profile_path(params, output_path))
+
+    # 기존 오브젝트 삭제
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete()
+
+    # ===== 파라미터 추출 =====
+    settings = read_terrain_params(params)
+
+    height_multiplier = settings['height_multiplier']
+    peak_sharpness = settings['peak_sharpness']
+    valley_depth = settings['valley_depth']
+    terrace_levels = settings['terrace_levels']
+
+    base_size = BASE_SIZE  # 기본 100m로 생성
+    terrain_scale = settings['terrain_scale']  # 최종 스케일 배율 (기본 10배 = 1km)
+    size = base_size * terrain_scale  # 최종 크기 (표시용)
+    resolution = settings['resolution']  # 그리드 한 변 세그먼트 수
+    z_scale = Z_SCALE  # Z축 스케일 (높이 3배)
+    tiles = settings['tiles']  # 1 이면 단일 메시, 2 이상이면 tiles x tiles 타일
+    workers = worker_count(params)  # 높이 계산 프로세스 수 (결과에는 영향 없음 → 캐시 키 제외)
+    export_formats = read_export_formats(params)  # 웹용 메시 형식 (캐시 역할로 등록 → 없는 엔트리는 miss)
+    erosion_time_budget = erosion_budget(params)  # 침식 시간 예산 (초, 캐시 키 제외)
+
+    heights_path, heights_header_path = sidecar_paths(output_path)
+    outputs = {
+        "blend": output_path,
+        "preview": preview_path,
+        "preview_low": low_preview_path(preview_path),
+        "heights": heights_path,
+        "heights_header": heights_header_path,
+    }
+    # LOD 파일도 캐시 역할로 등록 (개수는 그리드 크기 + lod_levels 로 결정)
+    if settings['lod_levels'] > 0:
+        grid_size = tiles * settings['tile_resolution'] + 1 if tiles > 1 else resolution + 1
+        outputs["lods"] = lod_manifest_path(output_path)
+        for level, _stride, _rows, _cols in lod_grids((grid_size, grid_size), settings['lod_levels']):
+            outputs[f"lod{level}"] = lod_path(output_path, level)
+    exported = export_paths(output_path)
+    for fmt in export_formats:
+        outputs[f"export_{fmt}"] = exported[fmt]
+        if fmt == 'bin':
+            outputs["export_bin_header"] = exported["bin_header"]
+    result = {**outputs, "cached": False}
+    for role, path in outputs.items():
+        profiler.output(role, path)
+
+    # ===== 0. 결과 캐시 조회 =====
+    # 같은 파라미터(+스크립트 버전)면 저장된 .blend / preview 를 재사용하고 종료
+    cache_enabled, cache_dir, cache_max_bytes = cache_config(params, output_path)
+    cache_key = params_key(settings, SCRIPT_VERSION)
+    if cache_enabled and tiles > 1 and settings['tile_output'] == 'library':
+        # 타일 .blend 를 상대 경로로 링크하므로 다른 출력 경로로 복원할 수 없음
+        print(f"[Terrain v2] Cache disabled for tile_output=library")
+        cache_enabled = False
+    if cache_enabled:
+        with profiler.phase('cache_lookup'):
+            cache_hit, cache_stats = restore(cache_dir, cache_key, outputs)
+        print(f"[Terrain v2] {format_stats('hit' if cache_hit else 'miss', cache_key, cache_stats)}")
+        if cache_hit:
+            print(f"[Terrain v2] SUCCESS! (cached)")
+            print(f"[Terrain v2] Created: {output_path}")
+            print(f"[Terrain v2] Preview: {preview_path}")
+            announce_preview('low', outputs["preview_low"], LOW_PREVIEW_RESOLUTION, 0.0)
+            announce_preview('final', preview_path, settings['render_resolution'], 0.0)
+            result["cached"] = True
+            result["profile"] = profiler.emit()
+            return result
+
+    # ===== 0c. 단계 체크포인트 =====
+    # 같은 작업의 이전 시도 (렌더 / 저장 실패 후 큐 재시도) 가 남긴 단계 결과가 있으면
+    # 첫 번째로 빠진 단계부터 재개한다 (하이트필드 → 지오메트리 .blend → 미리보기)
+    checkpoints = Checkpoints(*checkpoint_config(params, output_path), cache_key)
+    stages = ('geometry', 'preview') if tiles > 1 else ('heightfield', 'geometry', 'preview')
+    done = checkpoints.completed(stages)
+
+    job_start = time.perf_counter()
+    if 'geometry' in done:
+        print(f"[Terrain v2] Resuming from checkpoint ({', '.join(done)} done): {checkpoints.directory}")
+        with profiler.phase('checkpoint_restore'):
+            bpy.ops.wm.open_mainfile(filepath=checkpoints.path('geometry', '.blend'))
+        result.update(checkpoints.data('geometry'))
+    else:
+        # ===== 0b. 저해상도 미리보기 (점진적 미리보기 1단계) =====
+        with profiler.phase('low_preview'):
+            render_low_preview(settings, outputs["preview_low"], size, z_scale)
+
+        print(f"[Terrain v2] Creating terrain: base={base_size}m, scale={terrain_scale}x, final={size}m, height={height_multiplier}m")
+
+        # ===== 1-8. 하이트필드 계산 (단일 벡터화 패스) =====
+        # 노이즈 레이어 → Peak Sharpness (Power) → Valley Depth → Terrace → Height Multiplier
+        # 각 단계를 NumPy 배열 연산으로 적용한다 (Geometry Nodes / 모디파이어 없음)
+        print(f"[Terrain v2] Noise: type={settings['noise_type']}, layers={settings['noise_layers']}, octaves={settings['octaves']}, seed={settings['seed']}")
+        if peak_sharpness > 0.01:
+            print(f"[Terrain v2] Peak sharpness: {peak_sharpness}")
+        if valley_depth > 0.01:
+            print(f"[Terrain v2] Valley depth: {valley_depth}")
+        if terrace_levels > 0:
+            print(f"[Terrain v2] Terrace effect: {terrace_levels} levels")
+        for i, region in enumerate(settings['regions']):
+            print(f"[Terrain v2] Mixer region {i + 1}: mask={region['mask']['type']}, noise={region['noise_type']}, "
+                  f"height={region['height_multiplier']}m, base_scale={region['base_scale']}")
+
+        with profiler.phase('material'):
+            mat = create_terrain_material(settings, z_scale)
+        heights_header = {
+            'base_size': base_size,
+            'terrain_scale': terrain_scale,
+            'size_m': size,
+            'height_multiplier': height_multiplier,
+            'z_scale': z_scale,
+            'script_version': SCRIPT_VERSION,
+            'color_ramp': ramp_stops(settings),  # numpy 미리보기 / 도로 미리보기용
+        }
+
+        if tiles > 1:
+            if erosion_iterations(settings['erosion']) > 0:
+                # 타일은 서로 독립적으로 계산되므로 경계를 넘는 물 / 퇴적물 흐름을 표현할 수 없음
+                print(f"[Terrain v2] Erosion skipped for tiled terrain (needs the whole grid)")
+            # ===== 1-10. 타일 모드: 타일별 높이 → 메시 → Material =====
+            tile_resolution = settings['tile_resolution']
+            print(f"[Terrain v2] Tiled terrain: {tiles}x{tiles} tiles, {tile_resolution} segments/tile "
+                  f"({size / (tiles * tile_resolution):.2f}m/cell, output={settings['tile_output']})")
+            start_time = time.perf_counter()
+            with profiler.phase('tiles'):
+                result['tiles'] = build_terrain_tiles(settings, output_path, mat, size, z_scale, heights_header, workers)
+                profiler.count(
+                    vertices=sum(tile['vertices'] for tile in result['tiles']),
+                    faces=len(result['tiles']) * tile_resolution * tile_resolution,
+                )
+            for tile in result['tiles']:
+                if 'file' in tile:
+                    profiler.output(tile['name'], tile['file'])
+            print(f"[Terrain v2] {len(result['tiles'])} tiles built in {time.perf_counter() - start_time:.2f}s")
+            print(f"[Terrain v2] Heightfield saved: {heights_path}")
+        else:
+            xs, ys = grid_axes(resolution)
+            if 'heightfield' in done:
+                # 이전 시도가 침식까지 끝낸 높이 재사용
+                with profiler.phase('checkpoint_restore'):
+                    heights = checkpoints.load_array('heightfield')
+                result.update(checkpoints.data('heightfield'))
+                print(f"[Terrain v2] Heightfield restored from checkpoint")
+            else:
+                print(f"[Terrain v2] Computing heightfield: {resolution + 1}x{resolution + 1} vertices, {workers} worker(s)...")
+                start_time = time.perf_counter()
+                with profiler.phase('heightfield'):
+                    heights = compute_heights(settings, xs, ys, workers)
+                print(f"[Terrain v2] Heightfield computed in {time.perf_counter() - start_time:.2f}s")
+
+                # ===== 8b. 침식 (thermal + hydraulic, 배열 연산) =====
+                if erosion_iterations(settings['erosion']) > 0:
+                    print(f"[Terrain v2] Erosion: strength {settings['erosion']}, "
+                          f"{erosion_iterations(settings['erosion'])} iterations (budget {erosion_time_budget:.0f}s)")
+                    with profiler.phase('erosion'):
+                        erosion = erode(heights, settings['erosion'], size / resolution, height_multiplier * z_scale,
+                                        time_budget=erosion_time_budget)
+                    result['erosion'] = erosion
+                    print(f"[Terrain v2] Erosion: {erosion['iterations']}/{erosion['planned_iterations']} iterations in "
+                          f"{erosion['seconds']:.2f}s ({erosion['iterations_per_second']} it/s), "
+                          f"mean change {erosion['mean_change_m']:.2f}m")
+                    if erosion['budget_exhausted']:
+                        print(f"[Terrain v2] WARNING: Erosion time budget exhausted, result will not be cached")
+
+                with profiler.phase('checkpoint'):
+                    checkpoints.save_array('heightfield', heights,
+                                           {'erosion': result['erosion']} if 'erosion' in result else None)
+
+            # ===== 9. 메시 생성 (스케일 포함) =====
+            # foreach_set 으로 정점 좌표를 직접 기록 (modifier_apply / transform_apply 없음)
+            print(f"[Terrain v2] Building terrain mesh: XY={terrain_scale}x, Z={z_scale}x")
+            start_time = time.perf_counter()
+            with profiler.phase('mesh'):
+                vertices = grid_vertices(heights, xs, ys, terrain_scale, height_multiplier, z_scale)
+                terrain = build_grid_object("Terrain", vertices, len(xs), len(ys))
+                del vertices
+                profiler.count(vertices=len(terrain.data.vertices), faces=len(terrain.data.polygons))
+            print(f"[Terrain v2] Mesh built in {time.perf_counter() - start_time:.2f}s")
+
+            # 하이트필드 sidecar (월드 Z float32 .npy + JSON 헤더): Blender 없이 높이 조회 가능
+            half = size / 2
+            with profiler.phase('heightfield_save'):
+                save_heightfield(
+                    output_path,
+                    heights * np.float32(height_multiplier * z_scale),
+                    (-half, half, -half, half),
+                    **heights_header,
+                )
+            print(f"[Terrain v2] Heightfield saved: {heights_path}")
+
+            # ===== 10. Material =====
+            with profiler.phase('material_apply'):
+                apply_terrain_material(terrain, mat)
+
+        # ===== 10b. LOD 체인 =====
+        if settings['lod_levels'] > 0:
+            with profiler.phase('lod_chain'):
+                result['lod_chain'] = build_lod_chain(settings, output_path, mat)
+
+        # ===== 11-12. 카메라 / 조명 =====
+        with profiler.phase('camera_light'):
+            setup_camera_and_light(size)
+
+        # ===== 12b. 지오메트리 체크포인트 =====
+        # 중간 .blend (copy=True: 세션 파일 경로 유지) + 이 단계가 쓴 sidecar / LOD / 타일 파일
+        with profiler.phase('checkpoint'):
+            geometry_files = [outputs[role] for role in outputs if role.startswith(('heights', 'lod'))]
+            geometry_files += [tile['file'] for tile in result.get('tiles', []) if 'file' in tile]
+            if checkpoints.enabled:
+                geometry_path = checkpoints.path('geometry', '.blend')
+                bpy.ops.wm.save_as_mainfile(filepath=geometry_path, copy=True)
+                geometry_files.append(geometry_path)
+            checkpoints.save('geometry', geometry_files,
+                             {key: result[key] for key in ('erosion', 'tiles', 'lod_chain') if key in result})
+
+    # ===== 13-14. 렌더링 =====
+    if 'preview' in done:
+        print(f"[Terrain v2] Preview restored from checkpoint: {preview_path}")
+    else:
+        start_time = time.perf_counter()
+        with profiler.phase('render'):
+            if settings['preview_mode'] == 'numpy':
+                # 렌더 엔진 없이 하이트필드 sidecar 에서 바로 PNG (같은 카메라 / Sun / ColorRamp 근사)
+                print(f"[Terrain v2] Rendering preview from heightfield (numpy)...")
+                render_heightmap_preview(output_path, preview_path, resolution=settings['render_resolution'])
+            else:
+                render_preview(preview_path, settings['render_resolution'])
+        print(f"[Terrain v2] Preview ({settings['preview_mode']}) in {time.perf_counter() - start_time:.2f}s")
+        checkpoints.save('preview', [preview_path])
+    announce_preview('final', preview_path, settings['render_resolution'], time.perf_counter() - job_start)
+
+    # ===== 15. 저장 (고아 데이터블록 정리 + 옵션 압축) =====
+    print(f"[Terrain v2] Saving blend file...")
+    with profiler.phase('save'):
+        result['blend_output'] = save_blend(output_path, **output_options(params))
+    print(f"[Terrain v2] Blend saved: {format_save_stats(result['blend_output'])}")
+
+    # ===== 15b. 웹용 메시 내보내기 (GLB / 원시 버퍼) =====
+    if export_formats:
+        with profiler.phase('export'):
+            result['exports'] = export_terrain_mesh(output_path, export_formats)
+
+    # ===== 16. 결과 캐시 저장 =====
+    # 침식 시간 예산을 다 쓴 결과는 실행 속도에 따라 달라지므로 저장하지 않음
+    if cache_enabled and result.get('erosion', {}).get('budget_exhausted'):
+        print(f"[Terrain v2] Cache store skipped (erosion stopped early)")
+    elif cache_enabled:
+        with profiler.phase('cache_store'):
+            evicted, cache_bytes = store(cache_dir, cache_key, outputs, cache_max_bytes)
+        print(f"[Terrain v2] Cache stored: key={cache_key} size={cache_bytes / (1024 * 1024):.1f}MB evicted={evicted}")
+
+    # 성공: 이 작업의 체크포인트 삭제
+    checkpoints.clear()
+
+    print(f"[Terrain v2] SUCCESS!")
+    print(f"[Terrain v2] Created: {output_path}")
+    print(f"[Terrain v2] Preview: {preview_path}")
+    result["profile"] = profiler.emit()
+    return result
+
+
+def main():
+    # 커맨드 라인 인자 파싱
+    # blender --background --python terrain_generator_v2.py -- params.json output.blend preview.png
+    args = sys.argv[sys.argv.index("--") + 1:]
+    params_file = args[0]
+    output_path = args[1]
+    preview_path = args[2]
+
+    # 파라미터 파일 읽기
+    with open(params_file, 'r') as f:
+        params = json.load(f)
+
+    generate_terrain(params, output_path, preview_path)
+
+
+if __name__ == "__main__":
+    main()
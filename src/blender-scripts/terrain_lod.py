@@ -0,0 +1,98 @@
+# 지형 LOD 체인 (bpy 의존성 없음)
+#
+# 하이트필드 sidecar 를 stride 2^k 로 건너뛰며 샘플링해 LOD k 그리드를 만든다.
+#   LOD 0 = 원본 (.blend), LOD k = 정점 수 약 1/4^k
+# 각 LOD 의 오차는 LOD 그리드를 bilinear 로 원본 해상도에 되돌렸을 때의 높이 차이 (m) 로 측정한다.
+#
+# <name>_lod.json 에 LOD 별 stride / 정점 / 면 / 오차를 기록하고, 파일 경로는 terrain .blend 에서 유도한다.
+#   python terrain_lod.py output/<id>.blend 0.5     # 최대 오차 0.5m 이내에서 가장 가벼운 LOD
+import json
+import os
+import sys
+
+import numpy as np
+
+MANIFEST_VERSION = 1
+
+
+def lod_path(blend_path, level):
+    if level == 0:
+        return blend_path
+    return os.path.splitext(blend_path)[0] + f"_lod{level}.blend"
+
+
+def lod_manifest_path(blend_path):
+    return os.path.splitext(blend_path)[0] + "_lod.json"
+
+
+# stride 간격 인덱스 (마지막 행/열은 항상 포함해서 지형 범위를 유지)
+def stride_indices(n, stride):
+    idx = np.arange(0, n, stride)
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return idx
+
+
+# LOD 그리드 (rows, cols 인덱스) 를 원본 해상도로 bilinear 복원했을 때의 (최대 오차, RMS 오차)
+# 거친 행 구간 단위로 계산하므로 memmap 하이트필드에서도 전체를 한 번에 올리지 않는다.
+def lod_error(heights, rows, cols):
+    nx = heights.shape[1]
+    fine_x = np.arange(nx)
+    max_error = 0.0
+    sum_sq = 0.0
+    previous = np.interp(fine_x, cols, heights[rows[0], cols])
+    for r0, r1 in zip(rows[:-1], rows[1:]):
+        current = np.interp(fine_x, cols, heights[r1, cols])
+        t = ((np.arange(r0, r1 + 1) - r0) / (r1 - r0))[:, None]
+        approx = previous[None, :] * (1.0 - t) + current[None, :] * t
+        diff = np.asarray(heights[r0 : r1 + 1], dtype=np.float64) - approx
+        max_error = max(max_error, float(np.abs(diff).max()))
+        sum_sq += float(np.square(diff[:-1]).sum())  # 경계 행은 다음 구간에서 센다
+        previous = current
+    sum_sq += float(np.square(diff[-1]).sum())
+    return max_error, float(np.sqrt(sum_sq / heights.size))
+
+
+# levels 개 LOD (stride 2, 4, ...) 의 (level, stride, rows, cols) 목록
+def lod_grids(shape, levels):
+    ny, nx = shape
+    grids = []
+    for level in range(1, levels + 1):
+        stride = 2**level
+        if stride >= min(ny, nx):
+            break
+        grids.append((level, stride, stride_indices(ny, stride), stride_indices(nx, stride)))
+    return grids
+
+
+def grid_counts(rows, cols):
+    return {"vertices": len(rows) * len(cols), "faces": (len(rows) - 1) * (len(cols) - 1)}
+
+
+def save_lod_manifest(blend_path, lods):
+    with open(lod_manifest_path(blend_path), "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "lods": lods}, f, indent=2)
+    return lod_manifest_path(blend_path)
+
+
+def load_lod_manifest(blend_path):
+    path = lod_manifest_path(blend_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# 최대 오차 max_error (m) 이내에서 면 수가 가장 적은 LOD (없으면 LOD 0)
+def select_lod(blend_path, max_error):
+    manifest = load_lod_manifest(blend_path)
+    lods = manifest["lods"] if manifest else [{"level": 0, "max_error": 0.0, "faces": None}]
+    candidates = [lod for lod in lods if lod["max_error"] <= max_error] or [lods[0]]
+    best = min(candidates, key=lambda lod: (lod["faces"] is None, lod["faces"] or 0))
+    return {**best, "file": lod_path(blend_path, best["level"])}
+
+
+if __name__ == "__main__":
+    # python terrain_lod.py terrain.blend max_error
+    lod = select_lod(sys.argv[1], float(sys.argv[2]))
+    print(json.dumps(lod, indent=2))
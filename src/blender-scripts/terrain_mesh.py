@@ -0,0 +1,35 @@
+# 하이트필드 → Blender 메시 변환 (bpy 전용)
+# 모디파이어 평가/적용 없이 foreach_set 으로 정점/면 버퍼를 직접 기록한다.
+import bpy  # type: ignore
+import numpy as np
+
+from heightfield import grid_loops
+
+
+# vertices: float32 1D (x, y, z 반복), loops: int32 1D (쿼드당 4개)
+def build_mesh(name, vertices, loops, corners=4):
+    n_verts = len(vertices) // 3
+    n_faces = len(loops) // corners
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(n_verts)
+    mesh.vertices.foreach_set("co", vertices)
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set(
+        "loop_start", np.arange(0, len(loops), corners, dtype=np.int32)
+    )
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# 정규 그리드 하이트필드로 메시 오브젝트 생성 후 active 로 설정
+def build_grid_object(name, vertices, nx, ny, collection=None):
+    mesh = build_mesh(name, vertices, grid_loops(nx, ny))
+    obj = bpy.data.objects.new(name, mesh)
+    (collection or bpy.context.collection).objects.link(obj)
+
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    return obj
@@ -0,0 +1,68 @@
+# 타일(청크) 단위 지형 계산 (bpy 의존성 없음)
+#
+# 월드를 tiles x tiles 개의 정사각 타일로 나누고 각 타일을 독립적으로 계산한다.
+#   - 모든 타일은 하나의 전역 좌표축(기준 공간 100m)을 슬라이스해서 쓰므로
+#     이웃 타일의 경계 정점은 완전히 같은 좌표 / 같은 높이를 가진다 (이음매 없음)
+#   - 높이는 타일 좌표 그대로 노이즈에 넣어 계산 (타일 간 상태 공유 없음)
+#   - 법선은 1셀 여유(apron)를 더 계산한 중앙 차분으로 구해서 경계에서도 이웃과 일치
+# 한 번에 한 타일의 배열만 메모리에 있으므로 peak 메모리는 맵 전체가 아닌 타일 크기에 비례한다.
+import numpy as np
+
+from heightfield import BASE_SIZE, NoiseBasis
+from parallel_heights import compute_heights
+
+TILE_APRON = 1  # 법선 계산용 경계 밖 여유 셀 수
+
+
+def tile_name(ix, iy):
+    return f"Terrain_{ix}_{iy}"
+
+
+# 타일 순회 순서 (행 우선: y → x)
+def iter_tiles(tiles):
+    for iy in range(tiles):
+        for ix in range(tiles):
+            yield ix, iy
+
+
+# 맵 전체 좌표축 (기준 공간, 중앙 원점). 정점 수 = tiles * tile_resolution + 1
+def world_axis(tiles, tile_resolution, size=BASE_SIZE):
+    return np.linspace(-size / 2, size / 2, tiles * tile_resolution + 1, dtype=np.float32)
+
+
+# 타일이 전역 그리드에서 차지하는 (행 slice, 열 slice). 경계 행/열은 이웃과 공유
+def tile_slices(ix, iy, tile_resolution):
+    rows = slice(iy * tile_resolution, (iy + 1) * tile_resolution + 1)
+    cols = slice(ix * tile_resolution, (ix + 1) * tile_resolution + 1)
+    return rows, cols
+
+
+# 좌표축 양쪽에 apron 셀을 같은 간격으로 덧붙임 (맵 바깥쪽도 노이즈는 연속이므로 그대로 계산)
+def pad_axis(axis, step, apron=TILE_APRON):
+    before = axis[0] - step * np.arange(apron, 0, -1, dtype=np.float32)
+    after = axis[-1] + step * np.arange(1, apron + 1, dtype=np.float32)
+    return np.concatenate((before, axis, after)).astype(np.float32)
+
+
+# 한 타일의 (xs, ys, apron 포함 정규화 높이 [ny+2, nx+2]). workers > 1 이면 타일 내부를 프로세스 풀로 계산
+def tile_heights(settings, axis, ix, iy, tile_resolution, basis=None, workers=1):
+    if basis is None:
+        basis = NoiseBasis(settings["seed"])
+    rows, cols = tile_slices(ix, iy, tile_resolution)
+    step = float(axis[1] - axis[0])
+    xs = axis[cols]
+    ys = axis[rows]
+    padded = compute_heights(settings, pad_axis(xs, step), pad_axis(ys, step), workers, basis)
+    return xs, ys, padded
+
+
+# apron 포함 월드 Z [ny+2, nx+2] → 내부 정점 법선 [ny*nx, 3] (중앙 차분)
+def grid_normals(z, cell_size):
+    dzdx = (z[1:-1, 2:] - z[1:-1, :-2]) / (2.0 * cell_size)
+    dzdy = (z[2:, 1:-1] - z[:-2, 1:-1]) / (2.0 * cell_size)
+    normals = np.empty(dzdx.shape + (3,), dtype=np.float32)
+    normals[:, :, 0] = -dzdx
+    normals[:, :, 1] = -dzdy
+    normals[:, :, 2] = 1.0
+    normals /= np.linalg.norm(normals, axis=2, keepdims=True)
+    return normals.reshape(-1, 3)
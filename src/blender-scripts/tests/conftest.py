@@ -0,0 +1,9 @@
+# bpy 없이 실행하는 단위 테스트 (NumPy 모듈만 대상)
+#   cd src/blender-scripts && python -m pytest tests
+# 스크립트 폴더를 import 경로에 추가 (benchmarks/ 와 같은 방식)
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
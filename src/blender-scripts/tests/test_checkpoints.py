@@ -0,0 +1,82 @@
+# checkpoints: 단계 유효성 / 무효화, key 변경, file_stamps, checkpoint_config
+import os
+
+import numpy as np
+import pytest
+
+from checkpoints import Checkpoints, checkpoint_config, file_stamps
+
+STAGES = ("heightfield", "geometry", "preview")
+
+
+def test_resume_from_first_missing_stage(tmp_path):
+    directory = str(tmp_path / "job")
+    checkpoints = Checkpoints(True, directory, "key-1")
+    assert checkpoints.completed(STAGES) == []
+
+    heights = np.arange(12, dtype=np.float32).reshape(3, 4)
+    checkpoints.save_array("heightfield", heights, data={"resolution": 3})
+    geometry = checkpoints.path("geometry", ".blend")
+    with open(geometry, "wb") as f:
+        f.write(b"x" * 64)
+    checkpoints.save("geometry", files=[geometry], data={"vertices": 12})
+
+    resumed = Checkpoints(True, directory, "key-1")
+    assert resumed.completed(STAGES) == ["heightfield", "geometry"]
+    assert resumed.data("geometry") == {"vertices": 12}
+    np.testing.assert_array_equal(resumed.load_array("heightfield"), heights)
+
+    # heightfield 파일이 잘리면 그 단계부터 다시 (뒤 단계가 유효해도 멈춤)
+    with open(resumed.path("heightfield", ".npy"), "ab") as f:
+        f.write(b"\0")
+    assert resumed.completed(STAGES) == []
+    assert resumed.valid("geometry")
+
+    os.remove(geometry)
+    assert not resumed.valid("geometry")
+
+
+def test_different_key_discards_directory(tmp_path):
+    directory = str(tmp_path / "job")
+    Checkpoints(True, directory, "old").save_array("heightfield", np.zeros(4))
+    fresh = Checkpoints(True, directory, "new")
+    assert fresh.completed(STAGES) == []
+    assert not os.path.exists(directory)
+
+
+def test_clear_and_disabled(tmp_path):
+    directory = str(tmp_path / "job")
+    checkpoints = Checkpoints(True, directory, "key")
+    checkpoints.save_array("heightfield", np.zeros(4))
+    checkpoints.clear()
+    assert not os.path.exists(directory)
+
+    disabled = Checkpoints(False, directory, "key")
+    disabled.save_array("heightfield", np.zeros(4))
+    assert not os.path.exists(directory)
+    assert disabled.completed(STAGES) == []
+
+
+def test_file_stamps_change_when_input_is_rewritten(tmp_path):
+    path = str(tmp_path / "terrain.blend")
+    missing = str(tmp_path / "missing.blend")
+    with open(path, "wb") as f:
+        f.write(b"a" * 10)
+    before = file_stamps([path, missing])
+    assert before[missing] is None
+    assert before[path][0] == 10
+
+    with open(path, "wb") as f:
+        f.write(b"b" * 11)
+    os.utime(path, ns=(before[path][1] + 10**9, before[path][1] + 10**9))
+    after = file_stamps([path, missing])
+    assert after[path] != before[path]
+
+
+def test_checkpoint_config(tmp_path, monkeypatch):
+    monkeypatch.delenv("BLENDER_CHECKPOINT_DIR", raising=False)
+    output = str(tmp_path / "out" / "42.blend")
+    assert checkpoint_config({}, output) == (True, str(tmp_path / "out" / "checkpoints" / "42"))
+    assert checkpoint_config({"checkpoints": "false", "job_id": 7, "checkpoint_dir": "/ck"}, output) == (False, "/ck/7")
+    with pytest.raises(ValueError, match="checkpoints must be a boolean"):
+        checkpoint_config({"checkpoints": "sometimes"}, output)
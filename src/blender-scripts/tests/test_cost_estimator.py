@@ -0,0 +1,78 @@
+# cost_estimator: 예산 초과 시 다운그레이드 순서 / 거부
+import pytest
+
+from cost_estimator import enforce_budgets, next_downgrade, read_budgets
+
+UNLIMITED = {"max_vertices": None, "max_seconds": None, "max_memory_mb": None, "max_output_mb": None}
+ROAD = {"controlPoints": [{"x": 10, "y": 10}, {"x": 40, "y": 80}, {"x": 90, "y": 30}]}
+
+
+def test_read_budgets_merges_defaults():
+    budgets = read_budgets({"max_seconds": 60})
+    assert budgets["max_seconds"] == 60
+    assert budgets["policy"] == "downgrade"
+    assert budgets["max_vertices"] > 0
+
+
+def test_terrain_resolution_is_halved_until_within_budget():
+    report = enforce_budgets("terrain", {"resolution": 4096}, {**UNLIMITED, "max_vertices": 2_000_000})
+    assert report["action"] == "downgrade"
+    assert report["downgrades"] == ["resolution 4096 -> 2048", "resolution 2048 -> 1024"]
+    assert report["params"]["resolution"] == 1024
+    assert report["over_budget"] == []
+
+
+def test_tiled_terrain_halves_tile_resolution():
+    params = {"resolution": 1024, "tiles": 4, "tile_resolution": 1024}
+    step = next_downgrade("terrain", params, [("vertices", 1, 0)])
+    assert step[1] == "tile_resolution 1024 -> 512"
+
+
+def test_time_only_overrun_lowers_render_resolution_first():
+    params = {"resolution": 1024}
+    _params, note = next_downgrade("terrain", params, [("seconds", 1000, 900)])
+    assert note == "render_resolution 1024 -> 512"
+    _params, note = next_downgrade("terrain", params, [("seconds", 1000, 900), ("vertices", 2, 1)])
+    assert note == "resolution 1024 -> 512"
+
+
+def test_incremental_road_edit_only_lowers_render_resolution():
+    step = next_downgrade("road", {**ROAD, "baseRoad": "/tmp/road.blend"}, [("vertices", 2, 1)])
+    assert step[1] == "render_resolution 1024 -> 512"
+
+
+def test_reject_policy_keeps_original_params():
+    params = {"resolution": 4096}
+    report = enforce_budgets("terrain", params, {**UNLIMITED, "max_vertices": 2_000_000, "policy": "reject"})
+    assert report["action"] == "reject"
+    assert report["downgrades"] == []
+    assert report["params"] is params
+    assert report["over_budget"][0]["name"] == "vertices"
+
+
+def test_road_max_error_is_doubled():
+    full = enforce_budgets("road", ROAD, UNLIMITED)["estimate"]["vertices"]
+    report = enforce_budgets("road", ROAD, {**UNLIMITED, "max_vertices": full - 1})
+    assert report["action"] == "downgrade"
+    assert report["downgrades"] == ["maxError 0.05 -> 0.1"]
+    assert report["params"]["maxError"] == 0.1
+    assert report["estimate"]["vertices"] < full
+
+
+def test_unreachable_budget_is_rejected_after_every_step():
+    report = enforce_budgets("road", ROAD, {**UNLIMITED, "max_vertices": 1})
+    assert report["action"] == "reject"
+    assert report["downgrades"][-1] == "render_resolution 512 -> 256"
+    assert "maxError 0.4 -> 0.8" in report["downgrades"]
+    assert report["params"] == ROAD
+
+
+def test_blend_flags_are_parsed_like_the_generators():
+    # 문자열 "false" 는 압축 저장이 아님 (blend_output.output_options 와 같은 해석)
+    default = enforce_budgets("terrain", {"resolution": 512}, UNLIMITED)["estimate"]
+    as_text = enforce_budgets("terrain", {"resolution": 512, "compress_blend": "false"}, UNLIMITED)["estimate"]
+    compressed = enforce_budgets("terrain", {"resolution": 512, "compress_blend": "true"}, UNLIMITED)["estimate"]
+    assert as_text == default
+    assert compressed["output_mb"] < default["output_mb"]
+    with pytest.raises(ValueError, match="link_terrain must be a boolean"):
+        enforce_budgets("road", {**ROAD, "link_terrain": "sometimes"}, UNLIMITED)
@@ -0,0 +1,112 @@
+# heightfield: 고정 seed 결과, 형상 단계 (valley_depth 평지 회귀), 지형 믹서 창 계산
+import numpy as np
+import pytest
+
+from png_io import write_png
+
+from heightfield import (
+    read_terrain_params,
+    grid_axes,
+    compute_heightfield,
+    shaping_range,
+    sample_regions,
+    mask_bounds,
+    mask_weight,
+    NoiseBasis,
+)
+
+
+def heights(params, resolution=32):
+    settings = read_terrain_params({"resolution": resolution, **params})
+    xs, ys = grid_axes(resolution)
+    return settings, xs, ys, compute_heightfield(settings, xs, ys)
+
+
+def test_fixed_seed_output():
+    _settings, _xs, _ys, h = heights({"seed": 3})
+    assert h.shape == (33, 33)
+    assert h.dtype == np.float32
+    # 값이 바뀌면 같은 파라미터의 캐시 / 체크포인트 결과와 달라지므로 SCRIPT_VERSION 도 올릴 것
+    np.testing.assert_allclose(
+        [h[0, 0], h[16, 16], h[31, 5], h[7, 29], h.mean()],
+        [0.38655895, 0.1517157, 0.23991078, -0.16568899, 0.07726821],
+        atol=1e-5,
+    )
+
+
+def test_same_seed_is_deterministic_and_seed_changes_output():
+    _s, _x, _y, a = heights({"seed": 11})
+    _s, _x, _y, b = heights({"seed": 11})
+    _s, _x, _y, c = heights({"seed": 12})
+    np.testing.assert_array_equal(a, b)
+    assert np.abs(a - c).max() > 0.1
+
+
+# 회귀: 단계 사이 clip 이 valley_depth 아래 셀을 0 으로 눌러 지형 절반이 평지가 됐었다
+def test_valleys_are_not_flattened():
+    settings, _xs, _ys, h = heights({}, resolution=256)
+    low, high = shaping_range(settings)
+    assert h.min() >= low and h.max() <= high
+    assert (h <= low).mean() < 0.05
+    assert (h == 0.0).mean() < 0.01
+    # 골짜기는 0 아래까지 내려가고 바닥에도 기복이 남음
+    valleys = h[h < 0.0]
+    assert valleys.size and valleys.std() > 0.02
+
+
+def test_unknown_noise_type_is_rejected():
+    with pytest.raises(ValueError, match="RIDGED"):
+        read_terrain_params({"noise_type": "RIDGED"})
+
+
+REGIONS = [
+    {"mask": {"type": "half_plane", "direction": [1, 0.3]}, "height_multiplier": 5, "base_scale": 40},
+    {"mask": {"type": "radial", "center": [25, 75], "radius": 20}, "height_multiplier": 60},
+    {"mask": {"type": "half_plane", "point": [50, 20], "direction": [-0.2, -1], "falloff": 5}, "terrace_levels": 6},
+    {"mask": {"type": "image", "values": [[0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0.5, 1], [0, 0, 0, 1, 0], [0, 0, 0, 0, 0]]}},
+    {"mask": {"type": "half_plane", "point": [150, 20], "direction": [1, 0]}, "seed": 3},
+]
+
+
+def test_mixer_grid_windows_match_pointwise_mix():
+    settings, xs, ys, grid = heights({"regions": REGIONS}, resolution=128)
+    gx, gy = np.meshgrid(xs, ys)
+    pointwise = sample_regions(settings, gx, gy, NoiseBasis(settings["seed"]))
+    np.testing.assert_allclose(grid, pointwise, atol=1e-6)
+
+
+def test_mask_bounds_contain_every_weighted_cell():
+    settings = read_terrain_params({"regions": REGIONS})
+    u, v = np.meshgrid(np.linspace(0, 100, 201), np.linspace(0, 100, 201))
+    for region in settings["regions"]:
+        weight = mask_weight(region["mask"], u, v)
+        bounds = mask_bounds(region["mask"])
+        if bounds is None:
+            assert weight.max() == 0
+            continue
+        umin, umax, vmin, vmax = bounds
+        outside = (u < umin - 1e-9) | (u > umax + 1e-9) | (v < vmin - 1e-9) | (v > vmax + 1e-9)
+        assert not weight[outside].any()
+
+
+# 마스크 이미지는 미리보기와 같은 방향 (0 행 = 위쪽 = +Y). 위쪽 절반에 칠하면 y 가 큰 쪽 지형만 바뀜
+@pytest.mark.parametrize("source", ["values", "path"])
+def test_image_mask_top_rows_weight_high_y(tmp_path, source):
+    painted = np.zeros((4, 4), dtype=np.uint8)
+    painted[:2] = 255
+    if source == "values":
+        mask = {"type": "image", "values": (painted / 255.0).tolist()}
+    else:
+        mask = {"type": "image", "path": write_png(str(tmp_path / "mask.png"), painted)}
+    _settings, _xs, ys, base = heights({}, resolution=64)
+    _settings, _xs, ys, mixed = heights({"regions": [{"mask": mask, "seed": 7}]}, resolution=64)
+
+    changed = np.abs(mixed - base).max(axis=1) > 1e-6
+    web_y = (ys - ys[0]) / (ys[-1] - ys[0]) * 100
+    assert changed[web_y > 66.7].all()
+    assert not changed[web_y < 33.3].any()
+
+    settings = read_terrain_params({"regions": [{"mask": mask}]})
+    umin, umax, vmin, vmax = mask_bounds(settings["regions"][0]["mask"])
+    assert (umin, umax) == (0.0, 100.0)
+    assert vmin == pytest.approx(100.0 / 3) and vmax == 100.0
@@ -0,0 +1,93 @@
+# mesh_export: GLB 구조, accessor min / max, 인덱스 범위, 양자화 오차
+import json
+import struct
+
+import numpy as np
+
+from heightfield import grid_loops
+from mesh_export import heightfield_mesh, quad_triangles, write_glb
+
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+DTYPES = {5120: np.int8, 5121: np.uint8, 5122: np.int16, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}
+COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3}
+
+
+def read_glb(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, total = struct.unpack_from("<III", data, 0)
+    assert (magic, version, total) == (GLB_MAGIC, 2, len(data))
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == CHUNK_JSON
+    document = json.loads(data[20:20 + json_length])
+    bin_length, bin_type = struct.unpack_from("<II", data, 20 + json_length)
+    assert bin_type == CHUNK_BIN
+    assert bin_length == document["buffers"][0]["byteLength"]
+    return document, data[28 + json_length:28 + json_length + bin_length]
+
+
+def accessor_values(document, binary, index):
+    accessor = document["accessors"][index]
+    view = document["bufferViews"][accessor["bufferView"]]
+    dtype = np.dtype(DTYPES[accessor["componentType"]])
+    components = COMPONENTS[accessor["type"]]
+    raw = np.frombuffer(binary, dtype=dtype, count=view["byteLength"] // dtype.itemsize, offset=view["byteOffset"])
+    stride = view.get("byteStride", components * dtype.itemsize) // dtype.itemsize
+    return raw.reshape(accessor["count"], stride)[:, :components]
+
+
+def terrain_mesh(nx=17, ny=13):
+    rng = np.random.default_rng(4)
+    heights = (rng.random((ny, nx)) * 40 - 10).astype(np.float32)
+    return heightfield_mesh("Terrain", heights, (-300.0, 300.0, -200.0, 250.0), grid_loops(nx, ny))
+
+
+def test_quad_triangles_keep_winding():
+    assert quad_triangles([0, 1, 2, 3]).tolist() == [0, 1, 2, 0, 2, 3]
+
+
+def test_glb_accessors_and_quantization(tmp_path):
+    mesh = terrain_mesh()
+    path = str(tmp_path / "terrain.glb")
+    error = write_glb(path, [mesh])
+    document, binary = read_glb(path)
+    assert "KHR_mesh_quantization" in document["extensionsRequired"]
+
+    primitive = document["meshes"][0]["primitives"][0]
+    position_accessor = document["accessors"][primitive["attributes"]["POSITION"]]
+    quantized = accessor_values(document, binary, primitive["attributes"]["POSITION"])
+    assert position_accessor["componentType"] == 5122
+    assert position_accessor["min"] == quantized.min(axis=0).tolist()
+    assert position_accessor["max"] == quantized.max(axis=0).tolist()
+
+    vertex_count = len(mesh["positions"])
+    indices = accessor_values(document, binary, primitive["indices"]).reshape(-1)
+    assert document["accessors"][primitive["indices"]]["componentType"] == 5123
+    assert len(indices) == len(mesh["indices"])
+    assert indices.min() >= 0 and indices.max() < vertex_count
+    np.testing.assert_array_equal(indices, mesh["indices"])
+
+    # 노드 transform 으로 복원한 위치 (Y-up) ↔ 원본 (Z-up)
+    node = document["nodes"][0]
+    restored = quantized.astype(np.float64) * node["scale"] + node["translation"]
+    source = mesh["positions"].astype(np.float64)
+    expected = np.column_stack((source[:, 0], source[:, 2], -source[:, 1]))
+    deviation = np.abs(restored - expected).max()
+    assert deviation <= error + 1e-6
+    assert error < 600.0 / 65535.0
+
+    normals = accessor_values(document, binary, primitive["attributes"]["NORMAL"]) / 127.0
+    assert np.all(normals[:, 1] > 0)  # 하이트필드 법선은 위 (+Y) 를 향함
+
+
+def test_large_mesh_uses_uint32_indices(tmp_path):
+    mesh = terrain_mesh(nx=300, ny=230)
+    path = str(tmp_path / "large.glb")
+    write_glb(path, [mesh])
+    document, binary = read_glb(path)
+    primitive = document["meshes"][0]["primitives"][0]
+    assert document["accessors"][primitive["indices"]]["componentType"] == 5125
+    indices = accessor_values(document, binary, primitive["indices"]).reshape(-1)
+    assert indices.max() == len(mesh["positions"]) - 1
@@ -0,0 +1,33 @@
+# parallel_heights: 프로세스 풀 결과 = 단일 프로세스 결과, workers 해석
+import os
+
+import numpy as np
+import pytest
+
+from heightfield import read_terrain_params, grid_axes, compute_heightfield
+from parallel_heights import compute_heights, shutdown, worker_count
+
+
+def test_parallel_matches_serial():
+    settings = read_terrain_params({"resolution": 64, "seed": 5})
+    xs, ys = grid_axes(64)
+    serial = compute_heightfield(settings, xs, ys)
+    try:
+        parallel = compute_heights(settings, xs, ys, workers=2)
+    finally:
+        shutdown()
+    np.testing.assert_array_equal(parallel, serial)
+
+
+@pytest.mark.parametrize("value", ["auto", "AUTO", " auto ", 0, "0"])
+def test_auto_workers_use_every_cpu(value):
+    assert worker_count({"workers": value}) == (os.cpu_count() or 1)
+
+
+def test_worker_count_parsing(monkeypatch):
+    monkeypatch.setenv("TERRAIN_WORKERS", " 3 ")
+    assert worker_count({}) == 3
+    assert worker_count({"workers": "2"}) == 2
+    assert worker_count({"workers": -4}) == 1
+    with pytest.raises(ValueError, match="workers must be an integer or 'auto'"):
+        worker_count({"workers": "many"})
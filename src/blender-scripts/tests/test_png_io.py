@@ -0,0 +1,66 @@
+# png_io: write_png → read_png 왕복, 필터 종류별 디코딩
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from png_io import encode_png, read_png, write_png
+
+
+def random_image(shape, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("shape", [(5, 7), (5, 7, 1), (6, 3, 3), (4, 9, 4)])
+def test_round_trip(tmp_path, shape):
+    image = random_image(shape)
+    path = write_png(str(tmp_path / "image.png"), image)
+    decoded = read_png(path)
+    expected = image if image.ndim == 3 else image[:, :, None]
+    assert decoded.dtype == np.uint8
+    np.testing.assert_array_equal(decoded, expected)
+
+
+def _paeth(left, up, corner):
+    p = left + up - corner
+    pa, pb, pc = abs(p - left), abs(p - up), abs(p - corner)
+    return left if pa <= pb and pa <= pc else (up if pb <= pc else corner)
+
+
+# 행마다 다른 필터 (None / Sub / Up / Average / Paeth) 로 인코딩한 PNG (외부 도구가 만든 마스크 이미지 대신)
+def filtered_png(image):
+    height, width, channels = image.shape
+    rows = image.reshape(height, width * channels).astype(np.int32)
+    raw = bytearray()
+    previous = np.zeros(width * channels, dtype=np.int32)
+    for y, line in enumerate(rows):
+        kind = y % 5
+        raw.append(kind)
+        for i, value in enumerate(line):
+            left = line[i - channels] if i >= channels else 0
+            corner = previous[i - channels] if i >= channels else 0
+            predictor = (0, left, previous[i], (left + previous[i]) // 2, _paeth(left, previous[i], corner))[kind]
+            raw.append((value - predictor) & 0xFF)
+        previous = line
+
+    def chunk(tag, body):
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, {1: 0, 3: 2, 4: 6}[channels], 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b"")
+
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_reads_every_filter_type(tmp_path, channels):
+    image = random_image((10, 6, channels), seed=channels)
+    path = tmp_path / "filtered.png"
+    path.write_bytes(filtered_png(image))
+    np.testing.assert_array_equal(read_png(str(path)), image)
+
+
+def test_rejects_non_png(tmp_path):
+    path = tmp_path / "mask.png"
+    path.write_bytes(encode_png(random_image((2, 2)))[8:])
+    with pytest.raises(ValueError, match="Not a PNG"):
+        read_png(str(path))
@@ -0,0 +1,28 @@
+# profiling.profile_path: cprofile 파라미터 / BLENDER_CPROFILE 해석
+import pytest
+
+from profiling import profile_path
+
+
+@pytest.mark.parametrize("value, env, expected", [
+    (None, None, None),
+    (True, None, "/out/job.prof"),
+    ("False", None, None),
+    ("no", "1", None),
+    (False, "true", None),
+    (None, "YES", "/out/job.prof"),
+    (None, "off", None),
+])
+def test_profile_toggle(monkeypatch, value, env, expected):
+    if env is None:
+        monkeypatch.delenv("BLENDER_CPROFILE", raising=False)
+    else:
+        monkeypatch.setenv("BLENDER_CPROFILE", env)
+    params = {} if value is None else {"cprofile": value}
+    assert profile_path(params, "/out/job.blend") == expected
+
+
+def test_profile_toggle_rejects_unknown_text(monkeypatch):
+    monkeypatch.delenv("BLENDER_CPROFILE", raising=False)
+    with pytest.raises(ValueError, match="cprofile must be a boolean"):
+        profile_path({"cprofile": "sometimes"}, "/out/job.blend")
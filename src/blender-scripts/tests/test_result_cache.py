@@ -0,0 +1,102 @@
+# result_cache: hit / miss, 복사 격리, LRU 삭제, read_flag
+import json
+import os
+
+import numpy as np
+import pytest
+
+from heightfield_io import load_heightfield, save_heightfield, sidecar_paths
+from mesh_export import export_paths, write_raw_mesh
+from result_cache import params_key, read_flag, restore, store
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_miss_store_hit(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    key = params_key({"seed": 1, "height_multiplier": 30.0000001}, "2.0")
+    blend = str(tmp_path / "out.blend")
+    preview = str(tmp_path / "out_preview.png")
+
+    hit, stats = restore(cache_dir, key, {"blend": blend, "preview": preview})
+    assert not hit and stats == {"hits": 0, "misses": 1}
+
+    store(cache_dir, key, {"blend": write(blend, "mesh"), "preview": write(preview, "png")}, 1 << 20)
+    os.remove(blend)
+    os.remove(preview)
+
+    hit, stats = restore(cache_dir, key, {"blend": blend, "preview": preview})
+    assert hit and stats == {"hits": 1, "misses": 1}
+    assert read(blend) == "mesh" and read(preview) == "png"
+
+    # 복원한 파일을 고쳐도 캐시 엔트리는 그대로 (하드링크 아님)
+    write(blend, "edited")
+    other = str(tmp_path / "other.blend")
+    assert restore(cache_dir, key, {"blend": other})[0]
+    assert read(other) == "mesh"
+
+
+def test_params_key_depends_on_params_and_version():
+    key = params_key({"seed": 1, "octaves": 4}, "2.0")
+    assert key == params_key({"octaves": 4, "seed": 1}, "2.0")
+    assert key != params_key({"seed": 2, "octaves": 4}, "2.0")
+    assert key != params_key({"seed": 1, "octaves": 4}, "2.1")
+
+
+def test_lru_eviction_keeps_new_entry(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    source = write(str(tmp_path / "out.blend"), "x" * 100)
+    for index, key in enumerate(("a", "b", "c")):
+        store(cache_dir, key, {"blend": source}, 1 << 20)
+        stamp = 1_000_000 + index
+        os.utime(os.path.join(cache_dir, key), (stamp, stamp))
+
+    removed, total = store(cache_dir, "d", {"blend": source}, 250)
+    assert (removed, total) == (2, 200)
+    assert sorted(name for name in os.listdir(cache_dir) if name != "stats.json") == ["c", "d"]
+
+    # 새 엔트리 하나만으로 한도를 넘어도 방금 저장한 엔트리는 남김
+    removed, total = store(cache_dir, "e", {"blend": write(source, "x" * 500)}, 250)
+    assert os.path.isdir(os.path.join(cache_dir, "e"))
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, True), (True, True), (False, False), (0, False), ("false", False), (" Off ", False),
+    ("", False), ("YES", True), ("1", True),
+])
+def test_read_flag(value, expected):
+    assert read_flag({"use_cache": value}, "use_cache", True) is expected
+
+
+def test_read_flag_rejects_unknown_text():
+    with pytest.raises(ValueError, match="use_cache must be a boolean"):
+        read_flag({"use_cache": "maybe"}, "use_cache", True)
+
+
+# 캐시 hit 은 sidecar 를 새 작업 이름으로 복원하므로 헤더에 원래 파일 이름이 남으면 안 됨
+def test_restored_sidecars_do_not_name_the_original_job(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    old = str(tmp_path / "job-1.blend")
+    new = str(tmp_path / "job-2.blend")
+    npy, header = save_heightfield(old, np.zeros((3, 3)), (-1, 1, -1, 1))
+    raw = export_paths(old)
+    write_raw_mesh(raw["bin"], raw["bin_header"], [{"name": "Terrain", "positions": np.zeros((3, 3)), "indices": [0, 1, 2]}])
+    store(cache_dir, "key", {"heights": npy, "heights_header": header, "bin": raw["bin"], "bin_header": raw["bin_header"]}, 1 << 20)
+
+    new_npy, new_header = sidecar_paths(new)
+    new_raw = export_paths(new)
+    assert restore(cache_dir, "key", {"heights": new_npy, "heights_header": new_header,
+                                      "bin": new_raw["bin"], "bin_header": new_raw["bin_header"]})[0]
+    _heights, restored = load_heightfield(new)
+    assert "job-1" not in json.dumps(restored)
+    with open(new_raw["bin_header"]) as f:
+        assert "job-1" not in f.read()
@@ -0,0 +1,80 @@
+# road_mesh.adaptive_rows: 허용 오차 (max_error) 회귀 테스트
+# 반환한 error 뿐 아니라, probe 와 무관한 조밀 샘플 (셀 크기 / 16) 로 다시 잰 편차도 max_error 이하여야 한다.
+import numpy as np
+
+from road_drape import heightfield_sampler
+from road_mesh import PROBE_SPACING, adaptive_rows, auto_handles, curve_resolution, evaluate_rows, sample_rows
+
+EXTENT = (-200.0, 200.0, -200.0, 200.0)
+POINTS = np.array([(-180, -150), (-60, -170), (40, -40), (-20, 90), (150, 160)], dtype=np.float64)
+WIDTH = 6.0
+MAX_ERROR = 0.05
+
+
+def rough_terrain():
+    rng = np.random.default_rng(19)
+    return heightfield_sampler((rng.random((65, 65)) * 4.0).astype(np.float32), EXTENT)
+
+
+def lines(centres, tangents):
+    normals = np.column_stack((-tangents[:, 1], tangents[:, 0]))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.stack((centres, centres + normals * (WIDTH / 2), centres - normals * (WIDTH / 2)))
+
+
+# 행 (seg_idx, t) 을 잇는 폴리라인 ↔ 곡선 + 지형 사이 최대 편차 (수평 거리, 수직 높이차 중 큰 값)
+def dense_deviation(sampler, seg_idx, t, spacing):
+    left, right = auto_handles(POINTS)
+    row_u = seg_idx + t
+    n = int(np.ceil(row_u[-1] * 400.0 / spacing))
+    dense_u = np.linspace(0.0, row_u[-1], n + 1)
+    dense_seg = np.minimum(dense_u.astype(np.int64), len(POINTS) - 2)
+    dense = lines(*evaluate_rows(POINTS, left, right, dense_seg, dense_u - dense_seg))
+    rows = lines(*evaluate_rows(POINTS, left, right, seg_idx, t))
+
+    interval = np.clip(np.searchsorted(row_u, dense_u, side="right") - 1, 0, len(row_u) - 2)
+    a, b = rows[:, interval], rows[:, interval + 1]
+    ab = b - a
+    s = np.clip(((dense - a) * ab).sum(axis=2) / (ab * ab).sum(axis=2), 0.0, 1.0)
+    horizontal = np.linalg.norm(dense - a - ab * s[..., None], axis=2)
+
+    def height(p):
+        return sampler(p[..., 0].ravel(), p[..., 1].ravel()).reshape(p.shape[:2])
+
+    ha, hb = height(a), height(b)
+    vertical = np.abs(ha + (hb - ha) * s - height(dense))
+    return float(np.maximum(horizontal, vertical).max())
+
+
+def test_adaptive_rows_meet_max_error_on_terrain():
+    sampler = rough_terrain()
+    counts, (seg_idx, t), error = adaptive_rows(POINTS, WIDTH, MAX_ERROR, sampler, terrain_grid=sampler.grid)
+    assert error <= MAX_ERROR
+    assert counts.sum() + 1 == len(seg_idx)
+    assert np.all(np.diff(seg_idx + t) > 0)
+    assert dense_deviation(sampler, seg_idx, t, min(sampler.grid[2:]) / 16) <= MAX_ERROR
+
+
+def test_fixed_resolution_misses_the_bound():
+    # 길이 기반 고정 해상도 (maxError 0) 는 같은 지형에서 허용 오차를 지키지 못함 → 적응형이 필요한 이유
+    sampler = rough_terrain()
+    left, right = auto_handles(POINTS)
+    length = float(np.linalg.norm(np.diff(POINTS, axis=0), axis=1).sum())
+    resolution = curve_resolution(length)
+    seg_idx = np.append(np.repeat(np.arange(len(POINTS) - 1), resolution), len(POINTS) - 2)
+    t = np.append(np.tile(np.arange(resolution) / resolution, len(POINTS) - 1), 1.0)
+    np.testing.assert_allclose(
+        evaluate_rows(POINTS, left, right, seg_idx, t)[0],
+        sample_rows(POINTS, left, right, resolution, 0, len(POINTS) - 1)[0],
+    )
+    assert dense_deviation(sampler, seg_idx, t, min(sampler.grid[2:]) / 16) > MAX_ERROR
+
+
+def test_flat_ground_only_follows_curvature():
+    counts, (seg_idx, t), error = adaptive_rows(POINTS, WIDTH, MAX_ERROR)
+    assert error <= MAX_ERROR
+    assert dense_deviation(lambda x, y: np.zeros_like(x), seg_idx, t, PROBE_SPACING / 8) <= MAX_ERROR
+    terrain_counts, _placement, _error = adaptive_rows(
+        POINTS, WIDTH, MAX_ERROR, rough_terrain(), terrain_grid=rough_terrain().grid
+    )
+    assert terrain_counts.sum() > counts.sum()
@@ -0,0 +1,63 @@
+# road_routing.route_road: max_grade 제한 회귀 테스트
+# 지형: x = 0 을 따라 4m 절벽 (경사 0.8). 남쪽 띠 (웹 y 11~27) 에서만 60m 완만한 경사로 (0.067) 로 넘을 수 있다.
+import numpy as np
+import pytest
+
+from road_params import read_route
+from road_routing import route_road
+
+EXTENT = (-64.0, 64.0, -64.0, 64.0)
+MAX_GRADE = 0.12
+
+
+def cliff_terrain(band=True):
+    xs = np.linspace(EXTENT[0], EXTENT[1], 129)
+    ys = np.linspace(EXTENT[2], EXTENT[3], 129)
+    gx, gy = np.meshgrid(xs, ys)
+    web_y = (gy - EXTENT[2]) / (EXTENT[3] - EXTENT[2]) * 100
+    ramp = np.where(band & (web_y >= 11) & (web_y <= 27), 60.0, 5.0)
+    return np.clip((gx + ramp / 2) / ramp, 0.0, 1.0) * 4.0
+
+
+def web_array(points):
+    return np.array([(p["x"], p["y"]) for p in points])
+
+
+def route(**extra):
+    return read_route({"start": [10, 90], "end": [90, 90], "max_grade": MAX_GRADE, **extra}, "Road")
+
+
+def test_route_detours_around_cliff():
+    points, stats = route_road(cliff_terrain(), EXTENT, route())
+    assert not stats["fallback"]
+    assert stats["max_grade"] <= MAX_GRADE + 1e-6
+    assert stats["steep_fraction"] == 0.0
+    # 절벽 (x = 0, 웹 50) 은 완만한 띠 안에서만 넘음
+    points = web_array(points)
+    crossing = np.flatnonzero(np.diff(np.sign(points[:, 0] - 50)))
+    assert len(crossing)
+    assert all(points[i:i + 2, 1].max() <= 30 for i in crossing)
+    assert points[:, 1].min() < 30
+
+
+def test_no_route_within_max_grade():
+    with pytest.raises(ValueError, match="allow_steep"):
+        route_road(cliff_terrain(band=False), EXTENT, route())
+
+    points, stats = route_road(cliff_terrain(band=False), EXTENT, route(allow_steep=True))
+    assert stats["fallback"]
+    assert stats["max_grade"] > MAX_GRADE
+    assert len(points) >= 2
+
+
+def test_endpoints_keep_web_coordinates_on_scaled_extent():
+    # 같은 하이트필드를 16 배 넓은 범위에 놓으면 (경사 1/16) 절벽도 max_grade 이하 → 거의 직선, 끝점은 요청한 웹 좌표 그대로
+    extent = (1000.0, 3048.0, -1024.0, 1024.0)
+    points, stats = route_road(cliff_terrain(band=False), extent, route())
+    assert not stats["fallback"]
+    points = web_array(points)
+    np.testing.assert_allclose(points[0], [10, 90], atol=1e-3)
+    np.testing.assert_allclose(points[-1], [90, 90], atol=1e-3)
+    assert np.all((points >= 0) & (points <= 100))
+    assert points[:, 1].min() > 80
+    assert stats["length"] == pytest.approx(0.8 * 2048, rel=0.05)
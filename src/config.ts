@@ -5,6 +5,26 @@ export const config = {
   // Blender
   blenderPath: 'C:\\Program Files\\Blender Foundation\\Blender 4.5\\blender.exe',
 
+  // 영구 Blender 워커 사용 여부 (true: 작업마다 Blender 를 새로 띄우지 않음)
+  usePersistentWorker: false,
+  persistentWorkers: 2,  // blenderQueue.process 동시성과 맞춤
+
+  // 작업 사전 비용 추정 (src/blender-scripts/cost_estimator.py, bpy 없이 실행)
+  // 예산을 넘으면 policy 'downgrade': 해상도 / 렌더 해상도 / 도로 maxError 를 낮춤, 'reject': 작업 거부
+  pythonPath: 'python',
+  jobBudgets: {
+    max_vertices: 20000000,
+    max_memory_mb: 8192,
+    max_output_mb: 1024,
+    max_seconds: 900,
+    policy: 'downgrade',
+  },
+
+  // 실패한 작업 재시도 (Bull attempts, 지수 backoff)
+  // 생성기는 단계별 체크포인트 (output/checkpoints/<jobId>) 에서 재개하므로 렌더 / 저장 실패 시 지오메트리를 다시 만들지 않음
+  jobAttempts: 3,
+  jobBackoffMs: 5000,
+
   // Output directories
   outputDir: './output',
   scriptsDir: './src/blender-scripts',
@@ -1,15 +1,47 @@
 import Queue from 'bull';
 import { prisma } from '../db/client';
-import { executeBlenderScript } from '../services/blenderService';
+import { executeBlenderScript, runGenerator, parseProfile, findMeshExports, estimateJob, PREVIEW_READY_PREFIX } from '../services/blenderService';
+import { config } from '../config';
 import path from 'path';
 
 export const blenderQueue = new Queue('blender-jobs', {
   redis: {
     host: 'localhost',
     port: 6379
+  },
+  // 실패 시 재시도: 같은 dbJobId (출력 파일 이름) 로 다시 실행되어 체크포인트에서 재개
+  defaultJobOptions: {
+    attempts: config.jobAttempts,
+    backoff: { type: 'exponential', delay: config.jobBackoffMs }
   }
 });
 
+// Blender 실행 전 비용 추정 + 예산 적용 (config.jobBudgets)
+// 거부되면 예외, 다운그레이드되면 낮춘 파라미터 (params 파일도 덮어씀) 반환.
+// 추정기를 실행할 수 없으면 (Python 없음 등) 경고만 남기고 원래 파라미터로 진행
+async function checkBudget(type: 'terrain' | 'road', paramsFilePath: string, params: any): Promise<{ params: any; estimate?: any }> {
+  let report: any;
+  try {
+    report = await estimateJob(type, paramsFilePath);
+  } catch (error: any) {
+    console.warn(`[Worker] Cost estimate unavailable: ${error.message}`);
+    return { params };
+  }
+  const e = report.estimate;
+  console.log(`[Worker] Estimate (${report.action}): ${e.vertices} vertices, ${e.memory_mb}MB peak, ${e.output_mb}MB output, ~${e.seconds}s`);
+  if (report.action === 'reject') {
+    const reasons = report.over_budget.map((o: any) => `${o.name} ${o.estimate} > ${o.budget}`).join(', ');
+    // 예산 초과는 재시도해도 같은 결과 → 재시도하지 않음
+    const error: any = new Error(`Job over budget: ${reasons}`);
+    error.retryable = false;
+    throw error;
+  }
+  if (report.action === 'downgrade') {
+    console.log(`[Worker] Downgraded to fit budget: ${report.downgrades.join(', ')}`);
+  }
+  return { params: report.params, estimate: report };
+}
+
 // Worker (Blender + DB 통합)
 blenderQueue.process(2, async (job) => {
   const { dbJobId, type, params } = job.data;
@@ -29,24 +61,37 @@ blenderQueue.process(2, async (job) => {
       const scriptPath = path.join(process.cwd(), 'src', 'blender-scripts', 'terrain_generator_v2.py');
       const outputPath = path.join(process.cwd(), 'output', `${dbJobId}.blend`);
       const previewPath = path.join(process.cwd(), 'output', `${dbJobId}_preview.png`);
+      const lowPreviewPath = path.join(process.cwd(), 'output', `${dbJobId}_preview_low.png`);
 
       // Blender 스크립트에 파라미터 전달 (임시 파일 사용)
       const fs = require('fs');
       const paramsFilePath = path.join(process.cwd(), 'output', `${dbJobId}_params.json`);
       fs.writeFileSync(paramsFilePath, JSON.stringify(params));
+      const { params: jobParams, estimate } = await checkBudget('terrain', paramsFilePath, params);
 
-      console.log(`[Worker] Creating terrain with params: ${JSON.stringify(params)}`);
+      console.log(`[Worker] Creating terrain with params: ${JSON.stringify(jobParams)}`);
 
       // Blender 실행 (파라미터 포함)
-      const { exec } = require('child_process');
-      const { promisify } = require('util');
-      const execAsync = promisify(exec);
-
-      const { config } = require('../config');
-      const command = `"${config.blenderPath}" --background --python "${scriptPath}" -- "${paramsFilePath}" "${outputPath}" "${previewPath}"`;
-
       console.log(`[Worker] Executing Blender...`);
-      const result = await execAsync(command, { maxBuffer: 10 * 1024 * 1024 }); // 10MB buffer
+      const result = await runGenerator(
+        scriptPath,
+        [paramsFilePath, outputPath, previewPath],
+        { type: 'terrain', params: jobParams, output: outputPath, preview: previewPath },
+        (line) => {
+          // 저해상도 미리보기가 먼저 나오면 작업이 끝나기 전에 Job result 에 기록 (status 는 processing 유지)
+          if (!line.startsWith(PREVIEW_READY_PREFIX)) {
+            return;
+          }
+          const preview = JSON.parse(line.slice(PREVIEW_READY_PREFIX.length));
+          console.log(`[Worker] ${preview.stage} preview ready in ${preview.seconds}s: ${preview.path}`);
+          if (preview.stage === 'low') {
+            prisma.job.update({
+              where: { id: dbJobId },
+              data: { result: { lowPreview: preview.path } }
+            }).catch((error: any) => console.error(`[Worker] Failed to record low preview:`, error));
+          }
+        }
+      );
 
       // 임시 파일 삭제
       try { fs.unlinkSync(paramsFilePath); } catch (e) {}
@@ -56,6 +101,20 @@ blenderQueue.process(2, async (job) => {
         console.error(`[Worker] Blender stderr:`, result.stderr);
       }
 
+      const profile = parseProfile(result.stdout);
+
+      // 결과 캐시 hit/miss 통계 로그
+      const cacheLine = result.stdout.split('\n').find((line: string) => line.includes('[Terrain v2] Cache '));
+      if (cacheLine) {
+        console.log(`[Worker] ${cacheLine.trim()}`);
+      }
+
+      // LOD 체인 (lod_levels > 0): LOD 별 정점 / 면 수 / 오차를 metadata 에 기록
+      const lodManifestPath = path.join(process.cwd(), 'output', `${dbJobId}_lod.json`);
+      const lods = fs.existsSync(lodManifestPath)
+        ? JSON.parse(fs.readFileSync(lodManifestPath, 'utf-8')).lods
+        : undefined;
+
       // Terrain DB 레코드 생성
       await prisma.terrain.create({
         data: {
@@ -64,7 +123,7 @@ blenderQueue.process(2, async (job) => {
           description: params.description || null,
           blendFilePath: outputPath,
           topViewPath: previewPath,
-          metadata: params
+          metadata: lods ? { ...jobParams, lods } : jobParams
         }
       });
 
@@ -73,7 +132,7 @@ blenderQueue.process(2, async (job) => {
         where: { id: dbJobId },
         data: {
           status: 'completed',
-          result: { blendFile: outputPath, preview: previewPath }
+          result: { blendFile: outputPath, preview: previewPath, lowPreview: lowPreviewPath, exports: findMeshExports(outputPath), profile, estimate }
         }
       });
 
@@ -91,19 +150,25 @@ blenderQueue.process(2, async (job) => {
       const fs = require('fs');
       const paramsFilePath = path.join(process.cwd(), 'output', `${dbJobId}_params.json`);
       fs.writeFileSync(paramsFilePath, JSON.stringify(params));
-
-      console.log(`[Worker] Creating road with ${params.controlPoints.length} points`);
+      const { params: jobParams, estimate } = await checkBudget('road', paramsFilePath, params);
+
+      if (params.baseRoad) {
+        console.log(`[Worker] Editing road incrementally from ${params.baseRoad}`);
+      } else if (params.roads) {
+        console.log(`[Worker] Creating ${params.roads.length} roads in one batch`);
+      } else if (params.route && !params.controlPoints?.length) {
+        console.log(`[Worker] Creating road routed from (${params.route.start}) to (${params.route.end})`);
+      } else {
+        console.log(`[Worker] Creating road with ${params.controlPoints.length} points`);
+      }
 
       // Blender 실행
-      const { exec } = require('child_process');
-      const { promisify } = require('util');
-      const execAsync = promisify(exec);
-      const { config } = require('../config');
-
-      const command = `"${config.blenderPath}" --background --python "${scriptPath}" -- "${paramsFilePath}" "${terrainBlendPath}" "${outputPath}" "${previewPath}"`;
-
       console.log(`[Worker] Executing Blender for road...`);
-      const result = await execAsync(command, { maxBuffer: 10 * 1024 * 1024 });
+      const result = await runGenerator(
+        scriptPath,
+        [paramsFilePath, terrainBlendPath, outputPath, previewPath],
+        { type: 'road', params: jobParams, terrain: terrainBlendPath, output: outputPath, preview: previewPath }
+      );
 
       // 임시 파일 삭제
       try { fs.unlinkSync(paramsFilePath); } catch (e) {}
@@ -112,6 +177,7 @@ blenderQueue.process(2, async (job) => {
       if (result.stderr && result.stderr.includes('Error')) {
         console.error(`[Worker] Blender stderr:`, result.stderr);
       }
+      const profile = parseProfile(result.stdout);
 
       // Road DB 레코드 생성
       await prisma.road.create({
@@ -119,11 +185,11 @@ blenderQueue.process(2, async (job) => {
           jobId: dbJobId,
           terrainId: params.terrainId,
           userId: 'test-user',
-          controlPoints: params.controlPoints,
+          controlPoints: params.roads ?? params.controlPoints ?? [],
           blendFilePath: outputPath,
           previewPath: previewPath,
-          widthMeters: params.width,
-          metadata: params
+          widthMeters: params.roads?.[0]?.width ?? params.width,
+          metadata: jobParams
         }
       });
 
@@ -132,7 +198,7 @@ blenderQueue.process(2, async (job) => {
         where: { id: dbJobId },
         data: {
           status: 'completed',
-          result: { blendFile: outputPath, preview: previewPath }
+          result: { blendFile: outputPath, preview: previewPath, exports: findMeshExports(outputPath), profile, estimate }
         }
       });
 
@@ -162,10 +228,20 @@ blenderQueue.process(2, async (job) => {
   } catch (error: any) {
     console.error(`[Worker] Job ${job.id} failed:`, error.message);
 
-    // DB 상태 업데이트: failed
+    // 재시도가 남아 있으면 queued 로 되돌림 (Blender 스크립트가 체크포인트에서 재개)
+    if (error.retryable === false) {
+      await job.discard();
+    }
+    const attempt = job.attemptsMade + 1;
+    const retrying = error.retryable !== false && attempt < (job.opts.attempts || 1);
+    if (retrying) {
+      console.log(`[Worker] Job ${job.id} will retry (attempt ${attempt}/${job.opts.attempts})`);
+    }
+
+    // DB 상태 업데이트: failed / queued (재시도 대기)
     await prisma.job.update({
       where: { id: dbJobId },
-      data: { status: 'failed' }
+      data: { status: retrying ? 'queued' : 'failed' }
     });
 
     throw error;
@@ -367,15 +367,68 @@ app.delete('/api/road/:roadId', async (req, res) => {
 // Terrain 생성 API
 app.post('/api/terrain', async (req, res) => {
   try {
-    const { description, scale, roughness, size, terrain_scale, useAI } = req.body;
+    const { description, scale, roughness, size, terrain_scale, seed, useAI, tiles, tile_resolution, tile_output, workers, lod_levels, preview_mode, render_resolution, compress_blend, export_formats, erosion_time_budget, regions } = req.body;
 
-    let finalParams = {
+    let finalParams: Record<string, any> = {
       scale: scale || 15,
       roughness: roughness || 0.7,
       terrain_scale: terrain_scale || 10,  // 지형 스케일 배율 (기본 10배)
       description: description || ''
     };
 
+    // seed 를 지정하면 같은 설명으로도 다른 지형 생성 (미지정 시 결정적)
+    if (seed !== undefined) {
+      finalParams.seed = Number(seed);
+    }
+
+    // 타일 모드: 큰 맵을 tiles x tiles 청크로 나눠 생성 (청크당 tile_resolution 세그먼트)
+    if (tiles !== undefined) {
+      finalParams.tiles = Number(tiles);
+      if (tile_resolution !== undefined) finalParams.tile_resolution = Number(tile_resolution);
+      if (tile_output !== undefined) finalParams.tile_output = tile_output;
+    }
+
+    // 높이 계산 프로세스 수 (0 = CPU 코어 수, 미지정 시 TERRAIN_WORKERS 환경 변수 또는 1)
+    if (workers !== undefined) {
+      finalParams.workers = Number(workers);
+    }
+
+    // LOD 체인 개수 (정점 1/4, 1/16, ... 의 추가 .blend)
+    if (lod_levels !== undefined) {
+      finalParams.lod_levels = Number(lod_levels);
+    }
+
+    // 미리보기 방식: 'eevee' (기본) | 'numpy' (렌더 엔진 없이 하이트필드 음영)
+    if (preview_mode !== undefined) {
+      finalParams.preview_mode = preview_mode;
+    }
+
+    // 미리보기 한 변 픽셀 수 (기본 1024, 예산을 넘으면 워커가 낮출 수 있음)
+    if (render_resolution !== undefined) {
+      finalParams.render_resolution = Number(render_resolution);
+    }
+
+    // .blend 압축 저장 (용량 ↓, 저장 / 로드 시간 ↑). "false" 같은 문자열도 워커 (read_flag) 가 해석하도록 그대로 전달
+    if (compress_blend !== undefined) {
+      finalParams.compress_blend = compress_blend;
+    }
+
+    // 웹 뷰어용 메시: ['glb'] (양자화 glTF) / ['bin'] (float16 + uint32 원시 버퍼)
+    if (export_formats !== undefined) {
+      finalParams.export_formats = export_formats;
+    }
+
+    // 지형 믹서: [{ mask: { type: 'half_plane' | 'radial' | 'image', ... }, base_scale?, height_multiplier?, ... }]
+    // (마스크 좌표는 도로 control point 와 같은 0-100, 뒤 영역이 앞 영역 위에 덮임)
+    if (Array.isArray(regions) && regions.length > 0) {
+      finalParams.regions = regions;
+    }
+
+    // 침식 단계 시간 예산 (초, 미지정 시 TERRAIN_EROSION_BUDGET 환경 변수 또는 30)
+    if (erosion_time_budget !== undefined) {
+      finalParams.erosion_time_budget = Number(erosion_time_budget);
+    }
+
     // Claude AI 분석 사용 (useAI가 true이고 description이 있을 때)
     if (useAI && description && process.env.ANTHROPIC_API_KEY && process.env.ANTHROPIC_API_KEY !== 'your-api-key-here') {
       console.log(`[API] Analyzing terrain with Claude: "${description}"`);
@@ -425,7 +478,16 @@ app.post('/api/terrain', async (req, res) => {
 // Road 생성 API
 app.post('/api/road', async (req, res) => {
   try {
-    const { terrainId, controlPoints, width } = req.body;
+    // roads: [{ name?, controlPoints, width? }] 를 보내면 한 번의 작업으로 여러 도로 생성
+    // baseRoadId 를 보내면 이전 도로 결과에서 바뀐 구간만 다시 생성 (edits: [{ road?, index, x, y }] 지원)
+    // link_terrain: 지형을 복사하지 않고 terrain .blend 를 라이브러리로 링크, compress_blend: .blend 압축 저장
+    // export_formats: 웹 뷰어용 메시 (['glb'] / ['bin'])
+    // route: { start, end, waypoints?, max_grade?, allow_steep? } (0-100 좌표) 를 controlPoints 대신 보내면 지형 경사 / 곡률 기반으로 경로 자동 탐색
+    //   (max_grade 를 넘는 경사는 지나지 않음, allow_steep 이면 그런 경로가 없을 때만 넘는 구간 허용)
+    //   (roads 의 각 도로에도 route 사용 가능)
+    // flatten_corridor: 도로 폭 + 갓길만큼 지형을 평탄화하고 도로 가장자리를 지형에 붙임 (corridor_shoulder / corridor_blend / corridor_smoothing, m)
+    const { terrainId, controlPoints, width, roads, route, baseRoadId, edits, preview_mode, render_resolution, link_terrain, compress_blend, export_formats,
+      flatten_corridor, corridor_shoulder, corridor_blend, corridor_smoothing } = req.body;
 
     // Terrain 조회
     const terrain = await prisma.terrain.findUnique({
@@ -436,13 +498,23 @@ app.post('/api/road', async (req, res) => {
       return res.status(404).json({ success: false, error: 'Terrain not found' });
     }
 
+    // 증분 편집 기준 도로
+    let baseRoad: string | undefined;
+    if (baseRoadId) {
+      const previous = await prisma.road.findUnique({ where: { id: baseRoadId } });
+      if (!previous || !previous.blendFilePath) {
+        return res.status(404).json({ success: false, error: 'Base road not found' });
+      }
+      baseRoad = previous.blendFilePath;
+    }
+
     // DB: Job 생성
     const dbJob = await prisma.job.create({
       data: {
         userId: 'test-user',
         type: 'road',
         status: 'queued',
-        inputParams: { terrainId, controlPoints, width }
+        inputParams: { terrainId, controlPoints, width, roads, route, baseRoadId, edits }
       }
     });
 
@@ -456,7 +528,20 @@ app.post('/api/road', async (req, res) => {
         terrainId,
         terrainBlendPath: terrain.blendFilePath,
         controlPoints,
-        width: width || 1.6
+        width: width || 1.6,
+        ...(Array.isArray(roads) && roads.length > 0 ? { roads } : {}),
+        ...(route ? { route } : {}),
+        ...(baseRoad ? { baseRoad, edits } : {}),
+        ...(preview_mode ? { preview_mode } : {}),
+        ...(render_resolution !== undefined ? { render_resolution: Number(render_resolution) } : {}),
+        ...(link_terrain !== undefined ? { link_terrain } : {}),
+        ...(compress_blend !== undefined ? { compress_blend } : {}),
+        ...(export_formats ? { export_formats } : {}),
+        // 증분 편집에서 false 를 보내면 평탄화를 끄고 원본 지형으로 복원하므로 false 도 전달
+        ...(flatten_corridor !== undefined ? { flatten_corridor: Boolean(flatten_corridor) } : {}),
+        ...(corridor_shoulder !== undefined ? { corridor_shoulder } : {}),
+        ...(corridor_blend !== undefined ? { corridor_blend } : {}),
+        ...(corridor_smoothing !== undefined ? { corridor_smoothing } : {})
       }
     });
 
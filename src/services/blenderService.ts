@@ -1,8 +1,33 @@
-import { exec } from 'child_process';
+import { exec, execFile, spawn } from 'child_process';
+import fs from 'fs';
+import readline from 'readline';
 import { promisify } from 'util';
 import { config } from '../config';
+import { blenderWorkerPool, WorkerJob } from './blenderWorker';
 
 const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
+
+// 생성기가 미리보기 PNG 를 쓸 때마다 stdout 에 출력하는 접두사 (heightmap_preview.PREVIEW_READY_PREFIX)
+export const PREVIEW_READY_PREFIX = '[PREVIEW_READY] ';
+
+// 생성기가 끝날 때 출력하는 단계별 프로파일 요약 (profiling.PROFILE_PREFIX)
+export const PROFILE_PREFIX = '[PROFILE] ';
+
+// stdout 의 마지막 [PROFILE] 줄 → 요약 객체 (없으면 undefined)
+// 단계별 wall 시간은 한 줄 로그로도 남긴다.
+export function parseProfile(stdout: string): any {
+  const line = stdout.split('\n').reverse().find((l) => l.startsWith(PROFILE_PREFIX));
+  if (!line) {
+    return undefined;
+  }
+  const profile = JSON.parse(line.slice(PROFILE_PREFIX.length));
+  const phases = profile.phases
+    .map((phase: any) => `${phase.name}=${phase.wall_seconds.toFixed(2)}s`)
+    .join(' ');
+  console.log(`[Profile] ${profile.script}: ${profile.wall_seconds.toFixed(2)}s, peak ${profile.peak_rss_mb}MB | ${phases}`);
+  return profile;
+}
 
 export async function executeBlenderScript(
   scriptPath: string,
@@ -17,3 +42,75 @@ export async function executeBlenderScript(
     throw new Error(`Blender execution failed: ${error.message}`);
   }
 }
+
+// Blender 를 새로 실행하고 stdout/stderr 를 줄 단위로 수집 (onLine 으로 진행 상황 전달)
+function spawnBlender(
+  scriptPath: string,
+  scriptArgs: string[],
+  onLine?: (line: string) => void
+): Promise<{ stdout: string; stderr: string }> {
+  return new Promise((resolve, reject) => {
+    const proc = spawn(config.blenderPath, ['--background', '--python', scriptPath, '--', ...scriptArgs]);
+    const stdout: string[] = [];
+    const stderr: string[] = [];
+
+    readline.createInterface({ input: proc.stdout }).on('line', (line) => {
+      stdout.push(line);
+      onLine?.(line);
+    });
+    readline.createInterface({ input: proc.stderr }).on('line', (line) => stderr.push(line));
+
+    proc.on('error', (error) => reject(new Error(`Blender execution failed: ${error.message}`)));
+    proc.on('close', (code) => {
+      const result = { stdout: stdout.join('\n'), stderr: stderr.join('\n') };
+      if (code === 0) {
+        resolve(result);
+      } else {
+        reject(new Error(`Blender execution failed (code ${code}): ${result.stderr.slice(-2000)}`));
+      }
+    });
+  });
+}
+
+// 생성기가 outputPath 옆에 쓴 웹용 메시 파일 (mesh_export.export_paths) → { glb?, bin? }
+export function findMeshExports(outputPath: string): Record<string, string> | undefined {
+  const base = outputPath.replace(/\.blend$/, '');
+  const candidates: Record<string, string> = { glb: `${base}.glb`, bin: `${base}_mesh.bin` };
+  const exports = Object.fromEntries(Object.entries(candidates).filter(([, file]) => fs.existsSync(file)));
+  return Object.keys(exports).length > 0 ? exports : undefined;
+}
+
+// 비용 추정기가 마지막에 출력하는 결과 줄 접두사 (cost_estimator.ESTIMATE_PREFIX)
+export const ESTIMATE_PREFIX = '[ESTIMATE] ';
+
+// Blender 실행 전 비용 추정 + 예산 적용 (cost_estimator.py, 순수 Python)
+// 다운그레이드되면 paramsFilePath 를 낮춘 파라미터로 덮어쓴다. 반환: { action, params, estimate, downgrades, over_budget, ... }
+export async function estimateJob(type: 'terrain' | 'road', paramsFilePath: string): Promise<any> {
+  const scriptPath = `${config.scriptsDir}/cost_estimator.py`;
+  const { stdout } = await execFileAsync(config.pythonPath, [
+    scriptPath, type, paramsFilePath, '--budgets', JSON.stringify(config.jobBudgets), '--write', paramsFilePath,
+  ]);
+  const line = stdout.split('\n').reverse().find((l) => l.startsWith(ESTIMATE_PREFIX));
+  if (!line) {
+    throw new Error('Cost estimator produced no result');
+  }
+  return JSON.parse(line.slice(ESTIMATE_PREFIX.length));
+}
+
+// terrain/road 생성기 실행
+// config.usePersistentWorker 가 true 면 영구 워커에 작업 전달, 아니면 Blender 를 새로 실행
+// onLine: 생성기 stdout 한 줄마다 호출 (예: [PREVIEW_READY] 저해상도 미리보기 알림)
+export async function runGenerator(
+  scriptPath: string,
+  scriptArgs: string[],
+  workerJob: WorkerJob,
+  onLine?: (line: string) => void
+): Promise<{ stdout: string; stderr: string }> {
+  if (config.usePersistentWorker) {
+    const response = await blenderWorkerPool.run(workerJob, onLine);
+    console.log(`[Worker] Persistent Blender finished ${workerJob.type} job in ${response.seconds}s`);
+    return { stdout: response.stdout, stderr: response.stderr };
+  }
+
+  return spawnBlender(scriptPath, scriptArgs, onLine);
+}
@@ -0,0 +1,131 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import path from 'path';
+import readline from 'readline';
+import { config } from '../config';
+
+// 영구 Blender 워커 (src/blender-scripts/blender_worker.py) 관리
+// Blender 를 작업마다 새로 띄우지 않고 stdin JSON-lines 로 작업을 전달한다.
+
+export interface WorkerJob {
+  type: 'terrain' | 'road';
+  params: any;
+  output: string;
+  preview: string;
+  terrain?: string;
+}
+
+export interface WorkerResponse {
+  stdout: string;
+  stderr: string;
+  result: any;
+  seconds: number;
+}
+
+const RESULT_PREFIX = '[WORKER_RESULT] ';
+
+interface PendingJob {
+  id: string;
+  lines: string[];
+  onLine?: (line: string) => void;
+  resolve: (response: WorkerResponse) => void;
+  reject: (error: Error) => void;
+}
+
+class PersistentBlenderWorker {
+  private proc: ChildProcessWithoutNullStreams | null = null;
+  private current: PendingJob | null = null;
+  private stderr: string[] = [];
+
+  constructor(private readonly index: number) {}
+
+  private start() {
+    const scriptPath = path.join(process.cwd(), 'src', 'blender-scripts', 'blender_worker.py');
+    console.log(`[BlenderWorker ${this.index}] Starting persistent Blender...`);
+
+    const proc = spawn(config.blenderPath, ['--background', '--python', scriptPath]);
+    this.proc = proc;
+
+    readline.createInterface({ input: proc.stdout }).on('line', (line) => this.onLine(line));
+    readline.createInterface({ input: proc.stderr }).on('line', (line) => this.stderr.push(line));
+
+    proc.on('exit', (code) => {
+      console.error(`[BlenderWorker ${this.index}] Blender exited (code ${code})`);
+      this.proc = null;
+      if (this.current) {
+        this.current.reject(new Error(`Blender worker exited (code ${code})`));
+        this.current = null;
+      }
+    });
+  }
+
+  private onLine(line: string) {
+    const job = this.current;
+    if (!job) {
+      return;
+    }
+    if (!line.startsWith(RESULT_PREFIX)) {
+      job.lines.push(line);
+      job.onLine?.(line);
+      return;
+    }
+
+    const response = JSON.parse(line.slice(RESULT_PREFIX.length));
+    this.current = null;
+    const stderr = this.stderr.join('\n');
+    this.stderr = [];
+
+    if (response.status === 'ok') {
+      job.resolve({ stdout: job.lines.join('\n'), stderr, result: response.result, seconds: response.seconds });
+    } else {
+      job.reject(new Error(`Blender execution failed: ${response.error}`));
+    }
+  }
+
+  run(id: string, job: WorkerJob, onLine?: (line: string) => void): Promise<WorkerResponse> {
+    if (!this.proc) {
+      this.start();
+    }
+    return new Promise((resolve, reject) => {
+      this.current = { id, lines: [], onLine, resolve, reject };
+      this.proc!.stdin.write(JSON.stringify({ id, ...job }) + '\n');
+    });
+  }
+}
+
+class BlenderWorkerPool {
+  private idle: PersistentBlenderWorker[];
+  private waiting: Array<(worker: PersistentBlenderWorker) => void> = [];
+  private nextId = 0;
+
+  constructor(size: number) {
+    this.idle = Array.from({ length: size }, (_, i) => new PersistentBlenderWorker(i));
+  }
+
+  private acquire(): Promise<PersistentBlenderWorker> {
+    const worker = this.idle.pop();
+    if (worker) {
+      return Promise.resolve(worker);
+    }
+    return new Promise((resolve) => this.waiting.push(resolve));
+  }
+
+  private release(worker: PersistentBlenderWorker) {
+    const next = this.waiting.shift();
+    if (next) {
+      next(worker);
+    } else {
+      this.idle.push(worker);
+    }
+  }
+
+  async run(job: WorkerJob, onLine?: (line: string) => void): Promise<WorkerResponse> {
+    const worker = await this.acquire();
+    try {
+      return await worker.run(`job-${this.nextId++}`, job, onLine);
+    } finally {
+      this.release(worker);
+    }
+  }
+}
+
+export const blenderWorkerPool = new BlenderWorkerPool(config.persistentWorkers);
@@ -17,6 +17,7 @@ export interface TerrainParameters {
   noise_type: 'PERLIN' | 'VORONOI' | 'MUSGRAVE';
   noise_layers: number;          // 1-5
   octaves: number;               // 1-10
+  seed?: number;                 // 같은 seed + 파라미터 = 같은 지형 (기본 0)
 
   peak_sharpness: number;        // 0-1
   valley_depth: number;          // 0-1